@@ -0,0 +1,78 @@
+"""
+Measure stdio spawn-to-ready time: how long from spawning `mcp-jenkins` until it answers `initialize`.
+
+No Jenkins is needed, the client is only created on the first tool call.
+
+    uv run python benchmarks/startup.py --runs 20 --target-ms 600
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+INITIALIZE = {
+    'jsonrpc': '2.0',
+    'id': 1,
+    'method': 'initialize',
+    'params': {
+        'protocolVersion': '2025-03-26',
+        'capabilities': {},
+        'clientInfo': {'name': 'startup-benchmark', 'version': '0'},
+    },
+}
+COMMAND = [
+    sys.executable,
+    '-c',
+    'from mcp_jenkins import main; main()',
+    '--jenkins-url=http://localhost:1',
+    '--jenkins-username=benchmark',
+    '--jenkins-password=benchmark',
+]
+
+
+def spawn_to_ready() -> float:
+    start = time.perf_counter()
+    process = subprocess.Popen(  # noqa: S603
+        COMMAND,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'},
+    )
+    try:
+        process.stdin.write((json.dumps(INITIALIZE) + '\n').encode())
+        process.stdin.flush()
+        response = json.loads(process.stdout.readline())
+        elapsed = time.perf_counter() - start
+        if 'result' not in response:
+            msg = f'Unexpected initialize response: {response}'
+            raise RuntimeError(msg)
+        return elapsed
+    finally:
+        process.kill()
+        process.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--target-ms', type=float, default=600, help='Fail when the median exceeds this')
+    args = parser.parse_args()
+
+    # The first spawn warms the OS page cache and .pyc files, it is not representative
+    spawn_to_ready()
+    samples = sorted(spawn_to_ready() * 1000 for _ in range(args.runs))
+    median = statistics.median(samples)
+    print(
+        f'spawn-to-ready over {args.runs} runs: '
+        f'min {samples[0]:.0f} ms, median {median:.0f} ms, max {samples[-1]:.0f} ms (target {args.target_ms:.0f} ms)'
+    )
+    return 0 if median <= args.target_ms else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 import click
 
@@ -8,8 +9,105 @@ import click
 @click.option('--jenkins-password', required=True)
 @click.option('--jenkins-timeout', default=5)
 @click.option('--read-only', default=False, is_flag=True, help='Whether to run in read-only mode, default is False')
-@click.option('--transport', type=click.Choice(['stdio', 'sse']), default='stdio')
-@click.option('--port', default=9887, help='Port to listen on for SSE transport')
+@click.option('--transport', type=click.Choice(['stdio', 'sse', 'streamable-http']), default='stdio')
+@click.option('--host', default='127.0.0.1', help='Host to bind for SSE and streamable HTTP transports')
+@click.option('--port', default=9887, help='Port to listen on for SSE and streamable HTTP transports')
+@click.option(
+    '--workers',
+    default=1,
+    type=click.IntRange(min=1),
+    help='Number of worker processes serving the streamable HTTP transport behind one port',
+)
+@click.option(
+    '--cache-dir',
+    default=None,
+    help='Directory of the on-disk cache shared by all workers and kept across restarts (job inventory, finished '
+    'builds and logs). Defaults to an in-memory cache, or a temporary directory when running several workers.',
+)
+@click.option(
+    '--disk-cache',
+    default=False,
+    is_flag=True,
+    help='Keep the cache on disk across restarts and stdio sessions, in a directory per Jenkins URL and user under '
+    '~/.cache/mcp-jenkins unless --cache-dir is given',
+)
+@click.option('--inventory-ttl', default=30.0, help='Seconds the cached job inventory stays fresh')
+@click.option(
+    '--config-ttl',
+    default=10.0,
+    help='Seconds a cached job or node config.xml is served before it is revalidated with Jenkins',
+)
+@click.option(
+    '--rate-limit',
+    'rate_limits',
+    multiple=True,
+    help='Throttle requests toward Jenkins per endpoint class (tree, log, write, other) as '
+    'CLASS=RATE:BURST:MAX_IN_FLIGHT, e.g. --rate-limit tree=5:10:4. 0 or empty means unlimited. '
+    'Defaults: tree=20:40:8, log=10:20:4, write=0:0:8, other=0:0:16.',
+)
+@click.option(
+    '--endpoint-timeout',
+    'endpoint_timeouts',
+    multiple=True,
+    help='Timeout in seconds for one endpoint class (tree, log, write, other) as CLASS=SECONDS, '
+    'e.g. --endpoint-timeout log=60. Other classes use --jenkins-timeout.',
+)
+@click.option('--retries', default=3, type=click.IntRange(min=1), help='Attempts for idempotent requests to Jenkins')
+@click.option(
+    '--circuit-breaker-threshold',
+    'breaker_threshold',
+    default=5,
+    help='Consecutive transient failures after which requests to Jenkins fail fast',
+)
+@click.option(
+    '--circuit-breaker-reset',
+    'breaker_reset',
+    default=30.0,
+    help='Seconds to fail fast before letting a probe request through to Jenkins',
+)
+@click.option(
+    '--poll-interval',
+    default=0.0,
+    help='Seconds between background refreshes of the queue, nodes and running builds, '
+    'which are then answered from memory. 0 disables polling',
+)
+@click.option(
+    '--error-signatures',
+    default=None,
+    type=click.Path(exists=True, dir_okay=False),
+    help='JSON file of failure signatures [{"name", "category", "pattern", "weight"}] used by extract_build_errors, '
+    'added to the built-in ones, or replacing those of the same name',
+)
+@click.option(
+    '--client-pool-size',
+    default=32,
+    type=click.IntRange(min=1),
+    help='Clients kept for the users sending their own credentials in the X-Jenkins-Username and '
+    'X-Jenkins-Password headers (SSE and streamable HTTP), least recently used evicted first',
+)
+@click.option(
+    '--require-user-credentials/--no-require-user-credentials',
+    default=None,
+    help='Reject SSE and streamable HTTP requests without the X-Jenkins-Username and X-Jenkins-Password headers '
+    'instead of serving them with the configured credentials. On by default for the HTTP transports',
+)
+@click.option('--client-idle-timeout', default=600.0, help='Seconds after which an unused user client is evicted')
+@click.option(
+    '--tool-cache-ttl',
+    default=5.0,
+    help='Seconds the result of a read tool that opts in, such as get_job_config, is memoised per caller and '
+    'arguments, invalidated by write tools on the same job or queue item. 0 disables memoisation',
+)
+@click.option(
+    '--events-token',
+    default=None,
+    help='Shared secret Jenkins must send in the X-Jenkins-Events-Token header, or the token query parameter, '
+    'when posting job and run notifications to /jenkins/events (SSE and streamable HTTP). '
+    'Notifications are refused without it',
+)
+@click.option(
+    '--shutdown-timeout', default=30, help='Seconds to let in-flight requests drain on shutdown (streamable HTTP)'
+)
 @click.option(
     '--tool-alias',
     default='[fn]',
@@ -24,7 +122,26 @@ def main(
     jenkins_timeout: int,
     read_only: bool,  # noqa: FBT001
     transport: str,
+    host: str,
     port: int,
+    workers: int,
+    cache_dir: str | None,
+    disk_cache: bool,  # noqa: FBT001
+    inventory_ttl: float,
+    config_ttl: float,
+    rate_limits: tuple[str, ...],
+    endpoint_timeouts: tuple[str, ...],
+    retries: int,
+    breaker_threshold: int,
+    breaker_reset: float,
+    poll_interval: float,
+    error_signatures: str | None,
+    client_pool_size: int,
+    require_user_credentials: bool | None,  # noqa: FBT001
+    client_idle_timeout: float,
+    tool_cache_ttl: float,
+    events_token: str | None,
+    shutdown_timeout: int,
     tool_alias: str,
 ) -> None:
     """
@@ -43,10 +160,63 @@ def main(
     else:
         raise ValueError('Please provide valid jenkins_url, jenkins_username, and jenkins_password')
 
-    from mcp_jenkins.server import mcp
+    if workers > 1 and transport != 'streamable-http':
+        raise ValueError('Multiple workers are only supported with the streamable-http transport')
+    if not cache_dir and disk_cache:
+        from mcp_jenkins.store import default_cache_dir
+
+        cache_dir = default_cache_dir(jenkins_url, jenkins_username)
+    if workers > 1 and not cache_dir:
+        cache_dir = tempfile.mkdtemp(prefix='mcp-jenkins-')
+    if cache_dir:
+        os.environ['cache_dir'] = cache_dir
+    os.environ['inventory_ttl'] = str(inventory_ttl)
+    os.environ['config_ttl'] = str(config_ttl)
+
+    from mcp_jenkins.jenkins import load_signatures, parse_limits, parse_timeouts
+
+    # Fail on a malformed limit, timeout or signature library now rather than on the first tool call
+    parse_limits(';'.join(rate_limits))
+    parse_timeouts(';'.join(endpoint_timeouts))
+    if error_signatures:
+        load_signatures(error_signatures)
+        os.environ['error_signatures'] = error_signatures
+    os.environ['rate_limits'] = ';'.join(rate_limits)
+    os.environ['endpoint_timeouts'] = ';'.join(endpoint_timeouts)
+    os.environ['retries'] = str(retries)
+    os.environ['breaker_threshold'] = str(breaker_threshold)
+    os.environ['breaker_reset'] = str(breaker_reset)
+    os.environ['poll_interval'] = str(poll_interval)
+    os.environ['client_pool_size'] = str(client_pool_size)
+    os.environ['client_idle_timeout'] = str(client_idle_timeout)
+    if require_user_credentials is None:
+        require_user_credentials = transport != 'stdio'
+    os.environ['require_user_credentials'] = str(require_user_credentials).lower()
+    os.environ['tool_cache_ttl'] = str(tool_cache_ttl)
+    if events_token:
+        os.environ['events_token'] = events_token
+
+    if transport == 'streamable-http':
+        import uvicorn
+
+        # Workers are separate processes importing the app from its factory, configured through the environment
+        os.environ['stateless_http'] = str(workers > 1).lower()
+        os.environ['host'] = host
+        os.environ['port'] = str(port)
+        uvicorn.run(
+            'mcp_jenkins.server:streamable_http_app',
+            factory=True,
+            host=host,
+            port=port,
+            workers=workers,
+            timeout_graceful_shutdown=shutdown_timeout,
+        )
+        return
+
+    from mcp_jenkins.server import bind, mcp
 
     if transport == 'sse':
-        mcp.settings.port = port
+        bind(host, port)
     mcp.run(transport=transport)
 
 
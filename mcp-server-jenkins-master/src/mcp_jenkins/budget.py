@@ -0,0 +1,136 @@
+import json
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+# Smallest budget honoured, enough for a summary of any response
+MIN_BUDGET = 256
+
+# Nested detail dropped first when a response exceeds its budget
+DETAIL_KEYS = {'builds', 'nextBuild', 'previousBuild', 'actions', 'property', 'healthReport', 'changeSets', 'culprits'}
+
+_budget: ContextVar[int | None] = ContextVar('budget', default=None)
+
+
+def response_budget() -> int | None:
+    """The size budget in bytes of the response of the running tool call, None when unlimited"""
+    return _budget.get()
+
+
+@contextmanager
+def budget_scope(max_bytes: int | None) -> Iterator[None]:
+    token = _budget.set(max_bytes)
+    try:
+        yield
+    finally:
+        _budget.reset(token)
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+def _drop_detail(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _drop_detail(item) for key, item in value.items() if key not in DETAIL_KEYS}
+    if isinstance(value, list):
+        return [_drop_detail(item) for item in value]
+    return value
+
+
+def _collapse_folders(value: Any, depth: int = 0) -> Any:
+    """Replace the jobs of nested folders by their count, the jobs of the top-level folder are kept"""
+    if isinstance(value, dict):
+        collapsed = {}
+        for key, item in value.items():
+            if key == 'jobs' and isinstance(item, list) and depth > 0:
+                collapsed['jobCount'] = len(item)
+            else:
+                collapsed[key] = _collapse_folders(item, depth + 1)
+        return collapsed
+    if isinstance(value, list):
+        return [_collapse_folders(item, depth + 1) for item in value]
+    return value
+
+
+def _cap_lists(value: Any, limit: int) -> Any:
+    """Keep the first `limit` items of every list, followed by the total when some are left out"""
+    if isinstance(value, dict):
+        return {key: _cap_lists(item, limit) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [_cap_lists(item, limit) for item in value[:limit]]
+        if len(value) > limit:
+            items.append({'truncated': len(value) - limit, 'total': len(value)})
+        return items
+    return value
+
+
+def _cap_strings(value: Any, limit: int) -> Any:
+    if isinstance(value, dict):
+        return {key: _cap_strings(item, limit) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_cap_strings(item, limit) for item in value]
+    if isinstance(value, str) and len(value) > limit:
+        return f'{value[:limit]}...'
+    return value
+
+
+def _longest(value: Any, measure: Callable[[Any], int]) -> int:
+    if isinstance(value, dict):
+        return max((_longest(item, measure) for item in value.values()), default=0)
+    if isinstance(value, list):
+        return max([measure(value), *(_longest(item, measure) for item in value)])
+    return measure(value)
+
+
+def _largest_fitting(reduce: Callable[[int], Any], upper: int, max_bytes: int) -> Any:
+    """Binary search the largest limit in [0, upper] whose reduction fits, the reduction at 0 if none does"""
+    low, high = 0, upper
+    while low < high:
+        middle = (low + high + 1) // 2
+        if _size(reduce(middle)) <= max_bytes:
+            low = middle
+        else:
+            high = middle - 1
+    return reduce(low)
+
+
+def fit(result: Any, max_bytes: int | None) -> Any:
+    """
+    Reduce the detail of a tool response until its JSON fits in `max_bytes`
+
+    The reductions are applied in turn until one is enough: nested builds, actions and properties are dropped,
+    nested folders collapse to their job count, lists are cut to their first items followed by their total,
+    then long strings are cut. A text response is cut to the budget.
+
+    Args:
+        result: The tool response
+        max_bytes: The budget, None for unlimited
+
+    Returns:
+        Any: The response, of the same type, within budget unless even the most reduced form exceeds it
+    """
+    if max_bytes is None or result is None:
+        return result
+    max_bytes = max(max_bytes, MIN_BUDGET)
+    if isinstance(result, str):
+        data = result.encode()
+        if len(data) <= max_bytes:
+            return result
+        marker = f'\n... truncated, {len(data)} bytes in total'
+        return data[: max_bytes - len(marker)].decode(errors='ignore') + marker
+    if not isinstance(result, dict | list) or _size(result) <= max_bytes:
+        return result
+
+    for reduce in (_drop_detail, _collapse_folders):
+        result = reduce(result)
+        if _size(result) <= max_bytes:
+            return result
+
+    lists = _longest(result, lambda value: len(value) if isinstance(value, list) else 0)
+    capped = _largest_fitting(lambda limit: _cap_lists(result, limit), lists, max_bytes)
+    if _size(capped) <= max_bytes:
+        return capped
+    strings = _longest(capped, lambda value: len(value) if isinstance(value, str) else 0)
+    return _largest_fitting(lambda limit: _cap_strings(capped, limit), strings, max_bytes)
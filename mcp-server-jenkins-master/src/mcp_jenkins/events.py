@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+from mcp_jenkins.memo import invalidate
+from mcp_jenkins.metrics import REGISTRY
+from mcp_jenkins.store import Store, glob_escape
+
+EVENTS_RECEIVED = REGISTRY.counter(
+    'mcp_jenkins_events_total', 'Jenkins job and run notifications received on /jenkins/events', ['event']
+)
+
+EVENTS = (
+    'job.created',
+    'job.updated',
+    'job.deleted',
+    'job.renamed',
+    'run.queued',
+    'run.started',
+    'run.completed',
+    'run.finalized',
+    'run.deleted',
+)
+
+# Build phases of the Notification plugin
+_PHASES = {
+    'QUEUED': 'run.queued',
+    'STARTED': 'run.started',
+    'COMPLETED': 'run.completed',
+    'FINALIZED': 'run.finalized',
+    'DELETED': 'run.deleted',
+}
+
+
+@dataclass(frozen=True)
+class Event:
+    kind: str
+    fullname: str
+    number: int | None = None
+    queue_id: int | None = None
+
+
+def _fullname_of(url: str | None, name: str | None) -> str | None:
+    """`a/b` from a job URL such as `job/a/job/b/`, or the name when the URL has no job path"""
+    segments = [unquote(segment) for segment in urlparse(url or '').path.split('/') if segment]
+    parts = [segment for previous, segment in zip(['', *segments], segments, strict=False) if previous == 'job']
+    return '/'.join(parts) or name
+
+
+def _int(value: Any, field: str) -> int | None:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        msg = f'{field} must be an integer, got {value!r}'
+        raise ValueError(msg) from None
+
+
+def parse_event(payload: Any) -> Event:
+    """
+    Parse a Jenkins notification
+
+    Args:
+        payload: A Notification plugin payload `{"name", "url", "build": {"number", "queue_id", "phase"}}`,
+            or a generic one `{"event", "fullname", "number", "queue_id"}` with `event` one of `EVENTS`
+
+    Returns:
+        Event: The event
+
+    Raises:
+        ValueError: The payload is neither
+    """
+    if not isinstance(payload, dict):
+        msg = 'The event must be a JSON object'
+        raise ValueError(msg)
+
+    build = payload.get('build')
+    if isinstance(build, dict):
+        kind = _PHASES.get(str(build.get('phase', '')).upper())
+        if kind is None:
+            msg = f'Unknown build phase {build.get("phase")!r}, expected one of {tuple(_PHASES)}'
+            raise ValueError(msg)
+        fullname = _fullname_of(payload.get('url'), payload.get('name'))
+        number, queue_id = build.get('number'), build.get('queue_id')
+    else:
+        kind = payload.get('event')
+        if kind not in EVENTS:
+            msg = f'Unknown event {kind!r}, expected one of {EVENTS}'
+            raise ValueError(msg)
+        fullname = payload.get('fullname')
+        number, queue_id = payload.get('number'), payload.get('queue_id')
+
+    if not isinstance(fullname, str) or not fullname.strip('/'):
+        msg = 'The event does not name a job'
+        raise ValueError(msg)
+    return Event(kind, fullname.strip('/'), _int(number, 'number'), _int(queue_id, 'queue_id'))
+
+
+def apply_event(store: Store, event: Event, artifact_dir: str | None = None) -> tuple[list[str], list[str]]:
+    """
+    Invalidate what an event changed, for every user: the memoised tool results about the job and the queue item,
+    and the cached inventory, snapshots, config and build of the job
+
+    The job inventory and search index are only dropped when jobs come and go. Other changes expire them, so
+    the next read serves them while they are crawled again in the background instead of waiting for the crawl.
+
+    Args:
+        store: The store of the default client, which holds the scopes of every user
+        event: The event
+        artifact_dir: The on-disk artifact cache of the default client, which holds the directories of every user
+
+    Returns:
+        tuple[list[str], list[str]]: The purged and the expired `namespace:key` entries
+    """
+    EVENTS_RECEIVED.inc(event=event.kind)
+    invalidate(store, {'fullname': event.fullname, 'id_': event.queue_id})
+
+    purged, expired = [], []
+
+    def purge(namespace: str, key: str) -> None:
+        store.purge(namespace, key)
+        purged.append(f'{namespace}:{key}')
+
+    def expire(namespace: str, key: str) -> None:
+        store.expire(namespace, key)
+        expired.append(f'{namespace}:{key}')
+
+    kind, fullname = event.kind, event.fullname
+    if kind in ('job.created', 'job.deleted', 'job.renamed'):
+        purge('jobs', 'all')
+        purge('jobs', 'index')
+    if kind in ('job.updated', 'run.started', 'run.completed', 'run.deleted'):
+        # Starting or finishing a run changes the job's color
+        expire('jobs', 'all')
+    if kind in ('job.updated', 'run.completed', 'run.deleted'):
+        # The search index holds the causes and parameters of each job's last build
+        expire('jobs', 'index')
+    if kind in ('job.updated', 'job.deleted', 'job.renamed'):
+        purge('config', f'job:{fullname}')
+    if kind in ('job.deleted', 'job.renamed', 'run.deleted'):
+        purge('build_history', fullname)
+    if kind in ('run.queued', 'run.started'):
+        purge('snapshot', 'queue')
+    if kind in ('run.started', 'run.completed', 'run.finalized', 'run.deleted'):
+        purge('snapshot', 'running_builds')
+    if event.number is not None and kind in ('run.completed', 'run.finalized', 'run.deleted'):
+        # Artifacts and the log are only final once the run is finalized
+        run = f'{fullname}#{event.number}'
+        for namespace in ('build_info', 'build_logs', 'artifacts', 'test_failures'):
+            purge(namespace, run)
+        # Results derived from the run, keyed by the run and what else they depend on
+        run_glob, fullname_glob = glob_escape(run), glob_escape(fullname)
+        for namespace, pattern in (
+            ('build_errors', f'{run_glob}#*'),
+            ('log_diff', f'{run_glob}#*'),
+            ('log_diff', f'{fullname_glob}#*#{event.number}:*'),
+            ('artifact_uncached', f'{run_glob}/*'),
+        ):
+            store.purge_matching(namespace, pattern)
+            purged.append(f'{namespace}:{pattern}')
+        if artifact_dir is not None:
+            # Imported here, the artifact module imports python-jenkins which is deferred to first client use
+            from mcp_jenkins.jenkins._artifact import purge_cached_build
+
+            purge_cached_build(artifact_dir, fullname, event.number)
+            purged.append(f'artifact_files:{run}')
+    return purged, expired
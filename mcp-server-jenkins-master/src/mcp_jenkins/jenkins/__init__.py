@@ -1,3 +1,16 @@
 from ._client import JenkinsClient
+from ._poller import Poller
+from ._pool import ClientPool, credential_scope
+from ._signatures import load_signatures
+from ._throttle import parse_limits, parse_timeouts, priority_lane
 
-__all__ = ['JenkinsClient']
+__all__ = [
+    'ClientPool',
+    'JenkinsClient',
+    'Poller',
+    'credential_scope',
+    'load_signatures',
+    'parse_limits',
+    'parse_timeouts',
+    'priority_lane',
+]
@@ -0,0 +1,255 @@
+import contextlib
+import hashlib
+import os
+import re
+import shutil
+from collections.abc import Generator, Iterable, Iterator
+from urllib.parse import quote
+from uuid import uuid4
+
+import requests
+from jenkins import Jenkins
+
+from mcp_jenkins.jenkins._build import JenkinsBuild
+from mcp_jenkins.jenkins._transport import job_path
+from mcp_jenkins.models.artifact import Artifact, ArtifactContent, ArtifactMatch
+from mcp_jenkins.store import Store
+
+ARTIFACTS_TREE = 'artifacts[fileName,relativePath]'
+
+# Caps of one read, of one search, and of the on-disk artifact cache
+MAX_READ_BYTES = 1024 * 1024
+MAX_SCAN_BYTES = 512 * 1024 * 1024
+MAX_MATCHES = 100
+MAX_LINE_BYTES = 64 * 1024
+MAX_MATCH_CHARS = 500
+CACHE_FILE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_DIR_MAX_BYTES = 1024 * 1024 * 1024
+
+_CHUNK = 64 * 1024
+_CONTENT_RANGE = re.compile(r'bytes \d+-\d+/(\d+)')
+
+
+def _artifact_path(path: str) -> str:
+    """The path relative to the build's artifact directory, which `..` segments would address URLs outside of"""
+    path = path.lstrip('/')
+    if '..' in path.replace('\\', '/').split('/'):
+        msg = f'Invalid artifact path {path!r}, `..` segments are not allowed'
+        raise ValueError(msg)
+    return path
+
+
+def _build_dir(cache_dir: str, fullname: str, number: int) -> str:
+    """The directory of a build's cached artifacts, so an event on the build can delete them at once"""
+    return os.path.join(cache_dir, hashlib.sha256(f'{fullname}#{number}'.encode()).hexdigest())
+
+
+def purge_cached_build(cache_dir: str, fullname: str, number: int) -> None:
+    """Delete the cached artifacts of a build, also from the directories of the users below `cache_dir`"""
+    if not os.path.isdir(cache_dir):
+        return
+    for root in [cache_dir, *(entry.path for entry in os.scandir(cache_dir) if entry.is_dir())]:
+        shutil.rmtree(_build_dir(root, fullname, number), ignore_errors=True)
+
+
+def _lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Split chunks into lines, newline included, cutting lines longer than `MAX_LINE_BYTES`"""
+    pending = b''
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b'\n')
+        for line in lines:
+            yield line + b'\n'
+        while len(pending) > MAX_LINE_BYTES:
+            yield pending[:MAX_LINE_BYTES]
+            pending = pending[MAX_LINE_BYTES:]
+    if pending:
+        yield pending
+
+
+def _read_file(file: str, offset: int) -> Generator[bytes]:
+    with open(file, 'rb') as f:
+        f.seek(offset)
+        while chunk := f.read(_CHUNK):
+            yield chunk
+
+
+class JenkinsArtifact:
+    def __init__(
+        self, jenkins: Jenkins, build: JenkinsBuild, store: Store | None = None, cache_dir: str | None = None
+    ) -> None:
+        self._jenkins = jenkins
+        self._build = build
+        self._store = store or Store()
+        self._cache_dir = cache_dir
+
+    def list_build_artifacts(self, fullname: str, number: int) -> list[Artifact]:
+        key = f'{fullname}#{number}'
+        artifacts = self._store.get('artifacts', key)
+        if artifacts is None:
+            finished = self._build._is_finished(fullname, number)
+            artifacts = self._jenkins.get_tree(f'{job_path(fullname)}/{number}', ARTIFACTS_TREE)['artifacts']
+            if finished:
+                self._store.set('artifacts', key, artifacts)
+        return [Artifact.model_validate(artifact) for artifact in artifacts]
+
+    def _url(self, fullname: str, number: int, path: str) -> str:
+        return f'{job_path(fullname)}/{number}/artifact/{quote(_artifact_path(path))}'
+
+    def _cached_file(self, fullname: str, number: int, path: str) -> str | None:
+        """
+        The artifact of a finished build in the on-disk cache, downloaded on first use.
+
+        None when there is no cache directory, the build is running or the artifact is too large to cache.
+        """
+        if self._cache_dir is None or not self._build._is_finished(fullname, number):
+            return None
+        key = f'{fullname}#{number}/{path}'
+        if self._store.get('artifact_uncached', key):
+            return None
+        directory = _build_dir(self._cache_dir, fullname, number)
+        file = os.path.join(directory, hashlib.sha256(path.encode()).hexdigest())
+        if os.path.exists(file):
+            # The mtime orders the files for pruning, least recently used first
+            os.utime(file)
+            return file
+
+        response = self._jenkins.open_stream(self._url(fullname, number, path))
+        partial = f'{file}.{uuid4().hex}'
+        try:
+            if int(response.headers.get('Content-Length') or 0) > CACHE_FILE_MAX_BYTES:
+                self._store.set('artifact_uncached', key, value=True)
+                return None
+            written = 0
+            os.makedirs(directory, exist_ok=True)
+            with open(partial, 'wb') as f:
+                for chunk in response.iter_content(_CHUNK):
+                    written += len(chunk)
+                    if written > CACHE_FILE_MAX_BYTES:
+                        break
+                    f.write(chunk)
+            if written > CACHE_FILE_MAX_BYTES:
+                os.remove(partial)
+                self._store.set('artifact_uncached', key, value=True)
+                return None
+            os.replace(partial, file)
+        finally:
+            response.close()
+        self._prune()
+        return file
+
+    def _prune(self) -> None:
+        """Delete the least recently used files while the cache directory holds more than `CACHE_DIR_MAX_BYTES`"""
+        files = []
+        for directory, _, names in os.walk(self._cache_dir):
+            for name in names:
+                file = os.path.join(directory, name)
+                # Another worker sharing the directory may have deleted it already
+                with contextlib.suppress(FileNotFoundError):
+                    files.append((file, os.stat(file)))
+        size = sum(stat.st_size for _, stat in files)
+        for file, stat in sorted(files, key=lambda item: item[1].st_mtime):
+            if size <= CACHE_DIR_MAX_BYTES:
+                break
+            size -= stat.st_size
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(file)
+
+    def _open(self, fullname: str, number: int, path: str, offset: int) -> tuple[Generator[bytes], int | None]:
+        """The artifact's content from `offset` on in chunks, and its total size when known"""
+        # Checked before the build is looked up, not only when the URL is built
+        _artifact_path(path)
+        file = self._cached_file(fullname, number, path)
+        if file is not None:
+            return _read_file(file, offset), os.path.getsize(file)
+
+        try:
+            response = self._jenkins.open_stream(self._url(fullname, number, path), {'Range': f'bytes={offset}-'})
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 416:
+                # The offset is past the end
+                return (chunk for chunk in ()), None
+            raise
+
+        def chunks() -> Generator[bytes]:
+            try:
+                skip = offset if response.status_code != 206 else 0
+                for chunk in response.iter_content(_CHUNK):
+                    if skip:
+                        # Jenkins ignored the range, the bytes before the offset are read and dropped
+                        chunk, skip = chunk[skip:], max(skip - len(chunk), 0)
+                    if chunk:
+                        yield chunk
+            finally:
+                response.close()
+
+        match = _CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+        size = int(match.group(1)) if match else int(response.headers.get('Content-Length') or 0) or None
+        return chunks(), size
+
+    def read_build_artifact(
+        self,
+        fullname: str,
+        number: int,
+        path: str,
+        offset: int = 0,
+        max_bytes: int = 64 * 1024,
+        pattern: str | None = None,
+    ) -> ArtifactContent:
+        """
+        Read a byte range of an artifact, or search its lines, without holding the whole file
+
+        Args:
+            fullname: The fullname of the job
+            number: The build number
+            path: The relative path of the artifact
+            offset: The byte offset to start reading or searching at
+            max_bytes: The maximum number of bytes to read, at most `MAX_READ_BYTES`
+            pattern: A regex, if given, the lines matching it are returned instead of the content
+
+        Returns:
+            ArtifactContent: The content or the matching lines, with `nextOffset` set when stopped early
+        """
+        chunks, size = self._open(fullname, number, path, offset)
+        if pattern is None:
+            return self._read(path, chunks, size, offset, min(max_bytes, MAX_READ_BYTES))
+        return self._search(path, chunks, size, offset, re.compile(pattern))
+
+    def _read(
+        self, path: str, chunks: Generator[bytes], size: int | None, offset: int, max_bytes: int
+    ) -> ArtifactContent:
+        content = bytearray()
+        for chunk in chunks:
+            content += chunk
+            if len(content) > max_bytes:
+                break
+        chunks.close()
+        eof = len(content) <= max_bytes
+        del content[max_bytes:]
+        return ArtifactContent(
+            path=path,
+            offset=offset,
+            size=size,
+            eof=eof,
+            content=content.decode(errors='replace'),
+            nextOffset=None if eof else offset + max_bytes,
+        )
+
+    def _search(
+        self, path: str, chunks: Generator[bytes], size: int | None, offset: int, regex: re.Pattern
+    ) -> ArtifactContent:
+        matches = []
+        position = offset
+        next_offset = None
+        for number, line in enumerate(_lines(chunks), start=1):
+            if len(matches) == MAX_MATCHES or position - offset >= MAX_SCAN_BYTES:
+                next_offset = position
+                break
+            text = line.decode(errors='replace').rstrip('\r\n')
+            if regex.search(text):
+                matches.append(ArtifactMatch(line=number, offset=position, text=text[:MAX_MATCH_CHARS]))
+            position += len(line)
+        chunks.close()
+        return ArtifactContent(
+            path=path, offset=offset, size=size, eof=next_offset is None, matches=matches, nextOffset=next_offset
+        )
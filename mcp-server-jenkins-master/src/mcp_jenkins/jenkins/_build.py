@@ -1,26 +1,323 @@
+import re
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice, takewhile
+from urllib.parse import urlparse
 from uuid import uuid4
 
 import requests
-from bs4 import BeautifulSoup
 from jenkins import Jenkins
 
-from mcp_jenkins.models.build import Build
+from mcp_jenkins.jenkins._snapshot import Snapshot
+from mcp_jenkins.jenkins._stats import BuildColumns, check_sort_key, rank
+from mcp_jenkins.jenkins._transport import job_path
+from mcp_jenkins.models.build import Build, BuildLookup
+from mcp_jenkins.store import Store
+
+PERMALINKS = (
+    'lastBuild',
+    'lastCompletedBuild',
+    'lastFailedBuild',
+    'lastStableBuild',
+    'lastSuccessfulBuild',
+    'lastUnstableBuild',
+    'lastUnsuccessfulBuild',
+)
+# Most builds get_builds_info looks up in one call
+MAX_LOOKUPS = 500
+
+# Pipelines run on one-off (flyweight) executors, everything else on the node's executors
+_EXECUTOR_TREE = 'number,currentExecutable[number,url]'
+RUNNING_BUILDS_TREE = f'computer[displayName,executors[{_EXECUTOR_TREE}],oneOffExecutors[{_EXECUTOR_TREE}]]'
+
+HISTORY_TREE = 'allBuilds[number,url,result,timestamp,duration,building]'
+# Builds fetched per range request, and scanned at most per history page when filters match few
+HISTORY_CHUNK = 100
+HISTORY_MAX_SCAN = 2000
+# Newest builds kept in a job's cached history, older pages are fetched each time
+HISTORY_CACHED = 10 * HISTORY_CHUNK
+# Builds first fetched above a cached history, in case few were started since
+RECENT_CHUNK = 10
+# Most jobs get_build_stats fetches the history of in one call
+MAX_STATS_JOBS = 200
+
+# Largest console log cached whole, in characters, larger ones are streamed and only their tail kept
+MAX_CACHED_LOG_CHARS = 4 * 1024 * 1024
+LOG_TAIL_LINES = 100
 
 
 class JenkinsBuild:
-    def __init__(self, jenkins: Jenkins) -> None:
+    def __init__(self, jenkins: Jenkins, store: Store | None = None, snapshot_max_age: float = 0) -> None:
         self._jenkins = jenkins
+        self._store = store or Store()
+        self.running_snapshot = Snapshot(self._store, 'running_builds', self._fetch_running_builds, snapshot_max_age)
 
     @staticmethod
     def _to_model(data: dict) -> Build:
         return Build.model_validate(data)
 
-    def get_running_builds(self) -> list[Build]:
-        builds = self._jenkins.get_running_builds()
-        return [self._to_model(build) for build in builds]
+    def _fetch_running_builds(self) -> list[dict]:
+        """
+        Same result as python-jenkins' `get_running_builds`, from one query instead of one per node
+        """
+        builds = []
+        for computer in self._jenkins.get_tree('computer', RUNNING_BUILDS_TREE)['computer']:
+            node = '(master)' if computer['displayName'] in ('master', 'Built-In Node') else computer['displayName']
+            for executor in [*computer.get('executors', []), *computer.get('oneOffExecutors', [])]:
+                executable = executor.get('currentExecutable')
+                if not executable or 'number' not in executable:
+                    continue
+                match = re.search(r'/job/([^/]+)/.*', urlparse(executable['url']).path)
+                builds.append(
+                    {
+                        'name': match.group(1) if match else None,
+                        'number': executable['number'],
+                        'url': executable['url'],
+                        'node': node,
+                        'executor': executor['number'],
+                    }
+                )
+        return builds
+
+    def get_running_builds(self, max_age: float | None = None) -> list[Build]:
+        """Return the running build snapshot, see `Snapshot.get`"""
+        return self.get_running_builds_snapshot(max_age)[0]
+
+    def get_running_builds_snapshot(self, max_age: float | None = None) -> tuple[list[Build], float]:
+        """Return the running build snapshot and its age in seconds, see `Snapshot.get`"""
+        builds, age = self.running_snapshot.get(max_age)
+        return [self._to_model(build) for build in builds], age
+
+    def _fetch_history(self, fullname: str, start: int, size: int = HISTORY_CHUNK) -> list[dict]:
+        tree = f'{HISTORY_TREE}{{{start},{start + size}}}'
+        return self._jenkins.get_tree(job_path(fullname), tree).get('allBuilds') or []
+
+    def _remember_history(self, fullname: str, rows: list[dict], *, end: bool) -> None:
+        """
+        Merge fetched rows into the job's cached history, a contiguous run of finished builds, newest first.
+
+        Only the rows older than the last running one are kept, and a chunk is only merged when it shares
+        a build with the cached run, since builds missing in between cannot be told apart from deleted ones.
+        Past `HISTORY_CACHED` rows the oldest are dropped.
+        """
+        running = [i for i, row in enumerate(rows) if row.get('building')]
+        finished = rows[running[-1] + 1 :] if running else rows
+        if not finished:
+            return
+        history = self._store.get('build_history', fullname) or {'rows': [], 'end': False}
+        cached = history['rows']
+        if cached and {row['number'] for row in cached} & {row['number'] for row in finished}:
+            merged = {row['number']: row for row in [*cached, *finished]}
+            rows = sorted(merged.values(), key=lambda row: row['number'], reverse=True)
+            end = history['end'] if rows[-1]['number'] < finished[-1]['number'] else end
+        elif not cached or finished[0]['number'] > cached[0]['number']:
+            rows = finished
+        else:
+            return
+        if len(rows) > HISTORY_CACHED:
+            rows, end = rows[:HISTORY_CACHED], False
+        # Pages past the cached run only drop what they added, the history is not written again
+        if rows == cached and end == history['end']:
+            return
+        self._store.set('build_history', fullname, {'rows': rows, 'end': end})
+
+    def _iter_history(self, fullname: str, number: int | None, index: int) -> Iterator[tuple[dict, int]]:
+        """
+        Yield the builds older than `number`, newest first, with their index in the job's build list
+
+        The cached history is used as long as it continues the given build, range requests are made past it.
+        """
+        while True:
+            if number is not None:
+                history = self._store.get('build_history', fullname) or {'rows': [], 'end': False}
+                position = next((i for i, row in enumerate(history['rows']) if row['number'] == number), None)
+                if position is not None:
+                    for row in history['rows'][position + 1 :]:
+                        yield row, index
+                        index, number = index + 1, row['number']
+                    if history['end']:
+                        return
+
+            # Start one build early: when it is the one given, the chunk continues the cached history
+            start = max(index - 1, 0) if number is not None else index
+            rows = self._fetch_history(fullname, start)
+            self._remember_history(fullname, rows, end=len(rows) < HISTORY_CHUNK)
+            for offset, row in enumerate(rows):
+                if number is None or row['number'] < number:
+                    yield row, start + offset
+            if len(rows) < HISTORY_CHUNK:
+                return
+            index = start + len(rows)
+            number = min(rows[-1]['number'], number) if number is not None else rows[-1]['number']
+
+    def _iter_recent(self, fullname: str) -> Iterator[dict]:
+        """
+        Yield the builds of a job, newest first, only fetching the builds newer than its cached history
+
+        The newest builds are fetched in growing ranges until one reaches the cached history, which then
+        serves the older builds.
+        """
+        history = self._store.get('build_history', fullname)
+        if not history or not history['rows']:
+            yield from (row for row, _ in self._iter_history(fullname, None, 0))
+            return
+        newest, size = history['rows'][0]['number'], RECENT_CHUNK
+        while True:
+            rows = self._fetch_history(fullname, 0, size)
+            if len(rows) < size or rows[-1]['number'] <= newest or size == HISTORY_CHUNK:
+                break
+            size = min(size * 4, HISTORY_CHUNK)
+        self._remember_history(fullname, rows, end=len(rows) < size)
+        yield from rows
+        if len(rows) == size:
+            yield from (row for row, _ in self._iter_history(fullname, rows[-1]['number'], len(rows)))
+
+    def get_build_history(
+        self,
+        fullname: str,
+        result: str | None = None,
+        since: int | None = None,
+        until: int | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> tuple[list[Build], str | None]:
+        """
+        Page through the builds of a job, newest first
+
+        Args:
+            fullname: The fullname of the job
+            result: Only return builds with one of these comma separated results, `BUILDING` for running builds
+            since: Only return builds started at or after this timestamp in milliseconds
+            until: Only return builds started at or before this timestamp in milliseconds
+            limit: The maximum number of builds to return
+            cursor: The cursor returned with the previous page
 
-    def get_build_info(self, fullname: str, number: int) -> Build:
-        return self._to_model(self._jenkins.get_build_info(fullname, number))
+        Returns:
+            tuple[list[Build], str | None]: The builds and the cursor of the next page, None on the last page
+        """
+        number, index = None, 0
+        if cursor:
+            try:
+                number, index = (int(part) for part in cursor.split(':'))
+            except ValueError:
+                msg = f'Invalid cursor {cursor!r}, pass the cursor returned with the previous page'
+                raise ValueError(msg) from None
+        results = {part.strip().upper() for part in result.split(',')} if result else None
+
+        builds = []
+        for scanned, (row, row_index) in enumerate(self._iter_history(fullname, number, index), start=1):
+            if since is not None and row['timestamp'] < since:
+                return builds, None
+            matches = (until is None or row['timestamp'] <= until) and (
+                results is None or ('BUILDING' if row.get('building') else row.get('result')) in results
+            )
+            if matches:
+                builds.append(self._to_model(row))
+            if len(builds) == limit or scanned == HISTORY_MAX_SCAN:
+                return builds, f'{row["number"]}:{row_index + 1}'
+        return builds, None
+
+    def get_build_stats(
+        self,
+        fullnames: list[str],
+        limit: int = 30,
+        since: int | None = None,
+        sort_by: str = 'trend',
+        top: int | None = None,
+        max_workers: int = 8,
+    ) -> list[dict]:
+        """
+        Compute duration percentiles, failure rate, flakiness and duration trend of the last builds of many jobs
+
+        Only the first `MAX_STATS_JOBS` jobs are looked at, each fetching only the builds newer than its
+        cached history.
+
+        Args:
+            fullnames: The fullnames of the jobs
+            limit: The number of most recent builds of each job to look at
+            since: Only look at builds started at or after this timestamp in milliseconds
+            sort_by: The statistic to rank by, one of `STAT_KEYS`
+            top: The number of jobs to return, all if None
+            max_workers: The number of jobs whose builds are fetched at the same time
+
+        Returns:
+            list[dict]: The statistics of each job, ranked highest first, followed by
+                `{"truncated", "total"}` when there were more than `MAX_STATS_JOBS` jobs
+        """
+        check_sort_key(sort_by)
+        total = len(fullnames)
+        fullnames = fullnames[:MAX_STATS_JOBS]
+
+        def recent(fullname: str) -> list[dict] | Exception:
+            rows = self._iter_recent(fullname)
+            try:
+                return list(islice(takewhile(lambda row: since is None or row['timestamp'] >= since, rows), limit))
+            except Exception as e:  # noqa: BLE001 (reported per job, the others are still ranked)
+                return e
+
+        columns = BuildColumns()
+        errors = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for fullname, rows in zip(fullnames, executor.map(recent, fullnames), strict=True):
+                if isinstance(rows, Exception):
+                    errors.append({'fullname': fullname, 'error': str(rows)})
+                else:
+                    columns.add(fullname, rows)
+        stats = [*rank(columns.stats(), sort_by), *errors][:top]
+        if total > MAX_STATS_JOBS:
+            stats.append({'truncated': total - MAX_STATS_JOBS, 'total': total})
+        return stats
+
+    def get_build_info(self, fullname: str, number: int | str) -> Build:
+        return self._to_model(self._get_build_info(fullname, number))
+
+    def get_builds_info(self, builds: list[tuple[str, int | str]], max_workers: int = 8) -> list[BuildLookup]:
+        """
+        Get the info of many builds, fetched in parallel, at most `max_workers` at a time, through the build cache
+
+        Args:
+            builds: (fullname, number) pairs, the number may also be a permalink such as `lastSuccessfulBuild`
+            max_workers: The number of builds fetched at the same time
+
+        Returns:
+            list[BuildLookup]: In the order given, each with its build or the error it could not be read with
+        """
+        if len(builds) > MAX_LOOKUPS:
+            msg = f'At most {MAX_LOOKUPS} builds can be looked up at once, got {len(builds)}'
+            raise ValueError(msg)
+
+        def lookup(ref: tuple[str, int | str]) -> BuildLookup:
+            fullname, number = ref
+            try:
+                if not str(number).isdigit() and number not in PERMALINKS:
+                    msg = f'Invalid build number {number!r}, expected a number or one of {PERMALINKS}'
+                    raise ValueError(msg)
+                return BuildLookup(fullname=fullname, number=number, build=self.get_build_info(fullname, number))
+            except Exception as e:  # noqa: BLE001 (reported per build, the others are still returned)
+                return BuildLookup(fullname=fullname, number=number, error=str(e) or type(e).__name__)
+
+        refs = [(fullname, int(number) if str(number).isdigit() else number) for fullname, number in builds]
+        unique = list(dict.fromkeys(refs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = dict(zip(unique, executor.map(lookup, unique), strict=True))
+        return [results[ref] for ref in refs]
+
+    def _get_build_info(self, fullname: str, number: int | str) -> dict:
+        """
+        Finished builds never change, so their info is cached without expiry. A build read through a permalink
+        is cached under its number, the permalink itself is always resolved by Jenkins.
+        """
+        key = f'{fullname}#{number}'
+        data = self._store.get('build_info', key)
+        if data is None:
+            data = self._jenkins.get_build_info(fullname, number)
+            if data.get('building') is False and data.get('number') is not None:
+                self._store.set('build_info', f'{fullname}#{data["number"]}', data)
+        return data
+
+    def _is_finished(self, fullname: str, number: int | str) -> bool:
+        return str(number).isdigit() and self._get_build_info(fullname, number).get('building') is False
 
     def build_job(self, fullname: str, parameters: dict = None) -> int:
         if not parameters:
@@ -45,8 +342,16 @@ class JenkinsBuild:
         """
         if not number:
             number = "lastBuild"
-    
-        logs = self._jenkins.get_build_console_output(fullname, number)
+
+        key = f'{fullname}#{number}'
+        logs = self._store.get('build_logs', key)
+        if logs is None:
+            # Check before downloading, a build finishing in between must not leave a truncated log cached
+            finished = self._is_finished(fullname, number)
+            logs, whole = self._read_logs(fullname, number)
+            if finished and whole:
+                self._store.set('build_logs', key, logs)
+
         # get only first 10 lines of logs
         logs_lines = logs.splitlines()
         if len(logs_lines) > 10:
@@ -54,6 +359,32 @@ class JenkinsBuild:
         
         return logs
 
+    def _read_logs(self, fullname: str, number: int | str) -> tuple[str, bool]:
+        """
+        Stream the console log, keeping it whole up to `MAX_CACHED_LOG_CHARS` and only its last lines beyond
+
+        Returns:
+            tuple[str, bool]: The log or its last `LOG_TAIL_LINES` lines, and whether it is whole
+        """
+        chunks, size = [], 0
+        tail, pending = deque(maxlen=LOG_TAIL_LINES), ''
+        for chunk in self._jenkins.stream(f'{job_path(fullname)}/{number}/consoleText'):
+            size += len(chunk)
+            if chunks is not None:
+                if size <= MAX_CACHED_LOG_CHARS:
+                    chunks.append(chunk)
+                    continue
+                # Too large to cache, only its last lines are kept from here on
+                chunk, chunks = ''.join(chunks) + chunk, None
+            *lines, pending = (pending + chunk).split('\n')
+            tail.extend(lines)
+            pending = pending[-MAX_CACHED_LOG_CHARS:]
+        if chunks is not None:
+            return ''.join(chunks), True
+        if pending:
+            tail.append(pending)
+        return '\n'.join(tail), False
+
     def stop_build(self, fullname: str, number: int) -> None:
         return self._jenkins.stop_build(fullname, number)
 
@@ -68,6 +399,8 @@ class JenkinsBuild:
         Returns:
             str: The source code of the Jenkins pipeline for the specified build.
         """
+        # bs4 is only needed here, so it is not worth importing on every server start
+        from bs4 import BeautifulSoup
 
         splitted_path = fullname.split('/')
 
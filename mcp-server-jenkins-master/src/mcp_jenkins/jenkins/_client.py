@@ -1,16 +1,75 @@
-from jenkins import Jenkins
+from typing import TYPE_CHECKING
 
-from mcp_jenkins.jenkins._build import JenkinsBuild
-from mcp_jenkins.jenkins._job import JenkinsJob
-from mcp_jenkins.jenkins._node import JenkinsNode
-from mcp_jenkins.jenkins._queue_item import JenkinsQueueItem
+from mcp_jenkins.jenkins._throttle import Limit, Throttle
+from mcp_jenkins.store import Store
+
+if TYPE_CHECKING:
+    from mcp_jenkins.jenkins._resilience import Resilience
+    from mcp_jenkins.jenkins._signatures import Signature
+    from mcp_jenkins.jenkins._snapshot import Snapshot
 
 
 class JenkinsClient:
-    def __init__(self, *, url: str, username: str, password: str, timeout: int = 5) -> None:
-        self._jenkins = Jenkins(url=url, username=username, password=password, timeout=timeout)
+    def __init__(
+        self,
+        *,
+        url: str,
+        username: str,
+        password: str,
+        timeout: int = 5,
+        store: Store | None = None,
+        inventory_ttl: float = 30,
+        config_ttl: float = 10,
+        rate_limits: dict[str, Limit] | None = None,
+        timeouts: dict[str, float] | None = None,
+        retries: int = 3,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 30,
+        snapshot_max_age: float = 0,
+        artifact_dir: str | None = None,
+        error_signatures: tuple['Signature', ...] | None = None,
+        throttle: Throttle | None = None,
+        resilience: 'Resilience | None' = None,
+    ) -> None:
+        # python-jenkins, requests and the pydantic models are imported on first client creation
+        # instead of at server import, which keeps stdio spawn-to-ready time low
+        from mcp_jenkins.jenkins._artifact import JenkinsArtifact
+        from mcp_jenkins.jenkins._build import JenkinsBuild
+        from mcp_jenkins.jenkins._job import JenkinsJob
+        from mcp_jenkins.jenkins._log import JenkinsLog
+        from mcp_jenkins.jenkins._node import JenkinsNode
+        from mcp_jenkins.jenkins._queue_item import JenkinsQueueItem
+        from mcp_jenkins.jenkins._resilience import CircuitBreaker, Resilience, RetryPolicy
+        from mcp_jenkins.jenkins._test_report import JenkinsTestReport
+        from mcp_jenkins.jenkins._transport import JenkinsTransport
+
+        self._jenkins = JenkinsTransport(
+            url=url,
+            username=username,
+            password=password,
+            timeout=timeout,
+            # Clients of different users share the throttle and the circuit breaker, both protect the one Jenkins
+            throttle=throttle or Throttle(rate_limits),
+            resilience=resilience
+            or Resilience(RetryPolicy(attempts=retries), CircuitBreaker(breaker_threshold, breaker_reset)),
+            timeouts=timeouts,
+        )
+
+        self.store = store or Store()
+
+        self.job = JenkinsJob(self._jenkins, self.store, inventory_ttl, config_ttl)
+        self.build = JenkinsBuild(self._jenkins, self.store, snapshot_max_age)
+        self.node = JenkinsNode(self._jenkins, self.store, snapshot_max_age, config_ttl)
+        self.queue_item = JenkinsQueueItem(self._jenkins, self.store, snapshot_max_age)
+        self.test_report = JenkinsTestReport(self._jenkins, self.build, self.store)
+        self.artifact = JenkinsArtifact(self._jenkins, self.build, self.store, artifact_dir)
+        self.log = JenkinsLog(self._jenkins, self.build, self.store, error_signatures)
+
+    def close(self) -> None:
+        """Close the HTTP session, the client is not used anymore"""
+        self._jenkins._session.close()
 
-        self.job = JenkinsJob(self._jenkins)
-        self.build = JenkinsBuild(self._jenkins)
-        self.node = JenkinsNode(self._jenkins)
-        self.queue_item = JenkinsQueueItem(self._jenkins)
+    @property
+    def snapshots(self) -> list['Snapshot']:
+        """The snapshots refreshed by the background poller"""
+        return [self.queue_item.snapshot, self.node.snapshot, self.build.running_snapshot]
@@ -0,0 +1,185 @@
+import hashlib
+import re
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+
+import requests
+from jenkins import CONFIG_JOB, CONFIG_NODE, Jenkins
+
+from mcp_jenkins.metrics import REGISTRY
+from mcp_jenkins.store import Store
+
+CONFIG_READS = REGISTRY.counter(
+    'mcp_jenkins_config_reads_total',
+    'Config.xml reads by outcome: fresh (served without a request), not_modified (304), '
+    'unchanged (downloaded, same content), changed (downloaded, new content)',
+    ['kind', 'result'],
+)
+CONFIG_HIT_RATIO = REGISTRY.gauge(
+    'mcp_jenkins_config_cache_hit_ratio', 'Share of config.xml reads answered without downloading it', ['kind']
+)
+
+_HITS = ('fresh', 'not_modified')
+_RESULTS = (*_HITS, 'unchanged', 'changed')
+
+# Longest matched line or element text returned by a search
+_MATCH_CHARS = 200
+
+
+def compile_query(pattern: str | None, xpath: str | None) -> re.Pattern | None:
+    """
+    Check a config search query before any config is fetched
+
+    Returns:
+        re.Pattern | None: The compiled `pattern`
+
+    Raises:
+        ValueError: `pattern` is not a valid regex or `xpath` is not a valid ElementTree XPath
+    """
+    try:
+        regex = re.compile(pattern) if pattern else None
+    except re.error as e:
+        msg = f'Invalid pattern {pattern!r}: {e}'
+        raise ValueError(msg) from None
+    if xpath is not None:
+        try:
+            list(ET.Element('project').iterfind('.' + xpath.lstrip('.')))
+        # ElementPath reports a malformed path with any of these
+        except (SyntaxError, KeyError, TypeError) as e:
+            msg = f'Invalid xpath {xpath!r}: {e}'
+            raise ValueError(msg) from None
+    return regex
+
+
+def search_config(xml: str, pattern: str | re.Pattern | None = None, xpath: str | None = None) -> list[str]:
+    """
+    Search a config.xml
+
+    Args:
+        xml: The config.xml
+        pattern: A regex, compiled or not, matched against the lines of the config, or against the text
+            of the elements `xpath` selects when it is given too
+        xpath: An ElementTree XPath, e.g. `.//assignedNode` or `.//scm//url`
+
+    Returns:
+        list[str]: The matching lines or element texts, stripped and truncated
+    """
+    regex = re.compile(pattern) if pattern else None
+    if xpath is None:
+        lines = (line.strip() for line in xml.splitlines())
+        return [line[:_MATCH_CHARS] for line in lines if regex is None or regex.search(line)]
+    # Jenkins sends XML 1.1 declarations that ElementTree rejects, the declaration carries nothing else
+    root = ET.fromstring(re.sub(r'^<\?xml[^>]*\?>', '', xml.lstrip()))  # noqa: S314 (config of the configured Jenkins)
+    texts = ((element.text or '').strip() or element.tag for element in root.iterfind('.' + xpath.lstrip('.')))
+    return [text[:_MATCH_CHARS] for text in texts if regex is None or regex.search(text)]
+
+
+class ConfigCache:
+    """
+    Cache of job and node config.xml, revalidated with conditional requests.
+
+    A cached config is served without any request for `ttl` seconds. After that it is revalidated
+    with `If-None-Match`/`If-Modified-Since` when Jenkins sent an ETag or Last-Modified, so an
+    unchanged config costs a 304. Jenkins usually sends neither for config.xml, in which case it is
+    downloaded again and its digest tells whether it changed.
+
+    Configs are stored by digest, so the many jobs generated from one template share a single copy.
+    """
+
+    NAMESPACE = 'config'
+    BLOB_NAMESPACE = 'config_blob'
+
+    _MAX_SEARCHES = 4096
+
+    def __init__(self, jenkins: Jenkins, store: Store | None = None, ttl: float = 10) -> None:
+        self._jenkins = jenkins
+        self._store = store or Store()
+        self.ttl = ttl
+        self._searches: OrderedDict[tuple[str, str | None, str | None], list[str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _url(self, kind: str, name: str) -> str:
+        if kind == 'job':
+            folder_url, short_name = self._jenkins._get_job_folder(name)
+            return self._jenkins._build_url(CONFIG_JOB, {'folder_url': folder_url, 'short_name': short_name})
+        return self._jenkins._build_url(CONFIG_NODE, {'name': name})
+
+    def _record(self, kind: str, result: str) -> None:
+        CONFIG_READS.inc(kind=kind, result=result)
+        reads = {result: CONFIG_READS.get(kind=kind, result=result) for result in _RESULTS}
+        CONFIG_HIT_RATIO.set(sum(reads[hit] for hit in _HITS) / sum(reads.values()), kind=kind)
+
+    def get(self, kind: str, name: str, max_age: float | None = None) -> str:
+        """
+        Get a config.xml
+
+        Args:
+            kind: `job` or `node`
+            name: The fullname of the job or the name of the node
+            max_age: Seconds a cached config is served without revalidation, defaults to `self.ttl`
+
+        Returns:
+            str: The config.xml
+        """
+        return self.get_with_digest(kind, name, max_age)[0]
+
+    def get_with_digest(self, kind: str, name: str, max_age: float | None = None) -> tuple[str, str]:
+        """Same as `get`, together with the sha256 digest of the config"""
+        key = f'{kind}:{name}'
+        entry = self._store.get_entry(self.NAMESPACE, key, allow_stale=True)
+        cached = entry[0] if entry is not None else None
+        xml = self._store.get(self.BLOB_NAMESPACE, cached['digest']) if cached is not None else None
+        if xml is None:
+            # The config was evicted, so validators alone would be of no use
+            cached = None
+        elif entry[1] <= (self.ttl if max_age is None else max_age):
+            self._record(kind, 'fresh')
+            return xml, cached['digest']
+
+        headers = {}
+        if cached is not None and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached is not None and cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        response = self._jenkins.jenkins_request(requests.Request('GET', self._url(kind, name), headers=headers))
+
+        if response.status_code == 304 and cached is not None:
+            self._record(kind, 'not_modified')
+            self._store.set(self.NAMESPACE, key, cached)
+            return xml, cached['digest']
+
+        xml = response.text
+        digest = hashlib.sha256(xml.encode()).hexdigest()
+        self._record(kind, 'unchanged' if cached is not None and cached['digest'] == digest else 'changed')
+        self._store.set(self.BLOB_NAMESPACE, digest, xml)
+        self._store.set(
+            self.NAMESPACE,
+            key,
+            {
+                'digest': digest,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+            },
+        )
+        return xml, digest
+
+    def search(
+        self, kind: str, name: str, pattern: str | re.Pattern | None, xpath: str | None, max_age: float | None = None
+    ) -> list[str]:
+        """`search_config` on a cached config, remembered by digest so an unchanged config is searched once"""
+        xml, digest = self.get_with_digest(kind, name, max_age)
+        key = (digest, pattern, xpath)
+        with self._lock:
+            if key in self._searches:
+                self._searches.move_to_end(key)
+                return self._searches[key]
+        matches = search_config(xml, pattern, xpath)
+        with self._lock:
+            self._searches[key] = matches
+            if len(self._searches) > self._MAX_SEARCHES:
+                self._searches.popitem(last=False)
+        return matches
+
+    def invalidate(self, kind: str, name: str) -> None:
+        self._store.delete(self.NAMESPACE, f'{kind}:{name}')
@@ -0,0 +1,98 @@
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from mcp_jenkins.metrics import REGISTRY
+from mcp_jenkins.store import Store
+
+INVENTORY_REFRESHES = REGISTRY.counter(
+    'mcp_jenkins_inventory_refreshes_total', 'Crawls of a job inventory made in the background', ['inventory', 'result']
+)
+
+
+class Inventory:
+    """
+    Result of an expensive crawl of the job tree, shared through the store and persisted with it.
+
+    Only an empty store waits for the crawl: a value older than `ttl`, or expired early by an event, is served
+    while a daemon thread revalidates it, and its decoded form is reused until the stored value changes.
+    A crawl claims the store for `ttl`, so the processes sharing it, such as stdio sessions started in a row with
+    a stale value, do not crawl again before then unless an event expired the value.
+    """
+
+    NAMESPACE = 'jobs'
+    CRAWLS = 'crawls'
+
+    def __init__(
+        self, store: Store, name: str, fetch: Callable[[], Any], decode: Callable[[Any], Any], ttl: float
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self._store = store
+        self._fetch = fetch
+        self._decode = decode
+        # The decoded value and when the stored value it was decoded from was stored
+        self._decoded: tuple[float, Any] | None = None
+        self._revalidating = False
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        stored_at = self._stored_at()
+        if stored_at is not None and self._stale():
+            self.revalidate()
+        decoded = self._decoded
+        if stored_at is not None and decoded is not None and decoded[0] == stored_at:
+            return decoded[1]
+
+        value = self._store.get(self.NAMESPACE, self.name, allow_stale=True) if stored_at is not None else None
+        if value is None:
+            value = self.refresh()
+            stored_at = self._stored_at()
+        result = self._decode(value)
+        # Only kept when no refresh landed in between, which would leave an older value under a newer time
+        if stored_at is not None and self._stored_at() == stored_at:
+            self._decoded = (stored_at, result)
+        return result
+
+    def _stored_at(self) -> float | None:
+        timestamps = self._store.timestamps(self.NAMESPACE, self.name)
+        return timestamps[0] if timestamps is not None else None
+
+    def _stale(self) -> bool:
+        timestamps = self._store.timestamps(self.NAMESPACE, self.name)
+        if timestamps is None:
+            return False
+        stored_at, expires_at = timestamps
+        now = time.time()
+        # Expired early by an event
+        if expires_at is not None and expires_at <= now and expires_at < stored_at + self.ttl:
+            return True
+        return now - stored_at > self.ttl and self._store.get(self.CRAWLS, self.name) is None
+
+    def refresh(self) -> Any:
+        """Crawl and store the value"""
+        self._store.set(self.CRAWLS, self.name, time.time(), ttl=self.ttl)
+        value = self._fetch()
+        self._store.set(self.NAMESPACE, self.name, value, ttl=self.ttl)
+        return value
+
+    def revalidate(self) -> None:
+        """Refresh the value in a daemon thread, unless a refresh is already running"""
+        with self._lock:
+            if self._revalidating:
+                return
+            self._revalidating = True
+
+        def run() -> None:
+            try:
+                self.refresh()
+            except Exception:  # noqa: BLE001 (the stale value keeps being served, the next read retries)
+                INVENTORY_REFRESHES.inc(inventory=self.name, result='error')
+            else:
+                INVENTORY_REFRESHES.inc(inventory=self.name, result='ok')
+            finally:
+                with self._lock:
+                    self._revalidating = False
+
+        threading.Thread(target=run, name=f'mcp-jenkins-inventory-{self.name}', daemon=True).start()
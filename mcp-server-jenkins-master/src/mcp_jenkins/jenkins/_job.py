@@ -1,13 +1,64 @@
 import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-from jenkins import Jenkins
+import requests
+from jenkins import Jenkins, NotFoundException
 
-from mcp_jenkins.models.job import Folder, Job, JobBase, MultibranchPipeline
+from mcp_jenkins.budget import response_budget
+from mcp_jenkins.jenkins._config import ConfigCache, compile_query
+from mcp_jenkins.jenkins._inventory import Inventory
+from mcp_jenkins.jenkins._search import FIELD_WEIGHTS, SearchIndex, tokenize
+from mcp_jenkins.jenkins._throttle import read_lane
+from mcp_jenkins.jenkins._transport import job_path
+from mcp_jenkins.models.job import BranchScan, ConfigMatch, Folder, Job, JobBase, JobMatch, MultibranchPipeline
+from mcp_jenkins.store import Store
+
+INDEX_FIELDS = (
+    '_class,name,fullName,url,color,displayName,description,'
+    'lastBuild[actions[causes[shortDescription],parameters[name,value]]]'
+)
+MAX_PARAMETER_CHARS = 200
+MAX_DESCRIPTION_CHARS = 200
+
+# Smallest response budget get_job_info fetches nested builds and sub-jobs for
+DEEP_INFO_BUDGET = 64 * 1024
+
+BRANCH_FIELDS = 'name,fullName,url,color,lastBuild[number,url,result,timestamp]'
+# Jobs whose branches Jenkins discovers by scanning, i.e. whose build is a branch indexing
+SCANNED_CLASSES = ('WorkflowMultiBranchProject', 'OrganizationFolder')
+SCAN_POLL_INTERVAL = 2.0
+SCAN_LOG_LINES = 20
+
+
+def _nested_tree(fields: str, depth: int) -> str:
+    """`jobs[fields,jobs[fields,...]]`, down to `depth` levels of folders"""
+    tree = fields
+    for _ in range(depth):
+        tree = f'{fields},jobs[{tree}]'
+    return f'jobs[{tree}]'
+
+
+# The searchable fields of the jobs in folders as deep as the inventory's
+INDEX_TREE = _nested_tree(INDEX_FIELDS, 20)
 
 
 class JenkinsJob:
-    def __init__(self, jenkins: Jenkins) -> None:
+    def __init__(
+        self, jenkins: Jenkins, store: Store | None = None, inventory_ttl: float = 30, config_ttl: float = 10
+    ) -> None:
         self._jenkins = jenkins
+        self._store = store or Store()
+        self._configs = ConfigCache(jenkins, self._store, config_ttl)
+        self.inventory = Inventory(
+            self._store,
+            'all',
+            lambda: self._jenkins.get_jobs(folder_depth=20),
+            lambda jobs: [self._to_model(job) for job in jobs],
+            inventory_ttl,
+        )
+        self.search_index = Inventory(self._store, 'index', self._fetch_documents, self._build_index, inventory_ttl)
 
     @staticmethod
     def _to_model(job_data: dict) -> JobBase:
@@ -18,7 +69,87 @@ class JenkinsJob:
         return Job.model_validate(job_data)
 
     def get_all_jobs(self) -> list[JobBase]:
-        return [self._to_model(job) for job in self._jenkins.get_jobs(folder_depth=20)]
+        """The job inventory, see `Inventory`"""
+        return list(self.inventory.get())
+
+    def _fetch_documents(self) -> list[dict]:
+        """The searchable fields of every job, from one query over the whole tree"""
+        documents = []
+
+        def walk(jobs: list[dict], parent: str) -> None:
+            for job in jobs:
+                fullname = job.get('fullName') or f'{parent}/{job["name"]}'.lstrip('/')
+                causes, parameters = [], []
+                for action in (job.get('lastBuild') or {}).get('actions') or []:
+                    causes += [cause.get('shortDescription') or '' for cause in action.get('causes') or []]
+                    parameters += [
+                        f'{parameter.get("name")} {parameter.get("value")}'[:MAX_PARAMETER_CHARS]
+                        for parameter in action.get('parameters') or []
+                        if isinstance(parameter.get('value'), str | int | float | bool)
+                    ]
+                documents.append(
+                    {
+                        '_class': job.get('_class', ''),
+                        'fullname': fullname,
+                        'name': job.get('name', ''),
+                        'url': job.get('url', ''),
+                        'color': job.get('color'),
+                        'displayName': job.get('displayName') or '',
+                        'description': job.get('description') or '',
+                        'builds': ' '.join([*causes, *parameters]),
+                    }
+                )
+                walk(job.get('jobs') or [], fullname)
+
+        walk(self._jenkins.get_tree('', INDEX_TREE).get('jobs') or [], '')
+        return documents
+
+    @staticmethod
+    def _build_index(documents: list[dict]) -> tuple[SearchIndex, dict[str, dict]]:
+        index = SearchIndex(
+            {document['fullname']: {field: document[field] for field in FIELD_WEIGHTS} for document in documents}
+        )
+        return index, {document['fullname']: document for document in documents}
+
+    def find_jobs(self, query: str, limit: int = 20) -> list[JobMatch]:
+        """
+        Full-text search of the jobs' names, display names, fullnames, descriptions and last build causes
+        and parameters, ranked with BM25
+
+        Args:
+            query: Free text, e.g. `payments deploy staging`
+            limit: The maximum number of matches
+
+        Returns:
+            list[JobMatch]: The best matches first, with their score and the query terms they matched
+        """
+        if not tokenize(query):
+            msg = f'The query {query!r} has no searchable word'
+            raise ValueError(msg)
+        index, documents = self.search_index.get()
+        matches = []
+        for hit in index.search(query, limit):
+            document = documents[hit.fullname]
+            description = document['description']
+            if len(description) > MAX_DESCRIPTION_CHARS:
+                description = description[:MAX_DESCRIPTION_CHARS] + '...'
+            matches.append(
+                JobMatch(
+                    fullname=hit.fullname,
+                    name=document['name'],
+                    url=document['url'],
+                    color=document['color'],
+                    description=description or None,
+                    score=hit.score,
+                    matched=list(hit.matched),
+                )
+            )
+        return matches
+
+    def get_buildable_fullnames(self, fullname_pattern: str = None) -> list[str]:
+        """The fullnames of the jobs with builds of their own, i.e. neither folders nor multibranch projects"""
+        jobs = self.search_jobs(fullname_pattern=fullname_pattern)
+        return [job.fullname for job in jobs if not isinstance(job, Folder | MultibranchPipeline)]
 
     def search_jobs(
         self,
@@ -55,7 +186,138 @@ class JenkinsJob:
         return result
 
     def get_job_config(self, fullname: str) -> str:
-        return self._jenkins.get_job_config(fullname)
+        return self._configs.get('job', fullname)
+
+    def search_job_configs(
+        self,
+        pattern: str | None = None,
+        xpath: str | None = None,
+        class_pattern: str | None = None,
+        fullname_pattern: str | None = None,
+        max_age: float = 300,
+        max_workers: int = 8,
+    ) -> list[ConfigMatch]:
+        """
+        Search the config.xml of every job in the inventory matching the class and fullname patterns
+
+        Configs are fetched in parallel, at most `max_workers` at a time, and served from the config
+        cache when younger than `max_age`, so a repeated search costs no request.
+
+        Returns:
+            list[ConfigMatch]: The jobs whose config matched, and the jobs whose config could not be read
+        """
+        if not pattern and not xpath:
+            msg = 'Either pattern or xpath is required'
+            raise ValueError(msg)
+        # Checked once up front, rather than failing the same way for every job
+        regex = compile_query(pattern, xpath)
+
+        def search(job: JobBase) -> ConfigMatch:
+            try:
+                matches = self._configs.search('job', job.fullname, regex, xpath, max_age)
+            except Exception as e:  # noqa: BLE001 (reported per job, the others are still searched)
+                return ConfigMatch(fullname=job.fullname, error=str(e))
+            return ConfigMatch(fullname=job.fullname, matches=matches)
+
+        jobs = self.search_jobs(class_pattern=class_pattern, fullname_pattern=fullname_pattern)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(search, jobs))
+        return [result for result in results if result.matches or result.error]
 
     def get_job_info(self, fullname: str) -> JobBase:
-        return self._to_model(self._jenkins.get_job_info(fullname, depth=1))
+        # depth=1 details every build and sub-job, which a small response budget could not hold anyway
+        budget = response_budget()
+        depth = 0 if budget is not None and budget < DEEP_INFO_BUDGET else 1
+        return self._to_model(self._jenkins.get_job_info(fullname, depth=depth))
+
+    def get_multibranch_branches(self, fullname: str, offset: int = 0, limit: int = 100) -> list[JobBase]:
+        """
+        A page of the branches of a multibranch pipeline, with only their color and last build
+
+        Returns:
+            list[JobBase]: The branches `offset` to `offset + limit`, in Jenkins' order
+        """
+        tree = f'jobs[_class,{BRANCH_FIELDS}]{{{offset},{offset + limit}}}'
+        jobs = self._jenkins.get_tree(job_path(fullname), tree).get('jobs') or []
+        return [self._to_model(job) for job in jobs]
+
+    def _branch_names(self, fullname: str) -> set[str]:
+        data = self._jenkins.get_tree(job_path(fullname), '_class,jobs[name]')
+        if not data.get('_class', '').endswith(SCANNED_CLASSES):
+            msg = f'{fullname} is not a multibranch pipeline or organization folder'
+            raise ValueError(msg)
+        return {job['name'] for job in data.get('jobs') or []}
+
+    def _indexing_log(self, fullname: str, start: int) -> tuple[str, int, bool]:
+        """
+        The branch indexing log from byte `start`, as Jenkins' progressive text
+
+        Returns:
+            tuple[str, int, bool]: The text, the offset to continue from and whether the indexing is still running
+        """
+        url = self._jenkins._build_url(f'{job_path(fullname)}/indexing/logText/progressiveText?start={start}')
+        try:
+            response = self._jenkins.jenkins_request(requests.Request('GET', url))
+        except NotFoundException:
+            # Never indexed yet
+            return '', 0, False
+        size = int(response.headers.get('X-Text-Size') or start + len(response.content))
+        return response.text, size, response.headers.get('X-More-Data') == 'true'
+
+    def _trigger_scan(self, fullname: str) -> None:
+        url = self._jenkins._build_url(f'{job_path(fullname)}/build?delay=0sec')
+        self._jenkins.jenkins_request(requests.Request('POST', url))
+
+    def scan_multibranch_pipeline(
+        self, fullname: str, *, wait: bool = False, timeout: float = 300, poll_interval: float = SCAN_POLL_INTERVAL
+    ) -> BranchScan:
+        """
+        Trigger a branch indexing of a multibranch pipeline or organization folder
+
+        With `wait`, the indexing log is tailed until the scan finishes or `timeout` seconds pass,
+        and the branches found are compared with the ones before the scan.
+
+        Returns:
+            BranchScan: The status of the scan, and when waited for, the added and removed branches
+        """
+        # Only the trigger is a POST, the reads and the polling go through the read lanes
+        with read_lane():
+            before = self._branch_names(fullname)
+            if not wait:
+                self._trigger_scan(fullname)
+                return BranchScan(fullname=fullname, status='triggered')
+
+            started_at = time.monotonic()
+            # Until the new indexing starts, Jenkins keeps serving the log of the previous one
+            previous, _, _ = self._indexing_log(fullname, 0)
+            self._trigger_scan(fullname)
+
+            offset, started, status = 0, False, 'timeout'
+            lines: deque[str] = deque(maxlen=SCAN_LOG_LINES)
+            pending = ''
+            while True:
+                text, size, more = self._indexing_log(fullname, offset)
+                started = started or more or (size > 0 and text != previous)
+                if started:
+                    *complete, pending = (pending + text).split('\n')
+                    lines.extend(line.rstrip('\r') for line in complete)
+                    offset = size
+                    if not more:
+                        status = 'finished'
+                        break
+                if time.monotonic() - started_at + poll_interval > timeout:
+                    break
+                time.sleep(poll_interval)
+            if pending.strip():
+                lines.append(pending.rstrip('\r'))
+
+            after = self._branch_names(fullname)
+            return BranchScan(
+                fullname=fullname,
+                status=status,
+                added=sorted(after - before),
+                removed=sorted(before - after),
+                branches=len(after),
+                log=list(lines),
+                elapsed=round(time.monotonic() - started_at, 1),
+            )
@@ -0,0 +1,130 @@
+import re
+import threading
+from collections.abc import Callable
+from functools import lru_cache
+
+_SYMBOL = re.compile(r'\s*(&&|\|\||!|\(|\)|"[^"]*"|[^\s()&|!"]+)')
+
+# Evaluates a parsed expression given the nodes of a label and all nodes
+Matcher = Callable[[Callable[[str], frozenset[str]], frozenset[str]], frozenset[str]]
+
+
+def _split(expression: str) -> list[str]:
+    symbols = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _SYMBOL.match(expression, position)
+        if match is None:
+            msg = f'Invalid label expression {expression!r} at position {position}'
+            raise ValueError(msg)
+        symbols.append(match.group(1))
+        position = match.end()
+    return symbols
+
+
+@lru_cache(maxsize=256)
+def parse_label_expression(expression: str) -> Matcher:
+    """
+    Parse a Jenkins label expression made of labels, `&&`, `||`, `!` and parentheses
+
+    Returns:
+        Matcher: A function of (nodes of a label, all nodes) returning the matching nodes
+    """
+    symbols = _split(expression)
+    position = 0
+
+    def peek() -> str | None:
+        return symbols[position] if position < len(symbols) else None
+
+    def take() -> str:
+        nonlocal position
+        symbol = peek()
+        if symbol is None:
+            msg = f'Unexpected end of label expression {expression!r}'
+            raise ValueError(msg)
+        position += 1
+        return symbol
+
+    def or_expr() -> Matcher:
+        operands = [and_expr()]
+        while peek() == '||':
+            take()
+            operands.append(and_expr())
+        if len(operands) == 1:
+            return operands[0]
+        return lambda nodes_of, every: frozenset().union(*(operand(nodes_of, every) for operand in operands))
+
+    def and_expr() -> Matcher:
+        operands = [unary()]
+        while peek() == '&&':
+            take()
+            operands.append(unary())
+        if len(operands) == 1:
+            return operands[0]
+        return lambda nodes_of, every: frozenset.intersection(*(operand(nodes_of, every) for operand in operands))
+
+    def unary() -> Matcher:
+        symbol = take()
+        if symbol == '!':
+            operand = unary()
+            return lambda nodes_of, every: every - operand(nodes_of, every)
+        if symbol == '(':
+            inner = or_expr()
+            if take() != ')':
+                msg = f'Missing closing parenthesis in label expression {expression!r}'
+                raise ValueError(msg)
+            return inner
+        if symbol in ('&&', '||', ')'):
+            msg = f'Unexpected {symbol!r} in label expression {expression!r}'
+            raise ValueError(msg)
+        label = symbol[1:-1] if symbol.startswith('"') else symbol
+        return lambda nodes_of, every: nodes_of(label)
+
+    matcher = or_expr()
+    if peek() is not None:
+        msg = f'Unexpected {peek()!r} in label expression {expression!r}'
+        raise ValueError(msg)
+    return matcher
+
+
+class LabelIndex:
+    """
+    Index from label to the names of the nodes carrying it.
+
+    `update` only touches the nodes whose labels changed since the previous update, and
+    matching an expression is set algebra over the index instead of a look at every node.
+    """
+
+    def __init__(self) -> None:
+        self._labels_of: dict[str, frozenset[str]] = {}
+        self._nodes_of: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def update(self, labels_of: dict[str, list[str]]) -> None:
+        """Replace the index content with the labels of every node, given by node name"""
+        with self._lock:
+            for name in self._labels_of.keys() - labels_of.keys():
+                self._move(name, self._labels_of.pop(name), frozenset())
+            for name, labels in labels_of.items():
+                labels = frozenset(labels)
+                previous = self._labels_of.get(name, frozenset())
+                if labels != previous:
+                    self._move(name, previous, labels)
+                    self._labels_of[name] = labels
+
+    def _move(self, name: str, previous: frozenset[str], labels: frozenset[str]) -> None:
+        for label in previous - labels:
+            self._nodes_of[label].discard(name)
+            if not self._nodes_of[label]:
+                del self._nodes_of[label]
+        for label in labels - previous:
+            self._nodes_of.setdefault(label, set()).add(name)
+
+    def match(self, expression: str) -> frozenset[str]:
+        """Names of the nodes a label expression matches, every node for a blank expression"""
+        with self._lock:
+            every = frozenset(self._labels_of)
+            if not expression.strip():
+                return every
+            return parse_label_expression(expression)(lambda label: frozenset(self._nodes_of.get(label, ())), every)
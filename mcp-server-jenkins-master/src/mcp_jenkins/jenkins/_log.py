@@ -0,0 +1,126 @@
+from collections.abc import Iterable, Iterator
+
+from jenkins import Jenkins
+
+from mcp_jenkins.jenkins._build import JenkinsBuild
+from mcp_jenkins.jenkins._log_diff import diff_lines
+from mcp_jenkins.jenkins._signatures import (
+    DEFAULT_SIGNATURES,
+    Signature,
+    extract_errors,
+    pattern_signatures,
+    signatures_digest,
+)
+from mcp_jenkins.jenkins._transport import job_path
+from mcp_jenkins.models.build import BuildErrors, LogDiff
+from mcp_jenkins.store import Store
+
+# Longest line kept whole, a log without newlines is cut into lines of this size
+MAX_LINE_CHARS = 1024 * 1024
+
+
+def split_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Split text chunks into lines without newlines"""
+    pending = ''
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split('\n')
+        yield from lines
+        while len(pending) > MAX_LINE_CHARS:
+            yield pending[:MAX_LINE_CHARS]
+            pending = pending[MAX_LINE_CHARS:]
+    if pending:
+        yield pending
+
+
+class JenkinsLog:
+    def __init__(
+        self,
+        jenkins: Jenkins,
+        build: JenkinsBuild,
+        store: Store | None = None,
+        signatures: tuple[Signature, ...] | None = None,
+    ) -> None:
+        self._jenkins = jenkins
+        self._build = build
+        self._store = store or Store()
+        self.signatures = signatures or DEFAULT_SIGNATURES
+
+    def iter_lines(self, fullname: str, number: int) -> Iterator[str]:
+        """The console log line by line, from the log cached by `get_build_logs` or streamed from Jenkins"""
+        logs = self._store.get('build_logs', f'{fullname}#{number}')
+        if logs is not None:
+            yield from logs.splitlines()
+            return
+        yield from split_lines(self._jenkins.stream(f'{job_path(fullname)}/{number}/consoleText'))
+
+    def extract_build_errors(
+        self, fullname: str, number: int, limit: int = 20, context: int = 2, patterns: list[str] | None = None
+    ) -> BuildErrors:
+        """
+        Find the failures in the full console log of a build, read once as a stream
+
+        Args:
+            fullname: The fullname of the job
+            number: The build number
+            limit: The maximum number of distinct errors to return
+            context: The number of lines shown before and after each error, at most 10
+            patterns: Extra regexes to look for, ranked above the library's signatures, see `pattern_signatures`
+
+        Returns:
+            BuildErrors: The number of lines and the distinct errors, most likely root cause first
+        """
+        signatures = self.signatures + pattern_signatures(patterns)
+        context = max(0, min(context, 10))
+        key = f'{fullname}#{number}#{signatures_digest(signatures)}#{context}'
+        result = self._store.get('build_errors', key)
+        if result is None:
+            # Check before reading, a build finishing in between must not leave a partial result cached
+            finished = self._build._is_finished(fullname, number)
+            result = extract_errors(self.iter_lines(fullname, number), signatures, context)
+            if finished:
+                self._store.set('build_errors', key, result)
+        return BuildErrors(
+            lines=result['lines'], errors=result['errors'][:limit], truncated=max(len(result['errors']) - limit, 0)
+        )
+
+    def diff_build_logs(
+        self, fullname: str, base: int, target: int, max_hunks: int = 20, context: int = 3, window: int = 1000
+    ) -> LogDiff:
+        """
+        Diff the console logs of two builds, ignoring timestamps, durations and hashes
+
+        Both logs are streamed side by side and at most `window` lines of each are held.
+
+        Args:
+            fullname: The fullname of the job
+            base: The number of the reference build, e.g. the last successful one
+            target: The number of the compared build
+            max_hunks: The maximum number of hunks to return
+            context: The number of unchanged lines shown around each change, at most 10
+            window: The number of lines looked ahead to realign the logs after a change, at most 10000
+
+        Returns:
+            LogDiff: The number of lines of both logs, the lines removed and added, and the changed hunks
+        """
+        context = max(0, min(context, 10))
+        window = max(1, min(window, 10000))
+        # Both build numbers lead the key, so an event on either build purges the diff
+        key = f'{fullname}#{base}#{target}:{context}:{window}'
+        result = self._store.get('log_diff', key)
+        if result is None:
+            # Check before reading, a build finishing in between must not leave a partial diff cached
+            finished = self._build._is_finished(fullname, base) and self._build._is_finished(fullname, target)
+            result = diff_lines(
+                self.iter_lines(fullname, base), self.iter_lines(fullname, target), window=window, context=context
+            )
+            if finished:
+                self._store.set('log_diff', key, result)
+        return LogDiff(
+            baseLines=result['baseLines'],
+            targetLines=result['targetLines'],
+            removed=result['removed'],
+            added=result['added'],
+            hunks=result['diff'][:max_hunks],
+            truncated=result['hunks'] - min(len(result['diff']), max_hunks),
+        )
@@ -0,0 +1,170 @@
+import re
+from collections import deque
+from collections.abc import Iterable
+from itertools import islice
+
+# Hunks kept per diff, lines kept per hunk and characters kept per line
+MAX_HUNKS = 100
+MAX_HUNK_LINES = 200
+MAX_LINE_CHARS = 500
+
+_ANSI = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+# Tokens that differ between two runs of the same steps: dates and times, durations, hashes and long ids.
+# The numeric branches share their leading digit, so each position is tried once rather than once per branch.
+_VOLATILE = re.compile(
+    r'\d(?:\d{3}-\d\d-\d\d(?:[T ]\d\d:\d\d:\d\d(?:[.,]\d+)?(?:Z|[+-]\d\d:?\d\d)?)?'
+    r'|\d?:\d\d:\d\d(?:[.,]\d+)?'
+    r'|\d*(?:\.\d+)? ?(?:ms|s|secs?|seconds?|mins?|minutes?|h|hours?)\b)'
+    r'|[0-9a-f]{7,64}\b'
+)
+
+
+def normalise(line: str) -> str:
+    """Blank out timestamps, durations, hashes and ids, so only meaningful changes are reported"""
+    if '\x1b' in line:
+        line = _ANSI.sub('', line)
+    return _VOLATILE.sub('#', line.strip())
+
+
+class _Side:
+    """A log read ahead by at most `window` lines, each with the hash of its normalised text"""
+
+    def __init__(self, lines: Iterable[str], window: int) -> None:
+        self._lines = iter(lines)
+        self._window = window
+        self.buffer: deque[tuple[int, str]] = deque()
+        # Lines popped, i.e. the line number before the buffer
+        self.number = 0
+
+    def fill(self) -> None:
+        while len(self.buffer) < self._window:
+            line = next(self._lines, None)
+            if line is None:
+                return
+            self.buffer.append((hash(normalise(line)), line))
+
+    def pop(self, count: int) -> list[str]:
+        self.number += count
+        return [self.buffer.popleft()[1] for _ in range(count)]
+
+
+def _resync(base: deque[tuple[int, str]], target: deque[tuple[int, str]], run: int = 2) -> tuple[int, int] | None:
+    """
+    The fewest lines to drop from each side, in total, for both to start with the same `run` lines.
+
+    The search region doubles until a match is found, so the work is proportional to the lines dropped.
+    """
+    limit = 4
+    while True:
+        base_hashes = [line[0] for line in islice(base, limit + run)]
+        target_hashes = [line[0] for line in islice(target, limit + run)]
+        positions: dict[int, list[int]] = {}
+        for j, value in enumerate(target_hashes[:limit]):
+            positions.setdefault(value, []).append(j)
+        best = None
+        for i, value in enumerate(base_hashes[:limit]):
+            if best is not None and i >= sum(best):
+                break
+            for j in positions.get(value, ()):
+                if best is not None and i + j >= sum(best):
+                    break
+                if base_hashes[i : i + run] == target_hashes[j : j + run]:
+                    best = (i, j)
+                    break
+        if best is not None and sum(best) < limit:
+            return best
+        if limit >= max(len(base), len(target)):
+            return best
+        limit *= 4
+
+
+def diff_lines(base: Iterable[str], target: Iterable[str], window: int = 1000, context: int = 3) -> dict:
+    """
+    Diff two logs in one pass over both, holding at most `window` lines of each.
+
+    Lines are compared by the hash of their normalised text. After a divergence both logs are realigned
+    on the closest common lines within the window, changes spanning more than the window are reported
+    as one hunk replacing the whole window.
+
+    Args:
+        base: The lines of the reference log, e.g. the last successful build's
+        target: The lines of the compared log
+        window: The number of lines looked ahead to realign the logs
+        context: The number of unchanged lines shown around each change
+
+    Returns:
+        dict: The number of lines of each log, the lines removed and added, and the hunks in unified diff
+            format, at most `MAX_HUNKS`, `hunks` counting them all
+    """
+    a, b = _Side(base, window), _Side(target, window)
+    result = {'baseLines': 0, 'targetLines': 0, 'removed': 0, 'added': 0, 'hunks': 0, 'diff': []}
+    before: deque[str] = deque(maxlen=context)
+    hunk = None
+
+    def add(line: str) -> None:
+        if len(hunk['lines']) < MAX_HUNK_LINES:
+            hunk['lines'].append(line[: MAX_LINE_CHARS + 1])
+        else:
+            hunk['omitted'] += 1
+
+    def close() -> None:
+        # Drop the unchanged lines past the context, they precede the next hunk if any
+        extra = max(hunk['trailing'] - context, 0)
+        hunk['base'] -= extra
+        hunk['target'] -= extra
+        dropped = min(extra, hunk['omitted'])
+        hunk['omitted'] -= dropped
+        del hunk['lines'][len(hunk['lines']) - (extra - dropped) :]
+        if len(result['diff']) < MAX_HUNKS:
+            lines = hunk['lines']
+            if hunk['omitted']:
+                lines.append(f'... {hunk["omitted"]} more lines')
+            header = f'@@ -{hunk["baseStart"]},{hunk["base"]} +{hunk["targetStart"]},{hunk["target"]} @@'
+            result['diff'].append('\n'.join([header, *lines]))
+
+    while True:
+        a.fill()
+        b.fill()
+        if not a.buffer and not b.buffer:
+            break
+        if a.buffer and b.buffer and a.buffer[0][0] == b.buffer[0][0]:
+            a.pop(1)
+            text = b.pop(1)[0][:MAX_LINE_CHARS]
+            before.append(text)
+            if hunk is not None:
+                add(f' {text}')
+                hunk['base'] += 1
+                hunk['target'] += 1
+                hunk['trailing'] += 1
+                if hunk['trailing'] > 2 * context:
+                    close()
+                    hunk = None
+            continue
+
+        removed, added = _resync(a.buffer, b.buffer) or (len(a.buffer), len(b.buffer))
+        if hunk is None:
+            result['hunks'] += 1
+            hunk = {
+                'baseStart': a.number + 1 - len(before),
+                'targetStart': b.number + 1 - len(before),
+                'base': len(before),
+                'target': len(before),
+                'lines': [f' {text}' for text in before],
+                'omitted': 0,
+            }
+        hunk['trailing'] = 0
+        hunk['base'] += removed
+        hunk['target'] += added
+        result['removed'] += removed
+        result['added'] += added
+        for text in a.pop(removed):
+            add(f'-{text}')
+        for text in b.pop(added):
+            add(f'+{text}')
+        before.clear()
+
+    if hunk is not None:
+        close()
+    result['baseLines'] = a.number
+    result['targetLines'] = b.number
+    return result
@@ -1,18 +1,102 @@
 from jenkins import Jenkins
 
+from mcp_jenkins.jenkins._config import ConfigCache
+from mcp_jenkins.jenkins._labels import LabelIndex
+from mcp_jenkins.jenkins._snapshot import Snapshot
 from mcp_jenkins.models.node import Node
+from mcp_jenkins.store import Store
+
+NODES_TREE = (
+    'computer[displayName,offline,temporarilyOffline,offlineCauseReason,numExecutors,'
+    'assignedLabels[name],executors[idle],monitorData[*]]'
+)
+
+# Seconds the node list is reused for when the background poller is off, so that the several
+# capacity questions of one agent turn cost a single request
+NODES_TTL = 5
+
+_MONITORS = {
+    'hudson.node_monitors.DiskSpaceMonitor': {'size': 'diskSpace'},
+    'hudson.node_monitors.TemporarySpaceMonitor': {'size': 'tempSpace'},
+    'hudson.node_monitors.SwapSpaceMonitor': {
+        'availableSwapSpace': 'availableSwapSpace',
+        'availablePhysicalMemory': 'availablePhysicalMemory',
+    },
+    'hudson.node_monitors.ResponseTimeMonitor': {'average': 'responseTime'},
+}
+
+
+def _monitor(monitor_data: dict | None) -> dict:
+    """Flatten the monitor data, monitors that have not run yet or failed report null"""
+    monitor = {}
+    for name, fields in _MONITORS.items():
+        data = (monitor_data or {}).get(name)
+        if isinstance(data, dict):
+            monitor.update({field: data.get(key) for key, field in fields.items()})
+    architecture = (monitor_data or {}).get('hudson.node_monitors.ArchitectureMonitor')
+    if isinstance(architecture, str):
+        monitor['architecture'] = architecture
+    return monitor
 
 
 class JenkinsNode:
-    def __init__(self, jenkins: Jenkins) -> None:
+    def __init__(
+        self, jenkins: Jenkins, store: Store | None = None, snapshot_max_age: float = 0, config_ttl: float = 10
+    ) -> None:
         self._jenkins = jenkins
+        store = store or Store()
+        self.snapshot = Snapshot(store, 'nodes', self._fetch_nodes, max(snapshot_max_age, NODES_TTL))
+        self._configs = ConfigCache(jenkins, store, config_ttl)
+        self.labels = LabelIndex()
 
     @staticmethod
     def _to_model(data: dict) -> Node:
         return Node.model_validate(data)
 
-    def get_all_nodes(self) -> list[Node]:
-        return [self._to_model(node) for node in self._jenkins.get_nodes()]
+    def _fetch_nodes(self) -> list[dict]:
+        nodes = []
+        for computer in self._jenkins.get_tree('computer', NODES_TREE)['computer']:
+            executors = computer.get('executors') or []
+            idle = sum(1 for executor in executors if executor.get('idle'))
+            nodes.append(
+                {
+                    'name': computer['displayName'],
+                    'offline': computer['offline'],
+                    'temporarilyOffline': computer.get('temporarilyOffline'),
+                    'offlineCause': computer.get('offlineCauseReason') or None,
+                    'labels': [label['name'] for label in computer.get('assignedLabels') or []],
+                    'numExecutors': computer.get('numExecutors'),
+                    'busyExecutors': len(executors) - idle,
+                    'idleExecutors': idle,
+                    'monitor': _monitor(computer.get('monitorData')),
+                }
+            )
+        return nodes
+
+    def get_all_nodes(self, max_age: float | None = None) -> list[Node]:
+        """Return the node snapshot, see `Snapshot.get`"""
+        return self.get_all_nodes_snapshot(max_age)[0]
+
+    def get_all_nodes_snapshot(self, max_age: float | None = None) -> tuple[list[Node], float]:
+        """Return the node snapshot and its age in seconds, see `Snapshot.get`"""
+        nodes, age = self.snapshot.get(max_age)
+        return [self._to_model(node) for node in nodes], age
+
+    def find_nodes_for_label(self, expression: str, max_age: float | None = None) -> tuple[list[Node], float]:
+        """
+        Find the nodes a label expression matches, from the label index kept in sync with the node snapshot
+
+        Args:
+            expression: A Jenkins label expression, e.g. `linux && (docker || podman) && !arm64`
+            max_age: See `Snapshot.get`
+
+        Returns:
+            tuple[list[Node], float]: The matching nodes and the snapshot's age in seconds
+        """
+        nodes, age = self.snapshot.get(max_age)
+        self.labels.update({node['name']: node.get('labels') or [] for node in nodes})
+        names = self.labels.match(expression)
+        return [self._to_model(node) for node in nodes if node['name'] in names], age
 
     def get_node_config(self, name: str) -> str:
-        return self._jenkins.get_node_config(name)
+        return self._configs.get('node', name)
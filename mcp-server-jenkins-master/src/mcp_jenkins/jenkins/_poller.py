@@ -0,0 +1,54 @@
+import threading
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from mcp_jenkins.metrics import REGISTRY
+
+if TYPE_CHECKING:
+    from mcp_jenkins.jenkins._client import JenkinsClient
+
+POLLER_REFRESHES = REGISTRY.counter(
+    'mcp_jenkins_poller_refreshes_total', 'Snapshot refreshes made by the background poller', ['snapshot', 'result']
+)
+
+
+class Poller:
+    """
+    Refreshes the queue, node and running build snapshots every `interval` seconds in a daemon thread,
+    so the read load on Jenkins stays constant however many agents ask for them.
+    """
+
+    def __init__(self, client: Callable[[], 'JenkinsClient'], interval: float) -> None:
+        self.interval = interval
+        self._client = client
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='mcp-jenkins-poller', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def poll_once(self) -> None:
+        # The client is created here rather than at start, so a slow or unreachable Jenkins never delays the server
+        for snapshot in self._client().snapshots:
+            try:
+                snapshot.refresh()
+            except Exception:  # noqa: BLE001 (the next poll retries, tools fall back to fetching)
+                POLLER_REFRESHES.inc(snapshot=snapshot.name, result='error')
+            else:
+                POLLER_REFRESHES.inc(snapshot=snapshot.name, result='ok')
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.poll_once()
+            except Exception:  # noqa: BLE001, S110 (client creation failed, retried on the next poll)
+                pass
+            self._stopped.wait(self.interval)
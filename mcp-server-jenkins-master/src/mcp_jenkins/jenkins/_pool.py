@@ -0,0 +1,57 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from mcp_jenkins.jenkins._client import JenkinsClient
+
+
+def credential_scope(username: str, password: str) -> str:
+    """
+    The cache scope of a set of credentials. It derives from the password too, so an entry is only served
+    to a caller who could have fetched it from Jenkins, and neither appears in the cache.
+    """
+    return hashlib.blake2b(f'{username}\0{password}'.encode(), digest_size=16).hexdigest()
+
+
+class ClientPool:
+    """
+    Bounded LRU pool of clients, one per set of credentials, each keeping its HTTP session and crumb warm.
+
+    The least recently used client is evicted once the pool holds `max_size`, and every client unused
+    for `idle_timeout` seconds is evicted on the next lookup.
+    """
+
+    def __init__(
+        self, factory: Callable[[str, str], JenkinsClient], max_size: int = 32, idle_timeout: float = 600
+    ) -> None:
+        self._factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._clients: OrderedDict[str, tuple[JenkinsClient, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, username: str, password: str) -> JenkinsClient:
+        key = credential_scope(username, password)
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            while self._clients:
+                oldest, (idle, used) = next(iter(self._clients.items()))
+                if now - used < self.idle_timeout:
+                    break
+                del self._clients[oldest]
+                evicted.append(idle)
+            entry = self._clients.pop(key, None)
+            client = entry[0] if entry is not None else self._factory(username, password)
+            self._clients[key] = (client, now)
+            while len(self._clients) > self.max_size:
+                evicted.append(self._clients.popitem(last=False)[1][0])
+        # Closed outside the lock, a request in flight on an evicted client only loses its keep-alive connection
+        for idle in evicted:
+            idle.close()
+        return client
@@ -1,18 +1,149 @@
+import hashlib
+import json
+import threading
+from collections import deque
+from uuid import uuid4
+
 from jenkins import Jenkins
 
-from mcp_jenkins.models.queue_item import QueueItem
+from mcp_jenkins.jenkins._snapshot import Snapshot
+from mcp_jenkins.models.queue_item import QueueChanges, QueueItem
+from mcp_jenkins.store import Store
+
+QUEUE_TREE = 'items[id,inQueueSince,url,why,task[name,url,fullDisplayName]]'
+
+
+class QueueHistory:
+    """
+    Change log of the queue states handed out to callers, addressed by cursor.
+
+    Each queued item keeps a digest of its `why` and task and the sequence numbers it was added and last
+    changed at, and a bounded log keeps the last `size` removals, so memory is one entry per queued item
+    however many states were handed out. A cursor older than the removals still logged is unknown, as is
+    a cursor issued by another worker or before a restart, which carries another epoch.
+    """
+
+    def __init__(self, size: int = 4096) -> None:
+        self._epoch = uuid4().hex[:8]
+        self._sequence = 0
+        # id -> (digest, added at, changed at)
+        self._items: dict[int, tuple[str, int, int]] = {}
+        # (removed at, id, added at)
+        self._removed: deque[tuple[int, int, int]] = deque(maxlen=size)
+        # Removals at or before this sequence were dropped from the log
+        self._horizon = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(item: dict) -> str:
+        return hashlib.blake2b(
+            json.dumps([item.get('why'), item.get('task')], sort_keys=True).encode(), digest_size=8
+        ).hexdigest()
+
+    def _record(self, items: list[dict]) -> None:
+        state = {item['id']: self._digest(item) for item in items}
+        sequence = self._sequence + 1
+        changed = False
+        for id_, digest in state.items():
+            known = self._items.get(id_)
+            if known is None or known[0] != digest:
+                self._items[id_] = (digest, sequence if known is None else known[1], sequence)
+                changed = True
+        for id_ in [id_ for id_ in self._items if id_ not in state]:
+            _, added_at, _ = self._items.pop(id_)
+            if len(self._removed) == self._removed.maxlen:
+                self._horizon = self._removed[0][0]
+            self._removed.append((sequence, id_, added_at))
+            changed = True
+        if changed:
+            self._sequence = sequence
+
+    def _position(self, cursor: str) -> int | None:
+        epoch, _, sequence = cursor.partition(':')
+        if epoch != self._epoch or not sequence.isdigit():
+            return None
+        position = int(sequence)
+        return position if self._horizon <= position <= self._sequence else None
+
+    def advance(
+        self, items: list[dict], since: str | None
+    ) -> tuple[str, tuple[list[int], list[int], list[int]] | None]:
+        """
+        Record the queue state and diff it against the state a cursor points to
+
+        Returns:
+            tuple[str, tuple[list[int], list[int], list[int]] | None]: The cursor of the state, and the ids
+                of the items added, changed and removed since `since`, None when it is unknown
+        """
+        with self._lock:
+            self._record(items)
+            cursor = f'{self._epoch}:{self._sequence}'
+            start = self._position(since) if since else None
+            if start is None:
+                return cursor, None
+            added, changed = [], []
+            for id_, (_, added_at, changed_at) in self._items.items():
+                if added_at > start:
+                    added.append(id_)
+                elif changed_at > start:
+                    changed.append(id_)
+            # Items both added and removed since the cursor were never seen by the caller
+            removed = [id_ for removed_at, id_, added_at in self._removed if removed_at > start >= added_at]
+        return cursor, (added, changed, removed)
 
 
 class JenkinsQueueItem:
-    def __init__(self, jenkins: Jenkins) -> None:
+    def __init__(
+        self, jenkins: Jenkins, store: Store | None = None, snapshot_max_age: float = 0, history_size: int = 4096
+    ) -> None:
         self._jenkins = jenkins
+        self.snapshot = Snapshot(store or Store(), 'queue', self._fetch_queue, snapshot_max_age)
+        self.history = QueueHistory(history_size)
 
     @staticmethod
     def _to_model(data: dict) -> QueueItem:
         return QueueItem.model_validate(data)
 
-    def get_all_queue_items(self) -> list[QueueItem]:
-        return [self._to_model(item) for item in self._jenkins.get_queue_info()]
+    def _fetch_queue(self) -> list[dict]:
+        return self._jenkins.get_tree('queue', QUEUE_TREE)['items']
+
+    def get_all_queue_items(self, max_age: float | None = None) -> list[QueueItem]:
+        """Return the queue snapshot, see `Snapshot.get`"""
+        return self.get_all_queue_items_snapshot(max_age)[0]
+
+    def get_all_queue_items_snapshot(self, max_age: float | None = None) -> tuple[list[QueueItem], float]:
+        """Return the queue snapshot and its age in seconds, see `Snapshot.get`"""
+        items, age = self.snapshot.get(max_age)
+        return [self._to_model(item) for item in items], age
+
+    def get_queue_changes(self, since: str | None = None, max_age: float | None = None) -> tuple[QueueChanges, float]:
+        """
+        Diff the queue snapshot against the state a previous call returned the cursor of
+
+        Args:
+            since: The cursor of the previous call, None to get the whole queue as added
+            max_age: See `Snapshot.get`
+
+        Returns:
+            tuple[QueueChanges, float]: The changes, with `reset` set and the whole queue as added
+                when the cursor is unknown, and the snapshot's age in seconds
+        """
+        items, age = self.snapshot.get(max_age)
+        cursor, diff = self.history.advance(items, since)
+        if diff is None:
+            return QueueChanges(
+                cursor=cursor, reset=since is not None, added=[self._to_model(item) for item in items]
+            ), age
+
+        added, changed, removed = diff
+        added, changed = set(added), set(changed)
+        changes = QueueChanges(cursor=cursor, removed=removed)
+        for item in items:
+            if item['id'] in added:
+                changes.added.append(self._to_model(item))
+            elif item['id'] in changed:
+                changes.changed.append(self._to_model(item))
+        return changes, age
 
     def get_queue_item(self, id_: int) -> QueueItem:
         return self._to_model(self._jenkins.get_queue_item(id_, depth=1))
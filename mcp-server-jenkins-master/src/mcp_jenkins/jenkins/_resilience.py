@@ -0,0 +1,173 @@
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+import requests
+from jenkins import JenkinsException, TimeoutException
+
+from mcp_jenkins.metrics import REGISTRY
+from mcp_jenkins.store import Store
+
+T = TypeVar('T')
+
+UPSTREAM_RETRIES = REGISTRY.counter(
+    'mcp_jenkins_upstream_retries_total', 'Requests to Jenkins retried after a transient failure', ['endpoint_class']
+)
+CIRCUIT_STATE = REGISTRY.gauge(
+    'mcp_jenkins_circuit_state', 'State of the circuit breaker toward Jenkins: 0 closed, 1 half-open, 2 open'
+)
+CIRCUIT_REJECTIONS = REGISTRY.counter(
+    'mcp_jenkins_circuit_rejections_total', 'Requests failed fast because the circuit breaker was open'
+)
+
+# Gateway errors a restarting or overloaded controller answers with
+TRANSIENT_STATUS = {502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+class JenkinsUnavailableError(JenkinsException):
+    """Jenkins did not answer, either after retries or because the circuit breaker is open"""
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Whether a request failure means Jenkins is unhealthy, rather than the request being wrong"""
+    if isinstance(exc, TimeoutException | requests.Timeout | requests.ConnectionError):
+        return True
+    response = getattr(exc, 'response', None)
+    return response is not None and getattr(response, 'status_code', None) in TRANSIENT_STATUS
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 2.0
+
+    def delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, so clients that failed together do not retry together"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))  # noqa: S311
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive transient failures and fails every request fast
+    for `reset_timeout` seconds. Then a single probe request is let through (half-open): its success
+    closes the breaker, its failure opens it again.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = 'closed', 'half-open', 'open'
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        CIRCUIT_STATE.set(self._STATE_VALUES[state])
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._set_state(self.HALF_OPEN)
+            if self._state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self._state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+
+class Resilience:
+    """Retries idempotent requests on transient failures and guards all of them with a circuit breaker"""
+
+    def __init__(self, retry: RetryPolicy | None = None, breaker: CircuitBreaker | None = None) -> None:
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+
+    def call(self, send: Callable[[], T], *, method: str, endpoint_class: str) -> T:
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                CIRCUIT_REJECTIONS.inc()
+                msg = f'Jenkins is unavailable, failing fast for up to {self.breaker.reset_timeout}s (circuit open)'
+                raise JenkinsUnavailableError(msg)
+            try:
+                result = send()
+            except Exception as e:
+                if not is_transient(e):
+                    # Jenkins answered, the request itself is at fault
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if method.upper() not in IDEMPOTENT_METHODS:
+                    # The write may have been applied, so it is never replayed
+                    raise
+                attempt += 1
+                if attempt >= self.retry.attempts:
+                    msg = f'Jenkins is unavailable after {attempt} attempts: {e}'
+                    raise JenkinsUnavailableError(msg) from e
+                UPSTREAM_RETRIES.inc(endpoint_class=endpoint_class)
+                # Tools run in worker threads, so only this call waits out the backoff
+                time.sleep(self.retry.delay(attempt - 1))
+                continue
+            self.breaker.record_success()
+            return result
+
+
+def cached(store: Store, namespace: str, key: str, fetch: Callable[[], Any], ttl: float | None = None) -> Any:
+    """
+    Read through the store, serving the last known value, however old, while Jenkins is unavailable
+
+    Args:
+        store: The store to read from and write to
+        namespace: The kind of value
+        key: The key within the namespace
+        fetch: Fetches the value from Jenkins
+        ttl: Seconds the fetched value stays fresh
+
+    Returns:
+        Any: The cached or fetched value
+    """
+    value = store.get(namespace, key)
+    if value is not None:
+        return value
+    try:
+        value = fetch()
+    except JenkinsUnavailableError:
+        value = store.get(namespace, key, allow_stale=True)
+        if value is None:
+            raise
+        return value
+    store.set(namespace, key, value, ttl=ttl)
+    return value
@@ -0,0 +1,132 @@
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+
+# Runs of letters in any script and numbers, letter runs being split into their camelCase parts below
+_WORD = re.compile(r'[^\W\d_]+|\d+')
+_SUFFIXES = ('ing', 'ed', 'es', 's')
+
+# Weight of a term by the field it occurs in
+FIELD_WEIGHTS = {'name': 3.0, 'displayName': 3.0, 'fullname': 2.0, 'description': 1.0, 'builds': 1.0}
+
+# Weight of an index term that only starts with a query term, e.g. `deployment` for `deploy`
+PREFIX_WEIGHT = 0.5
+MIN_PREFIX = 3
+MAX_EXPANSIONS = 50
+
+K1 = 1.2
+B = 0.75
+
+
+def _stem(word: str) -> str:
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_PREFIX:
+            return word[: -len(suffix)]
+    return word
+
+
+def _split_case(run: str) -> list[str]:
+    """The camelCase parts of a run of letters, so `deployHTTPServer` gives `deploy HTTP Server`"""
+    parts, start = [], 0
+    for i in range(1, len(run)):
+        if run[i].isupper() and (not run[i - 1].isupper() or run[i + 1 : i + 2].islower()):
+            parts.append(run[start:i])
+            start = i
+    parts.append(run[start:])
+    return parts
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased and lightly stemmed words of a text, so `payments-deployStaging2` gives `payment deploy stag 2`"""
+    return [_stem(part.lower()) for word in _WORD.findall(text or '') for part in _split_case(word)]
+
+
+@dataclass(frozen=True)
+class Hit:
+    fullname: str
+    score: float
+    matched: tuple[str, ...]
+
+
+class SearchIndex:
+    """
+    In-memory inverted index of jobs, ranked with BM25 over field-weighted term frequencies.
+
+    Query terms also match the index terms they are a prefix of, at a lower weight, so agents' loose
+    queries such as `payments deploy staging` find `payments-deployment-stage`.
+    """
+
+    def __init__(self, documents: dict[str, dict[str, str]]) -> None:
+        """
+        Args:
+            documents: The searchable fields of each job keyed by fullname, see `FIELD_WEIGHTS`
+        """
+        self.fullnames = list(documents)
+        frequencies = []
+        for fields in documents.values():
+            counts = Counter()
+            for field, text in fields.items():
+                weight = FIELD_WEIGHTS.get(field, 1.0)
+                for term in tokenize(text):
+                    counts[term] += weight
+            frequencies.append(counts)
+        lengths = [sum(counts.values()) for counts in frequencies]
+        # Jobs whose fields hold no word have no terms, so every length can be 0
+        average = (sum(lengths) / len(lengths) if lengths else 0.0) or 1.0
+
+        # Postings hold the BM25 term frequency part, which does not depend on the query
+        self._postings: dict[str, dict[int, float]] = {}
+        for doc, counts in enumerate(frequencies):
+            norm = K1 * (1 - B + B * lengths[doc] / average)
+            for term, frequency in counts.items():
+                self._postings.setdefault(term, {})[doc] = frequency * (K1 + 1) / (frequency + norm)
+        self._terms = sorted(self._postings)
+
+    def __len__(self) -> int:
+        return len(self.fullnames)
+
+    def _expand(self, term: str) -> list[tuple[str, float]]:
+        """The index terms a query term matches, with their weight"""
+        expansions = [(term, 1.0)] if term in self._postings else []
+        if len(term) >= MIN_PREFIX:
+            start = bisect_left(self._terms, term)
+            for candidate in self._terms[start : start + MAX_EXPANSIONS + 1]:
+                if not candidate.startswith(term):
+                    break
+                if candidate != term:
+                    expansions.append((candidate, PREFIX_WEIGHT))
+        return expansions
+
+    def search(self, query: str, limit: int = 20) -> list[Hit]:
+        """
+        Rank the jobs matching any term of the query, jobs matching more and rarer terms first
+
+        Args:
+            query: Free text, e.g. `payments deploy staging`
+            limit: The maximum number of hits
+
+        Returns:
+            list[Hit]: The hits, best first, with the query terms each one matched
+        """
+        total = len(self.fullnames)
+        scores: dict[int, float] = {}
+        matched: dict[int, list[str]] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            best: dict[int, float] = {}
+            for candidate, weight in self._expand(term):
+                postings = self._postings[candidate]
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                factor = weight * idf
+                for doc, part in postings.items():
+                    # A job matching a term several ways counts it once, with its best match
+                    score = factor * part
+                    if score > best.get(doc, 0.0):
+                        best[doc] = score
+            for doc, score in best.items():
+                scores[doc] = scores.get(doc, 0.0) + score
+                matched.setdefault(doc, []).append(term)
+        ranked = heapq.nsmallest(limit, scores, key=lambda doc: (-len(matched[doc]), -scores[doc], self.fullnames[doc]))
+        return [Hit(self.fullnames[doc], round(scores[doc], 3), tuple(matched[doc])) for doc in ranked]
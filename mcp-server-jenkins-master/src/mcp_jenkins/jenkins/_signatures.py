@@ -0,0 +1,299 @@
+import hashlib
+import json
+import re
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python 3.10
+    import sre_parse
+
+# Distinct errors tracked per log, and characters of a line matched and shown
+MAX_ERRORS = 500
+MAX_LINE_CHARS = 4096
+MAX_SNIPPET_LINE_CHARS = 500
+
+# Caps of the extra patterns of one extraction
+MAX_PATTERNS = 20
+MAX_PATTERN_CHARS = 500
+
+_ANSI = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+# Tokens that differ between occurrences of the same error
+_VOLATILE = re.compile(r'0x[0-9a-fA-F]+|\b[0-9a-fA-F]{8,}\b|\d+')
+
+
+@dataclass(frozen=True)
+class Signature:
+    """
+    A kind of failure recognised in console logs, a higher weight ranks it closer to the root cause.
+
+    `keywords` are lowercase literals one of which every line matching `pattern` contains. They let the lines be
+    skipped with a literal search, and the regex only run on the few lines containing one.
+    """
+
+    name: str
+    category: str
+    pattern: str
+    weight: float = 1.0
+    keywords: tuple[str, ...] = ()
+
+
+DEFAULT_SIGNATURES = (
+    Signature(
+        'out_of_memory',
+        'oom',
+        r'OutOfMemoryError|Out of memory|Cannot allocate memory|Killed process \d+',
+        10,
+        ('memory', 'killed process'),
+    ),
+    Signature('oom_killed', 'oom', r'exit code 137\b|signal 9 \(SIGKILL\)', 9, ('exit code 137', 'signal 9')),
+    Signature('disk_full', 'resource', r'No space left on device', 9, ('no space left',)),
+    Signature(
+        'javac_error',
+        'compiler',
+        r'\.java:\[?\d+(?:,\d+\])?:? error:|\[ERROR\] \S+\.java:\[\d+,\d+\]',
+        8,
+        ('error',),
+    ),
+    Signature(
+        'c_error',
+        'compiler',
+        r'\.(?:c|cc|cpp|cxx|h|hpp):\d+:\d+: (?:fatal )?error:|undefined reference to',
+        8,
+        ('error:', 'undefined reference'),
+    ),
+    Signature('typescript_error', 'compiler', r'error TS\d+:', 8, ('error ts',)),
+    Signature('rust_error', 'compiler', r'^error(?:\[E\d+\])?: ', 8, ('error',)),
+    Signature('go_error', 'compiler', r'\.go:\d+:\d+: (?!warning)', 7, ('.go:',)),
+    Signature(
+        'test_failure',
+        'test',
+        r'Tests run: \d+, Failures: [1-9]|Tests run: \d+, Failures: \d+, Errors: [1-9]|^--- FAIL: |^FAILED |'
+        r'\b\d+ (?:tests? )?failed\b|AssertionError',
+        7,
+        ('tests run:', 'fail', 'assertionerror'),
+    ),
+    Signature(
+        'network_timeout',
+        'network',
+        r'(?i:connect(?:ion)? timed out|read timed out|timeout of \d+ms exceeded|connection refused|'
+        r'connection reset|could not resolve host|name or service not known|temporary failure in name resolution|'
+        r'etimedout|econnreset|econnrefused)',
+        6,
+        ('timed out', 'timeout of', 'refused', 'reset', 'resolve host', 'not known', 'name resolution', 'etimedout'),
+    ),
+    Signature('python_traceback', 'exception', r'^Traceback \(most recent call last\):', 6, ('traceback',)),
+    Signature(
+        'exception',
+        'exception',
+        r'^(?:Caused by: |Exception in thread "[^"]*" )?(?:[a-z_]\w*\.)+\w*(?:Exception|Error)\b',
+        5,
+        ('exception', 'error'),
+    ),
+    Signature('python_exception', 'exception', r'^\w*(?:Error|Exception): ', 5, ('error', 'exception')),
+    Signature(
+        'permission_denied',
+        'permission',
+        r'Permission denied|403 Forbidden|401 Unauthorized',
+        5,
+        ('permission denied', 'forbidden', 'unauthorized'),
+    ),
+    Signature(
+        'build_failure',
+        'build',
+        r'BUILD FAILURE|FAILURE: Build failed|npm ERR!|make(?:\[\d+\])?: \*\*\*|script returned exit code [1-9]',
+        4,
+        ('build failure', 'build failed', 'npm err!', '***', 'exit code'),
+    ),
+    Signature('error', 'generic', r'(?i:\b(?:error|fatal)\b)', 1, ('error', 'fatal')),
+)
+
+
+def load_signatures(path: str) -> tuple[Signature, ...]:
+    """
+    Load a signature library from a JSON list of `{name, category, pattern, weight, keywords}` objects.
+
+    Entries named like a default signature replace it, the others are added to the defaults.
+    """
+    with open(path) as f:
+        entries = json.load(f)
+    signatures = {signature.name: signature for signature in DEFAULT_SIGNATURES}
+    for entry in entries:
+        entry = {'category': 'custom', **entry, 'keywords': tuple(k.lower() for k in entry.get('keywords', ()))}
+        signature = Signature(**entry)
+        try:
+            re.compile(signature.pattern)
+        except re.error as e:
+            msg = f'Invalid pattern of error signature {signature.name!r}: {e}'
+            raise ValueError(msg) from e
+        signatures[signature.name] = signature
+    return tuple(signatures.values())
+
+
+def _backtracks(items: sre_parse.SubPattern | list, *, repeated: bool = False) -> bool:
+    """
+    Whether a parsed regex repeats a repeated part, like `(a+)+`, or refers back to a group, either of which
+    can take time exponential in the line's length
+    """
+    for op, av in items:
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            _, high, sub = av
+            if high > 1 and repeated:
+                return True
+            if _backtracks(sub, repeated=repeated or high > 1):
+                return True
+        elif op == sre_parse.SUBPATTERN:
+            if _backtracks(av[-1], repeated=repeated):
+                return True
+        elif op == sre_parse.BRANCH:
+            if any(_backtracks(branch, repeated=repeated) for branch in av[1]):
+                return True
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            if _backtracks(av[1], repeated=repeated):
+                return True
+        elif op in (sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS):
+            return True
+    return False
+
+
+def pattern_signatures(patterns: list[str] | None) -> tuple[Signature, ...]:
+    """
+    The signatures of a caller's extra patterns, ranked above the library's, checked before any log is read
+
+    Raises:
+        ValueError: There are more than `MAX_PATTERNS`, or one is longer than `MAX_PATTERN_CHARS`, invalid,
+            or could backtrack exponentially
+    """
+    patterns = patterns or []
+    if len(patterns) > MAX_PATTERNS:
+        msg = f'At most {MAX_PATTERNS} patterns are allowed, got {len(patterns)}'
+        raise ValueError(msg)
+    for pattern in patterns:
+        if len(pattern) > MAX_PATTERN_CHARS:
+            msg = f'Pattern {pattern[:50]!r}... is longer than {MAX_PATTERN_CHARS} characters'
+            raise ValueError(msg)
+        try:
+            parsed = sre_parse.parse(pattern)
+        except re.error as e:
+            msg = f'Invalid pattern {pattern!r}: {e}'
+            raise ValueError(msg) from e
+        if _backtracks(parsed):
+            msg = (
+                f'Pattern {pattern!r} repeats a repeated group or refers back to a group, '
+                'which can take exponential time, e.g. write `(a+)+` as `a+`'
+            )
+            raise ValueError(msg)
+    return tuple(Signature(f'pattern_{i}', 'custom', pattern, weight=100) for i, pattern in enumerate(patterns))
+
+
+def signatures_digest(signatures: tuple[Signature, ...]) -> str:
+    """A stable digest of a signature library, so cached extractions are dropped when the library changes"""
+    return hashlib.blake2b(
+        json.dumps([asdict(signature) for signature in signatures]).encode(), digest_size=8
+    ).hexdigest()
+
+
+class Matcher:
+    """
+    Finds the heaviest signature of a line, searching each line once whatever the number of signatures.
+
+    The keywords of all signatures form one literal alternation searched in the lowercased line, and only
+    the lines containing a keyword are searched with the regex alternating their patterns. Signatures without
+    keywords are alternated in a second regex searched in every line.
+    """
+
+    def __init__(self, signatures: tuple[Signature, ...]) -> None:
+        self._ordered = tuple(
+            (signature, re.compile(signature.pattern))
+            for signature in sorted(signatures, key=lambda signature: -signature.weight)
+        )
+        keywords = sorted({keyword for signature in signatures for keyword in signature.keywords}, key=len)
+        filtered = [signature.pattern for signature in signatures if signature.keywords]
+        unfiltered = [signature.pattern for signature in signatures if not signature.keywords]
+        self._keywords = re.compile('|'.join(map(re.escape, keywords))) if keywords else None
+        self._filtered = re.compile('|'.join(f'(?:{pattern})' for pattern in filtered)) if filtered else None
+        self._unfiltered = re.compile('|'.join(f'(?:{pattern})' for pattern in unfiltered)) if unfiltered else None
+
+    def match(self, line: str) -> Signature | None:
+        if (self._unfiltered is not None and self._unfiltered.search(line)) or (
+            self._keywords is not None and self._keywords.search(line.lower()) and self._filtered.search(line)
+        ):
+            # The line matched one signature at least, the individual patterns pick the heaviest
+            return next((signature for signature, regex in self._ordered if regex.search(line)), None)
+        return None
+
+
+@lru_cache(maxsize=32)
+def matcher(signatures: tuple[Signature, ...]) -> Matcher:
+    return Matcher(signatures)
+
+
+def extract_errors(lines: Iterable[str], signatures: tuple[Signature, ...], context: int = 2) -> dict:
+    """
+    Find the failures of a console log in one pass, in time linear in its size.
+
+    Lines differing only in numbers, hashes or addresses are counted as one error, whose snippet is the first
+    occurrence with `context` lines around it.
+
+    Args:
+        lines: The lines of the log
+        signatures: The signature library
+        context: The number of lines kept before and after each error
+
+    Returns:
+        dict: The number of lines read and the distinct errors, at most `MAX_ERRORS`, ranked by signature
+            weight then by first occurrence
+    """
+    matcher_ = matcher(signatures)
+    before = deque(maxlen=context)
+    found: dict[str, dict] = {}
+    # Errors whose snippet still waits for the lines after them
+    pending: list[dict] = []
+    number = 0
+    for number, raw in enumerate(lines, start=1):
+        line = (_ANSI.sub('', raw) if '\x1b' in raw else raw).rstrip('\r\n')[:MAX_LINE_CHARS]
+        if pending:
+            for error in pending:
+                error['snippet'].append(line)
+            pending = [error for error in pending if len(error['snippet']) < error['size']]
+        signature = matcher_.match(line)
+        if signature is not None:
+            key = f'{signature.name}:{_VOLATILE.sub("#", line.strip())}'
+            error = found.get(key)
+            if error is not None:
+                error['count'] += 1
+            elif len(found) < MAX_ERRORS:
+                found[key] = error = {
+                    'signature': signature.name,
+                    'category': signature.category,
+                    'weight': signature.weight,
+                    'line': number,
+                    'count': 1,
+                    'start': number - len(before),
+                    'snippet': [*before, line],
+                    'size': len(before) + 1 + context,
+                }
+                if context:
+                    pending.append(error)
+        before.append(line)
+
+    errors = sorted(found.values(), key=lambda error: (-error['weight'], error['line']))
+    return {
+        'lines': number,
+        'errors': [
+            {
+                'signature': error['signature'],
+                'category': error['category'],
+                'line': error['line'],
+                'count': error['count'],
+                'snippet': '\n'.join(
+                    f'{start}: {text[:MAX_SNIPPET_LINE_CHARS]}'
+                    for start, text in enumerate(error['snippet'], start=error['start'])
+                ),
+            }
+            for error in errors
+        ],
+    }
@@ -0,0 +1,49 @@
+from collections.abc import Callable
+from typing import Any
+
+from mcp_jenkins.jenkins._resilience import JenkinsUnavailableError
+from mcp_jenkins.store import Store
+
+
+class Snapshot:
+    """
+    Last fetched state of a Jenkins collection, e.g. the queue, kept in the store.
+
+    It is refreshed by the background poller, or on read when it is older than the allowed age.
+    While Jenkins is unavailable the last snapshot is served, however old.
+    """
+
+    NAMESPACE = 'snapshot'
+
+    def __init__(self, store: Store, name: str, fetch: Callable[[], Any], max_age: float = 0) -> None:
+        self.name = name
+        self.max_age = max_age
+        self._store = store
+        self._fetch = fetch
+
+    def refresh(self) -> Any:
+        """Fetch the collection from Jenkins and replace the snapshot"""
+        value = self._fetch()
+        self._store.set(self.NAMESPACE, self.name, value)
+        return value
+
+    def get(self, max_age: float | None = None) -> tuple[Any, float]:
+        """
+        Get the snapshot
+
+        Args:
+            max_age: Seconds the snapshot may be old before it is fetched again, defaults to `self.max_age`
+
+        Returns:
+            tuple[Any, float]: The collection and its age in seconds
+        """
+        max_age = self.max_age if max_age is None else max_age
+        entry = self._store.get_entry(self.NAMESPACE, self.name, allow_stale=True)
+        if entry is not None and entry[1] <= max_age:
+            return entry
+        try:
+            return self.refresh(), 0.0
+        except JenkinsUnavailableError:
+            if entry is None:
+                raise
+            return entry
@@ -0,0 +1,98 @@
+import math
+from array import array
+from collections.abc import Iterable
+
+# Result codes of the result column
+_SUCCESS, _FAILURE, _OTHER = 0, 1, -1
+_CODES = {'SUCCESS': _SUCCESS, 'FAILURE': _FAILURE, 'UNSTABLE': _FAILURE}
+
+
+class BuildColumns:
+    """
+    Finished builds of many jobs in columnar arrays, the builds of one job being a contiguous
+    slice ordered oldest first, so statistics are computed over flat arrays instead of dicts.
+    """
+
+    def __init__(self) -> None:
+        self.fullnames: list[str] = []
+        self.offsets = array('q', [0])
+        self.durations = array('d')
+        self.timestamps = array('d')
+        self.results = array('b')
+
+    def add(self, fullname: str, rows: Iterable[dict]) -> None:
+        """Add the builds of a job, newest first as Jenkins lists them, running builds are skipped"""
+        finished = [row for row in rows if not row.get('building') and row.get('result') is not None]
+        for row in reversed(finished):
+            self.durations.append(row.get('duration') or 0)
+            self.timestamps.append(row.get('timestamp') or 0)
+            self.results.append(_CODES.get(row['result'], _OTHER))
+        self.fullnames.append(fullname)
+        self.offsets.append(len(self.durations))
+
+    def stats(self) -> list[dict]:
+        return [self._job_stats(i) for i in range(len(self.fullnames))]
+
+    def _job_stats(self, i: int) -> dict:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        durations = self.durations[start:end]
+        results = [code for code in self.results[start:end] if code != _OTHER]
+        n = len(durations)
+        stats = {'fullname': self.fullnames[i], 'builds': n}
+        if not n:
+            return stats
+
+        ordered = sorted(durations)
+        flips = sum(1 for previous, current in zip(results, results[1:], strict=False) if previous != current)
+        mean = math.fsum(durations) / n
+        slope = _slope(durations)
+        stats.update(
+            {
+                'failureRate': round(sum(results) / len(results), 4) if results else None,
+                'flips': flips,
+                'flakiness': round(flips / (len(results) - 1), 4) if len(results) > 1 else 0.0,
+                'meanDuration': round(mean),
+                'p50Duration': _percentile(ordered, 0.5),
+                'p90Duration': _percentile(ordered, 0.9),
+                'p99Duration': _percentile(ordered, 0.99),
+                'trendSlope': round(slope, 2),
+                # The change of duration over the window relative to the mean, 0.2 means 20% slower
+                'trend': round(slope * (n - 1) / mean, 4) if mean else 0.0,
+                'firstTimestamp': int(self.timestamps[start]),
+                'lastTimestamp': int(self.timestamps[end - 1]),
+            }
+        )
+        return stats
+
+
+def _percentile(ordered: list[float], q: float) -> int:
+    """Nearest-rank percentile of sorted values"""
+    return int(ordered[max(math.ceil(q * len(ordered)) - 1, 0)])
+
+
+def _slope(values: array) -> float:
+    """Least-squares slope of the values against their index, i.e. the change per build"""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2
+    mean_y = math.fsum(values) / n
+    covariance = math.fsum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    variance = math.fsum((x - mean_x) ** 2 for x in range(n))
+    return covariance / variance
+
+
+STAT_KEYS = ('trend', 'flakiness', 'failureRate', 'p90Duration', 'meanDuration')
+
+
+def check_sort_key(sort_by: str) -> None:
+    """Raise ValueError unless the jobs can be ranked by `sort_by`, checked before any build is fetched"""
+    if sort_by not in STAT_KEYS:
+        msg = f'Cannot rank by {sort_by!r}, expected one of {STAT_KEYS}'
+        raise ValueError(msg)
+
+
+def rank(stats: list[dict], sort_by: str = 'trend') -> list[dict]:
+    """Rank the jobs by a statistic, highest first, jobs without builds last"""
+    check_sort_key(sort_by)
+    return sorted(stats, key=lambda job: (job.get(sort_by) is not None, job.get(sort_by) or 0), reverse=True)
@@ -0,0 +1,268 @@
+import json
+import re
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from jenkins import Jenkins, NotFoundException
+
+from mcp_jenkins.jenkins._build import JenkinsBuild
+from mcp_jenkins.jenkins._transport import job_path
+from mcp_jenkins.models.junit import FailureReport
+from mcp_jenkins.store import Store
+
+TEST_REPORT_TREE = (
+    'failCount,passCount,skipCount,suites[name,cases[className,name,status,duration,errorDetails,errorStackTrace]]'
+)
+FAILED_STATUSES = {'FAILED', 'REGRESSION'}
+
+# Failures and stack trace characters kept in the cache, callers get at most this much
+STORED_FAILURES = 1000
+STORED_TRACE_CHARS = 4000
+
+
+class _JsonReader:
+    """
+    Pull reader of one JSON document arriving in text chunks.
+
+    Containers are walked key by key or element by element, and only the values asked for are decoded,
+    so memory is bounded by the largest single value rather than by the document.
+    """
+
+    _WHITESPACE = ' \t\r\n'
+    # What ends a number or literal, what matters inside a string, and what matters outside of one
+    _SCALAR_END = re.compile(r'[\s,\]}]')
+    _STRING = re.compile(r'["\\]')
+    _STRUCTURE = re.compile(r'["{}\[\]]')
+
+    def __init__(self, chunks: Iterable[str]) -> None:
+        self._chunks = (chunk for chunk in chunks if chunk)
+        self._buffer = ''
+        self._position = 0
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+        self._buffer = self._buffer[self._position :] + chunk
+        self._position = 0
+        return True
+
+    def _end(self) -> int:
+        """
+        Where the next value ends, reading chunks until it is complete. Each character is scanned once and
+        the chunks are joined once, so a value spanning many chunks costs no more than one that does not.
+        """
+        scalar = self._peek() not in '{["'
+        text, scan = self._buffer, self._position
+        pieces = []
+        depth, in_string, escaped = 0, False, False
+        while True:
+            end = None
+            if scalar:
+                match = self._SCALAR_END.search(text, scan)
+                end = match.start() if match else None
+            elif escaped:
+                scan, escaped = scan + 1, False
+            while end is None and not scalar:
+                match = (self._STRING if in_string else self._STRUCTURE).search(text, scan)
+                if match is None:
+                    break
+                char, scan = match.group(), match.end()
+                if in_string:
+                    if char == '"':
+                        in_string = False
+                        end = scan if depth == 0 else None
+                    elif scan == len(text):
+                        # The escaped character is in the next chunk
+                        escaped = True
+                    else:
+                        scan += 1
+                elif char == '"':
+                    in_string = True
+                elif char in '{[':
+                    depth += 1
+                else:
+                    depth -= 1
+                    end = scan if depth == 0 else None
+            if end is not None:
+                break
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                if not scalar:
+                    msg = 'Unexpected end of JSON document'
+                    raise ValueError(msg)
+                end = len(text)
+                break
+            pieces.append(chunk)
+            text, scan = chunk, 0
+        if not pieces:
+            self._buffer = text
+            return end
+        self._buffer = self._buffer[self._position :] + ''.join(pieces)
+        self._position = 0
+        return len(self._buffer) - len(text) + end
+
+    def _peek(self) -> str:
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in self._WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                msg = 'Unexpected end of JSON document'
+                raise ValueError(msg)
+
+    def _take(self, expected: str) -> None:
+        if self._peek() != expected:
+            msg = f'Expected {expected!r} in JSON document, got {self._peek()!r}'
+            raise ValueError(msg)
+        self._position += 1
+
+    def _next_separator(self, end: str) -> bool:
+        """Consume a `,` and return True, or consume `end` and return False"""
+        if self._peek() == ',':
+            self._position += 1
+            return True
+        self._take(end)
+        return False
+
+    def value(self) -> Any:
+        """Decode the next value"""
+        self._peek()
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._position)
+        except json.JSONDecodeError:
+            pass
+        else:
+            # A number at the end of the buffer may go on in the next chunk
+            if end < len(self._buffer):
+                self._position = end
+                return value
+        # The value goes on in the next chunks, which are read in full before decoding it again
+        self._end()
+        value, self._position = self._decoder.raw_decode(self._buffer, self._position)
+        return value
+
+    def keys(self) -> Iterator[str]:
+        """Walk an object, the value of each yielded key must be consumed before the next"""
+        self._take('{')
+        if self._peek() == '}':
+            self._position += 1
+            return
+        while True:
+            key = self.value()
+            self._take(':')
+            yield key
+            if not self._next_separator('}'):
+                return
+
+    def elements(self) -> Iterator[None]:
+        """Walk an array, each element must be consumed before the next"""
+        self._take('[')
+        if self._peek() == ']':
+            self._position += 1
+            return
+        while True:
+            yield
+            if not self._next_separator(']'):
+                return
+
+
+def parse_failures(
+    chunks: Iterable[str], limit: int = STORED_FAILURES, max_trace_chars: int = STORED_TRACE_CHARS
+) -> dict:
+    """
+    Stream-parse a test report, keeping only the failed cases
+
+    Args:
+        chunks: The JSON of the test report in chunks
+        limit: The maximum number of failed cases to keep, the others are only counted
+        max_trace_chars: The maximum length of a kept stack trace
+
+    Returns:
+        dict: The counts and the failed cases grouped by suite, in the shape of `FailureReport`
+    """
+    reader = _JsonReader(chunks)
+    report = {'suites': [], 'truncated': 0}
+    kept = 0
+    for key in reader.keys():
+        if key != 'suites':
+            report[key] = reader.value()
+            continue
+        for _ in reader.elements():
+            suite = {'failures': []}
+            for suite_key in reader.keys():
+                if suite_key != 'cases':
+                    suite[suite_key] = reader.value()
+                    continue
+                for _ in reader.elements():
+                    case = reader.value()
+                    if case.get('status') not in FAILED_STATUSES:
+                        continue
+                    if kept == limit:
+                        report['truncated'] += 1
+                        continue
+                    kept += 1
+                    case.pop('_class', None)
+                    if case.get('errorStackTrace'):
+                        case['errorStackTrace'] = case['errorStackTrace'][:max_trace_chars]
+                    suite['failures'].append(case)
+            if suite['failures']:
+                report['suites'].append({'name': suite.get('name'), 'failures': suite['failures']})
+    return report
+
+
+def _trim(report: dict, limit: int, max_trace_chars: int) -> dict:
+    suites = []
+    kept = 0
+    for suite in report['suites']:
+        failures = suite['failures'][: max(limit - kept, 0)]
+        kept += len(failures)
+        if failures:
+            failures = [
+                {**case, 'errorStackTrace': (case.get('errorStackTrace') or '')[:max_trace_chars] or None}
+                for case in failures
+            ]
+            suites.append({**suite, 'failures': failures})
+    failed = sum(len(suite['failures']) for suite in report['suites'])
+    return {**report, 'suites': suites, 'truncated': report['truncated'] + failed - kept}
+
+
+class JenkinsTestReport:
+    def __init__(self, jenkins: Jenkins, build: JenkinsBuild, store: Store | None = None) -> None:
+        self._jenkins = jenkins
+        self._build = build
+        self._store = store or Store()
+
+    def get_test_failures(
+        self, fullname: str, number: int, limit: int = 100, max_trace_chars: int = 1000
+    ) -> FailureReport | None:
+        """
+        Get the failed test cases of a build, grouped by suite
+
+        The report is requested with a tree of the case fields only and stream-parsed, so reports
+        with 100k+ cases are never held in memory. The failures of finished builds are cached.
+
+        Args:
+            fullname: The fullname of the job
+            number: The build number
+            limit: The maximum number of failed cases to return, at most `STORED_FAILURES`
+            max_trace_chars: The maximum length of each stack trace, at most `STORED_TRACE_CHARS`
+
+        Returns:
+            FailureReport | None: The failures, None if the build has no test report
+        """
+        key = f'{fullname}#{number}'
+        report = self._store.get('test_failures', key)
+        if report is None:
+            finished = self._build._is_finished(fullname, number)
+            try:
+                report = parse_failures(
+                    self._jenkins.stream(f'{job_path(fullname)}/{number}/testReport/api/json?tree={TEST_REPORT_TREE}')
+                )
+            except NotFoundException:
+                return None
+            if finished:
+                self._store.set('test_failures', key, report)
+        return FailureReport.model_validate(_trim(report, limit, max_trace_chars))
@@ -0,0 +1,169 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from urllib.parse import parse_qs, urlparse
+
+from mcp_jenkins.metrics import REGISTRY
+
+THROTTLE_WAIT = REGISTRY.histogram(
+    'mcp_jenkins_throttle_wait_seconds',
+    'Time requests waited for a rate-limit token and an in-flight slot before being sent to Jenkins',
+    ['endpoint_class'],
+)
+THROTTLE_IN_FLIGHT = REGISTRY.gauge(
+    'mcp_jenkins_throttle_in_flight', 'Requests currently in flight toward Jenkins', ['endpoint_class']
+)
+
+ENDPOINT_CLASSES = ('tree', 'log', 'write', 'other')
+
+_LOG_SEGMENTS = ('consoleText', 'progressiveText', 'progressiveHtml', 'logText', 'consoleFull')
+
+_priority: ContextVar[bool] = ContextVar('priority', default=False)
+
+
+@contextmanager
+def priority_lane() -> Iterator[None]:
+    """Send every request made inside this block through the `write` lane, so it never queues behind reads"""
+    token = _priority.set(True)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@contextmanager
+def read_lane() -> Iterator[None]:
+    """
+    Send the GET requests made inside this block through their read class even within a write tool,
+    so a write that waits for Jenkins does not hold the `write` lane while it polls
+    """
+    token = _priority.set(False)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def endpoint_class(method: str, url: str) -> str:
+    """
+    Classify a request for throttling
+
+    Returns:
+        str: `write` for non-GET requests and requests of write tools, `log` for console output,
+            `tree` for api/json queries with a tree or depth, `other` for everything else
+    """
+    if _priority.get() or method.upper() not in ('GET', 'HEAD'):
+        return 'write'
+    parsed = urlparse(url)
+    if any(segment in _LOG_SEGMENTS for segment in parsed.path.split('/')):
+        return 'log'
+    query = parse_qs(parsed.query)
+    if 'tree' in query or any(depth != '0' for depth in query.get('depth', [])):
+        return 'tree'
+    return 'other'
+
+
+@dataclass(frozen=True)
+class Limit:
+    """Rate and concurrency limit of an endpoint class, 0 means unlimited"""
+
+    rate: float = 0
+    burst: int = 0
+    max_in_flight: int = 0
+
+
+DEFAULT_LIMITS = {
+    'tree': Limit(rate=20, burst=40, max_in_flight=8),
+    'log': Limit(rate=10, burst=20, max_in_flight=4),
+    'write': Limit(max_in_flight=8),
+    'other': Limit(max_in_flight=16),
+}
+
+
+def parse_limits(spec: str) -> dict[str, Limit]:
+    """
+    Parse limits of the form `tree=5:10:4;log=2:4:2`, i.e. `class=rate:burst:max_in_flight`.
+
+    Omitted or zero fields are unlimited, classes that are not listed keep their defaults.
+    """
+    limits = dict(DEFAULT_LIMITS)
+    for item in filter(None, (part.strip() for part in spec.replace(',', ';').split(';'))):
+        name, _, values = item.partition('=')
+        if name not in ENDPOINT_CLASSES:
+            msg = f'Unknown endpoint class {name!r} in rate limit {item!r}, expected one of {ENDPOINT_CLASSES}'
+            raise ValueError(msg)
+        fields = [*values.split(':'), '', ''][:3]
+        limits[name] = Limit(
+            rate=float(fields[0] or 0),
+            burst=int(fields[1] or 0),
+            max_in_flight=int(fields[2] or 0),
+        )
+    return limits
+
+
+def parse_timeouts(spec: str) -> dict[str, float]:
+    """Parse per endpoint class timeouts in seconds of the form `log=60;tree=20`"""
+    timeouts = {}
+    for item in filter(None, (part.strip() for part in spec.replace(',', ';').split(';'))):
+        name, _, seconds = item.partition('=')
+        if name not in ENDPOINT_CLASSES:
+            msg = f'Unknown endpoint class {name!r} in timeout {item!r}, expected one of {ENDPOINT_CLASSES}'
+            raise ValueError(msg)
+        timeouts[name] = float(seconds)
+    return timeouts
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = 0) -> None:
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, sleeping until one is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+class _Lane:
+    def __init__(self, limit: Limit) -> None:
+        self.bucket = TokenBucket(limit.rate, limit.burst) if limit.rate > 0 else None
+        self.semaphore = threading.BoundedSemaphore(limit.max_in_flight) if limit.max_in_flight > 0 else None
+
+
+class Throttle:
+    """Token-bucket rate limit and max-in-flight cap per endpoint class"""
+
+    def __init__(self, limits: dict[str, Limit] | None = None) -> None:
+        limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self._lanes = {name: _Lane(limits[name]) for name in ENDPOINT_CLASSES}
+
+    @contextmanager
+    def slot(self, endpoint_class: str) -> Iterator[None]:
+        lane = self._lanes[endpoint_class]
+        start = time.perf_counter()
+        if lane.bucket is not None:
+            lane.bucket.acquire()
+        if lane.semaphore is not None:
+            lane.semaphore.acquire()
+        THROTTLE_WAIT.observe(time.perf_counter() - start, endpoint_class=endpoint_class)
+        THROTTLE_IN_FLIGHT.inc(endpoint_class=endpoint_class)
+        try:
+            yield
+        finally:
+            THROTTLE_IN_FLIGHT.inc(-1, endpoint_class=endpoint_class)
+            if lane.semaphore is not None:
+                lane.semaphore.release()
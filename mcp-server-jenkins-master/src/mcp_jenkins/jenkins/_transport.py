@@ -0,0 +1,215 @@
+import codecs
+import json
+import re
+import time
+from collections.abc import Iterator
+from contextlib import ExitStack
+from contextvars import ContextVar
+from typing import Any
+from urllib.parse import quote, urlparse
+
+import requests
+from jenkins import Jenkins
+
+from mcp_jenkins.jenkins._resilience import Resilience
+from mcp_jenkins.jenkins._throttle import Throttle, endpoint_class
+from mcp_jenkins.metrics import UPSTREAM_BYTES, UPSTREAM_LATENCY, UPSTREAM_REQUESTS
+
+# Path segments following these ones are names or ids, not part of the endpoint
+_NAMED_SEGMENTS = {'job', 'computer', 'view', 'item', 'user', 'artifact', 'label'}
+_NUMBER = re.compile(r'^\d+$')
+
+_in_request: ContextVar[bool] = ContextVar('in_request', default=False)
+_timeout: ContextVar[float | None] = ContextVar('timeout', default=None)
+
+
+def endpoint_of(url: str, server: str = '') -> str:
+    """
+    Normalise a Jenkins URL to a low-cardinality endpoint name for metrics.
+
+    Job, node and view names collapse to `{name}`, build and queue numbers to `{number}`,
+    and nested folders to a single `job/{name}`.
+
+    Args:
+        url: The requested URL
+        server: The Jenkins base URL, stripped from the path when it has a context path
+
+    Returns:
+        str: The endpoint, e.g. `job/{name}/{number}/consoleText`
+    """
+    path = urlparse(url).path
+    base = urlparse(server).path.rstrip('/')
+    if base and path.startswith(base):
+        path = path[len(base) :]
+
+    segments = []
+    name_follows = False
+    for segment in filter(None, path.split('/')):
+        if name_follows and segment != 'api':
+            segments.append('{number}' if _NUMBER.match(segment) else '{name}')
+            name_follows = False
+            continue
+        name_follows = False
+        if segment == 'job' and segments[-2:] == ['job', '{name}']:
+            # Collapse folder/job/... chains so nested jobs share one endpoint
+            del segments[-2:]
+        if _NUMBER.match(segment):
+            segments.append('{number}')
+        else:
+            segments.append(segment)
+            name_follows = segment in _NAMED_SEGMENTS
+    return '/'.join(segments) or '/'
+
+
+def job_path(fullname: str) -> str:
+    """The path of a job, e.g. `job/folder/job/name` for `folder/name`"""
+    return '/'.join(f'job/{quote(part, safe="")}' for part in fullname.strip('/').split('/'))
+
+
+def _status_of(exc: BaseException) -> str:
+    """python-jenkins re-raises HTTP errors as its own exceptions, so look for the status in the chain"""
+    while exc is not None:
+        response = getattr(exc, 'response', None)
+        if response is not None and getattr(response, 'status_code', None) is not None:
+            return str(response.status_code)
+        exc = exc.__cause__ or exc.__context__
+    return 'error'
+
+
+def _release_on_close(response: requests.Response, slot: ExitStack) -> None:
+    close = response.close
+
+    def release() -> None:
+        try:
+            close()
+        finally:
+            slot.close()
+
+    response.close = release
+
+
+class JenkinsTransport(Jenkins):
+    """
+    Jenkins handle that throttles every HTTP request sent to the controller, retries and
+    circuit-breaks it, applies the endpoint class timeout and records its metrics.
+
+    Crumb and auth lookups that python-jenkins issues from inside a request reuse the
+    outer request's throttle slot, so a lane capped at one in-flight request cannot deadlock.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        throttle: Throttle | None = None,
+        resilience: Resilience | None = None,
+        timeouts: dict[str, float] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.throttle = throttle or Throttle()
+        self.resilience = resilience or Resilience()
+        self.timeouts = timeouts or {}
+
+    def get_tree(self, path: str, tree: str) -> dict:
+        """
+        Query `path/api/json` for the `tree` fields only, so Jenkins serializes nothing else
+
+        Args:
+            path: The object's path, e.g. `queue` or `computer`, empty for the root
+            tree: The fields to return, e.g. `items[id,why]`
+
+        Returns:
+            dict: The decoded JSON
+        """
+        url = self._build_url(f'{path.strip("/")}/api/json?tree={quote(tree, safe="[],")}'.lstrip('/'))
+        return json.loads(self.jenkins_open(requests.Request('GET', url)))
+
+    def open_stream(self, path: str, headers: dict[str, str] | None = None) -> requests.Response:
+        """
+        GET `path` without reading the body, which the caller reads with `iter_content` and must close,
+        as the response holds its throttle slot until then
+        """
+        return self.jenkins_request(requests.Request('GET', self._build_url(path), headers=headers or {}), stream=True)
+
+    def stream(self, path: str, chunk_size: int = 64 * 1024) -> Iterator[str]:
+        """
+        GET `path` and yield the decoded body chunk by chunk, so a large response is never held whole
+
+        Args:
+            path: The path of the resource, e.g. `job/a/12/consoleText`
+            chunk_size: The number of bytes read at a time
+
+        Returns:
+            Iterator[str]: The chunks of the body
+        """
+        response = self.open_stream(path)
+        try:
+            decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+            for chunk in response.iter_content(chunk_size):
+                yield decoder.decode(chunk)
+            yield decoder.decode(b'', final=True)
+        finally:
+            response.close()
+
+    def jenkins_request(
+        self,
+        req: requests.Request,
+        add_crumb: bool = True,  # noqa: FBT001, FBT002 (signature of the overridden method)
+        resolve_auth: bool = True,  # noqa: FBT001, FBT002
+        stream: bool | None = None,  # noqa: FBT001
+    ) -> requests.Response:
+        if _in_request.get():
+            return self._send(req, add_crumb, resolve_auth, stream)
+
+        klass = endpoint_class(req.method, req.url)
+
+        def attempt() -> requests.Response:
+            with ExitStack() as stack:
+                stack.enter_context(self.throttle.slot(klass))
+                response = self._send(req, add_crumb, resolve_auth, stream)
+                if stream:
+                    # The body is read after this returns, so the slot is only given back once it is closed
+                    _release_on_close(response, stack.pop_all())
+                return response
+
+        token = _in_request.set(True)
+        timeout_token = _timeout.set(self.timeouts.get(klass, self.timeout))
+        try:
+            return self.resilience.call(attempt, method=req.method, endpoint_class=klass)
+        finally:
+            _timeout.reset(timeout_token)
+            _in_request.reset(token)
+
+    def _request(self, req: requests.Request, stream: bool | None = None) -> requests.Response:  # noqa: FBT001
+        # Same as python-jenkins, with the timeout of the request's endpoint class
+        r = self._session.prepare_request(req)
+        settings = self._session.merge_environment_settings(r.url, {}, stream, self._session.verify, None)
+        settings['timeout'] = _timeout.get() or self.timeout
+        return self._session.send(r, **settings)
+
+    def _send(
+        self,
+        req: requests.Request,
+        add_crumb: bool,  # noqa: FBT001
+        resolve_auth: bool,  # noqa: FBT001
+        stream: bool | None,  # noqa: FBT001
+    ) -> requests.Response:
+        endpoint = endpoint_of(req.url, self.server)
+        status = 'error'
+        start = time.perf_counter()
+        try:
+            response = super().jenkins_request(req, add_crumb, resolve_auth, stream)
+            status = str(response.status_code)
+        except Exception as e:
+            status = _status_of(e)
+            raise
+        finally:
+            UPSTREAM_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+            UPSTREAM_REQUESTS.inc(endpoint=endpoint, method=req.method, status=status)
+
+        if stream:
+            size = int(response.headers.get('Content-Length') or 0)
+        else:
+            size = len(response.content)
+        UPSTREAM_BYTES.inc(size, endpoint=endpoint)
+        return response
@@ -0,0 +1,90 @@
+import json
+import time
+from typing import Any
+
+from mcp_jenkins.store import Store
+
+# Results of read tools, in the store of the caller's client so they are never served to another user
+RESULTS_NAMESPACE = 'tool_results'
+# Time of the last write tool call per job and queue item, in the default client's store shared by all users
+WRITES_NAMESPACE = 'tool_writes'
+
+
+def _prefixes(fullname: str) -> list[str]:
+    parts = fullname.strip('/').split('/')
+    return ['/'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def read_subjects(arguments: dict[str, Any]) -> list[str]:
+    """
+    What the result of a read tool call depends on.
+
+    A job's result depends on the job itself (`job:`) and on every folder above it being left alone (`tree:`),
+    so scanning a multibranch pipeline invalidates its branches. Calls naming no job nor queue item, such as
+    listing all jobs or the queue, depend on any write (`global`).
+    """
+    subjects = []
+    if arguments.get('fullname'):
+        subjects.append(f'job:{arguments["fullname"].strip("/")}')
+        subjects.extend(f'tree:{prefix}' for prefix in _prefixes(arguments['fullname']))
+    if arguments.get('id_') is not None:
+        subjects.append(f'queue:{arguments["id_"]}')
+    return subjects or ['global']
+
+
+def write_subjects(arguments: dict[str, Any]) -> list[str]:
+    """What a write tool call changes: its job with everything below it, the folders above it, its queue item"""
+    subjects = ['global']
+    if arguments.get('fullname'):
+        subjects.append(f'tree:{arguments["fullname"].strip("/")}')
+        subjects.extend(f'job:{prefix}' for prefix in _prefixes(arguments['fullname']))
+    if arguments.get('id_') is not None:
+        subjects.append(f'queue:{arguments["id_"]}')
+    return subjects
+
+
+def memo_key(name: str, arguments: dict[str, Any]) -> str:
+    return f'{name}|{json.dumps(arguments, sort_keys=True, default=str)}'
+
+
+def memo_ttl(ttl: float, arguments: dict[str, Any]) -> float:
+    """The tool's TTL, shortened to a `max_age` argument so a caller asking for fresh data gets it"""
+    if arguments.get('max_age') is not None:
+        return min(ttl, arguments['max_age'])
+    return ttl
+
+
+def recall(results: Store, writes: Store, name: str, arguments: dict[str, Any]) -> tuple[bool, Any]:
+    """
+    Look up the memoised result of a read tool call
+
+    Args:
+        results: The store holding the caller's results
+        writes: The store holding the times of write tool calls
+        name: The tool's name
+        arguments: The call's arguments, without the context
+
+    Returns:
+        tuple[bool, Any]: Whether a result was found, and the result. A result is only found when no write tool
+            call touching what it depends on was made since it started being computed
+    """
+    entry = results.get(RESULTS_NAMESPACE, memo_key(name, arguments))
+    if entry is None:
+        return False, None
+    for subject in read_subjects(arguments):
+        written_at = writes.get(WRITES_NAMESPACE, subject)
+        if written_at is not None and written_at >= entry['at']:
+            return False, None
+    return True, entry['result']
+
+
+def remember(results: Store, name: str, arguments: dict[str, Any], result: Any, started_at: float, ttl: float) -> None:
+    """Memoise a read tool's result, as of `started_at` so writes made while it was computed still invalidate it"""
+    results.set(RESULTS_NAMESPACE, memo_key(name, arguments), {'at': started_at, 'result': result}, ttl=ttl)
+
+
+def invalidate(writes: Store, arguments: dict[str, Any]) -> None:
+    """Record a write tool call, invalidating the results it may have changed"""
+    now = time.time()
+    for subject in write_subjects(arguments):
+        writes.set(WRITES_NAMESPACE, subject, now)
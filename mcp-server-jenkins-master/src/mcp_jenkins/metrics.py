@@ -0,0 +1,240 @@
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_: str = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            msg = f'Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}'
+            raise ValueError(msg)
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+    def snapshot(self) -> list[dict]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type_ = 'counter'
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}' for key, value in items]
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [{**dict(zip(self.labelnames, key, strict=True)), 'value': value} for key, value in items]
+
+
+class Gauge(Counter):
+    type_ = 'gauge'
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class _HistogramValue:
+    __slots__ = ('buckets', 'count', 'sum')
+
+    def __init__(self, size: int) -> None:
+        self.buckets = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram(_Metric):
+    type_ = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = _HistogramValue(len(self.buckets) + 1)
+            data.buckets[index] += 1
+            data.count += 1
+            data.sum += value
+
+    def get(self, **labels: str) -> tuple[int, float]:
+        """Return the (count, sum) observed for the given labels"""
+        with self._lock:
+            data = self._values.get(self._key(labels))
+            return (data.count, data.sum) if data else (0, 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, list(data.buckets), data.count, data.sum) for key, data in self._values.items())
+        lines = []
+        for key, buckets, count, sum_ in items:
+            cumulative = 0
+            for bound, bucket in zip((*self.buckets, float('inf')), buckets, strict=True):
+                cumulative += bucket
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(sum_)}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {count}')
+        return lines
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            items = sorted((key, list(data.buckets), data.count, data.sum) for key, data in self._values.items())
+        result = []
+        for key, buckets, count, sum_ in items:
+            result.append(
+                {
+                    **dict(zip(self.labelnames, key, strict=True)),
+                    'count': count,
+                    'sum': sum_,
+                    'avg': sum_ / count if count else 0.0,
+                    'p50': self._quantile(buckets, count, 0.5),
+                    'p95': self._quantile(buckets, count, 0.95),
+                    'p99': self._quantile(buckets, count, 0.99),
+                }
+            )
+        return result
+
+    def _quantile(self, buckets: list[int], count: int, q: float) -> float | None:
+        """Estimate a quantile as the upper bound of the bucket it falls in"""
+        if not count:
+            return None
+        rank = q * count
+        cumulative = 0
+        for bound, bucket in zip((*self.buckets, float('inf')), buckets, strict=True):
+            cumulative += bucket
+            if cumulative >= rank:
+                return bound if bound != float('inf') else self.buckets[-1]
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    msg = f'Metric {metric.name} is already registered with a different definition'
+                    raise ValueError(msg)
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type_}')
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> dict[str, list[dict]]:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def clear(self) -> None:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+TOOL_CALLS = REGISTRY.counter('mcp_jenkins_tool_calls_total', 'Number of MCP tool calls', ['tool'])
+TOOL_ERRORS = REGISTRY.counter('mcp_jenkins_tool_errors_total', 'Number of MCP tool calls that raised', ['tool'])
+TOOL_LATENCY = REGISTRY.histogram('mcp_jenkins_tool_duration_seconds', 'Latency of MCP tool calls', ['tool'])
+TOOL_RESPONSE_BYTES = REGISTRY.histogram(
+    'mcp_jenkins_tool_response_bytes', 'Serialized size of MCP tool responses', ['tool'], SIZE_BUCKETS
+)
+
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    'mcp_jenkins_upstream_requests_total', 'Number of HTTP requests sent to Jenkins', ['endpoint', 'method', 'status']
+)
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    'mcp_jenkins_upstream_request_duration_seconds', 'Latency of HTTP requests sent to Jenkins', ['endpoint']
+)
+UPSTREAM_BYTES = REGISTRY.counter(
+    'mcp_jenkins_upstream_response_bytes_total', 'Bytes received from Jenkins', ['endpoint']
+)
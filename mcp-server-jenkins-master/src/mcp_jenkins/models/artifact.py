@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+
+
+class Artifact(BaseModel):
+    fileName: str
+    relativePath: str
+
+
+class ArtifactMatch(BaseModel):
+    line: int
+    offset: int
+    text: str
+
+
+class ArtifactContent(BaseModel):
+    path: str
+    offset: int
+    size: int | None = None
+    eof: bool
+    content: str | None = None
+    matches: list[ArtifactMatch] | None = None
+    # The offset to continue reading or searching from, when the read or the search stopped early
+    nextOffset: int | None = None
@@ -22,3 +22,36 @@ class Build(BaseModel):
     inProgress: bool = None
     nextBuild: Optional['Build'] = None
     previousBuild: Optional['Build'] = None
+
+
+class BuildLookup(BaseModel):
+    fullname: str
+    number: int | str
+    build: Build | None = None
+    error: str | None = None
+
+
+class BuildError(BaseModel):
+    signature: str
+    category: str
+    line: int
+    count: int
+    snippet: str
+
+
+class BuildErrors(BaseModel):
+    lines: int
+    errors: list[BuildError]
+    # Distinct errors left out by the limit
+    truncated: int = 0
+
+
+class LogDiff(BaseModel):
+    baseLines: int
+    targetLines: int
+    removed: int
+    added: int
+    # Unified diff hunks, normalised lines compare equal but are shown as logged by the compared build
+    hunks: list[str]
+    # Hunks left out by the limit
+    truncated: int = 0
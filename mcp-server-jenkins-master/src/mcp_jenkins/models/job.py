@@ -20,6 +20,7 @@ class Job(JobBase):
     buildable: bool = None
     builds: list['Build'] = None
     lastBuild: Optional['Build'] = None
+    lastSuccessfulBuild: Optional['Build'] = None
     nextBuildNumber: int = None
     inQueue: bool = None
 
@@ -37,3 +38,29 @@ class MultibranchPipeline(JobBase):
 
 class Folder(JobBase):
     jobs: list[Union['Job', 'Folder', 'MultibranchPipeline']]
+
+
+class JobMatch(BaseModel):
+    fullname: str
+    name: str
+    url: str
+    color: str | None = None
+    description: str | None = None
+    score: float
+    matched: list[str]
+
+
+class BranchScan(BaseModel):
+    fullname: str
+    status: str
+    added: list[str] | None = None
+    removed: list[str] | None = None
+    branches: int | None = None
+    log: list[str] | None = None
+    elapsed: float | None = None
+
+
+class ConfigMatch(BaseModel):
+    fullname: str
+    matches: list[str] = None
+    error: str = None
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+
+
+class FailedCase(BaseModel):
+    className: str = None
+    name: str
+    status: str
+    duration: float = None
+    errorDetails: str | None = None
+    errorStackTrace: str | None = None
+
+
+class SuiteFailures(BaseModel):
+    name: str = None
+    failures: list[FailedCase]
+
+
+class FailureReport(BaseModel):
+    failCount: int = None
+    passCount: int = None
+    skipCount: int = None
+    suites: list[SuiteFailures]
+    # Failures left out of `suites` by the limit
+    truncated: int = 0
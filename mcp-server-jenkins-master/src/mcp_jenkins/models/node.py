@@ -1,6 +1,24 @@
 from pydantic import BaseModel
 
 
+class _NodeMonitor(BaseModel):
+    diskSpace: int | None = None
+    tempSpace: int | None = None
+    availableSwapSpace: int | None = None
+    availablePhysicalMemory: int | None = None
+    responseTime: int | None = None
+    architecture: str = None
+
+
 class Node(BaseModel):
     name: str
     offline: bool
+
+    # The following fields are determined by the tree of the computer query
+    temporarilyOffline: bool | None = None
+    offlineCause: str | None = None
+    labels: list[str] = None
+    numExecutors: int = None
+    busyExecutors: int = None
+    idleExecutors: int = None
+    monitor: _NodeMonitor = None
@@ -14,3 +14,11 @@ class QueueItem(BaseModel):
     why: str
 
     task: '_QueueItemTask'
+
+
+class QueueChanges(BaseModel):
+    cursor: str
+    reset: bool = False
+    added: list[QueueItem] = []
+    changed: list[QueueItem] = []
+    removed: list[int] = []
@@ -1,19 +1,163 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
 import os
+import threading
+import time
 from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
-from typing import Literal
+from dataclasses import dataclass, field
+from typing import Annotated, Any, Literal, TypeVar
 
 from mcp.server.fastmcp import Context
 from mcp.server.fastmcp import FastMCP as _FastMCP
+from mcp.server.transport_security import TransportSecuritySettings
 from mcp.types import AnyFunction
+from pydantic import Field
+from starlette.applications import Starlette
 
-from mcp_jenkins.jenkins import JenkinsClient
+from mcp_jenkins.budget import budget_scope, fit
+from mcp_jenkins.jenkins import (
+    ClientPool,
+    JenkinsClient,
+    Poller,
+    credential_scope,
+    load_signatures,
+    parse_limits,
+    parse_timeouts,
+    priority_lane,
+)
+from mcp_jenkins.memo import invalidate, memo_ttl, recall, remember
+from mcp_jenkins.metrics import TOOL_CALLS, TOOL_ERRORS, TOOL_LATENCY, TOOL_RESPONSE_BYTES
+from mcp_jenkins.store import ScopedStore, create_store
+
+T = TypeVar('T')
+
+
+def _response_size(result: object) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, str):
+        return len(result.encode())
+    return len(json.dumps(result, default=str))
+
+
+# The client calls Jenkins synchronously, and the throttle and the retries wait by sleeping, so tools run their
+# client calls in worker threads with `offload` and a waiting call never holds up the event loop. Write tools
+# have their own workers so they never queue behind reads.
+TOOL_WORKERS = 32
+_workers = {tag: ThreadPoolExecutor(TOOL_WORKERS, thread_name_prefix=f'mcp-jenkins-{tag}') for tag in ('read', 'write')}
+_tool_tag: contextvars.ContextVar[str] = contextvars.ContextVar('tool_tag', default='read')
+
+
+async def offload(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:  # noqa: UP047 (Python 3.10 is supported)
+    """Run a blocking client call in a worker thread of the calling tool's kind, in the caller's context"""
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        _workers[_tool_tag.get()], functools.partial(context.run, fn, *args, **kwargs)
+    )
+
+
+BUDGET_PARAMETER = inspect.Parameter(
+    'max_response_bytes',
+    inspect.Parameter.KEYWORD_ONLY,
+    default=None,
+    annotation=Annotated[
+        int | None,
+        Field(
+            description='Size budget of the response in bytes of JSON. Detail is reduced to fit: nested builds are '
+            'dropped, nested folders collapse to counts, long lists are cut and followed by their total'
+        ),
+    ],
+)
+
+
+def instrument(name: str, fn: AnyFunction, tag: Literal['read', 'write'] = 'read', ttl: float = 0) -> AnyFunction:
+    """
+    Wrap a tool so its latency, errors and response size are recorded under `name`.
+
+    Tool bodies run on the event loop and their client calls in worker threads, see `offload`. Write tools send
+    all their Jenkins requests through the priority lane of the throttle. Read tools take
+    a `max_response_bytes` budget, which their response is fitted to and their client calls can read
+    with `response_budget()` to skip fetching what would not fit.
+
+    Read tools given a `ttl` memoise their result per caller and arguments for that many seconds. A write tool
+    call on the same job, or on a folder above it, or on the same queue item invalidates it, so a caller always
+    sees the effect of its own writes.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        TOOL_CALLS.inc(tool=name)
+        max_bytes = kwargs.pop(BUDGET_PARAMETER.name, None)
+        ctx = next((value for value in kwargs.values() if isinstance(value, Context)), None)
+        arguments = {key: value for key, value in kwargs.items() if not isinstance(value, Context)}
+        start = time.perf_counter()
+        token = _tool_tag.set(tag)
+        try:
+            if tag == 'write':
+                try:
+                    with priority_lane():
+                        result = await fn(*args, **kwargs)
+                finally:
+                    if ctx is not None:
+                        # Also on failure, a write that timed out may still have been applied
+                        invalidate(ctx.request_context.lifespan_context.client.store, arguments)
+            else:
+                if max_bytes is not None:
+                    arguments[BUDGET_PARAMETER.name] = max_bytes
+                result = await _read(fn, args, kwargs, ctx, name, arguments, max_bytes, ttl)
+        except Exception:
+            TOOL_ERRORS.inc(tool=name)
+            raise
+        finally:
+            _tool_tag.reset(token)
+            TOOL_LATENCY.observe(time.perf_counter() - start, tool=name)
+        TOOL_RESPONSE_BYTES.observe(_response_size(result), tool=name)
+        return result
+
+    if tag == 'read':
+        # FastMCP builds the tool's input schema from the signature
+        signature = inspect.signature(fn)
+        wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), BUDGET_PARAMETER])
+    return wrapper
+
+
+async def _read(
+    fn: AnyFunction,
+    args: tuple,
+    kwargs: dict[str, Any],
+    ctx: Context | None,
+    name: str,
+    arguments: dict[str, Any],
+    max_bytes: int | None,
+    ttl: float,
+) -> Any:
+    ttl = memo_ttl(ttl, arguments) if ctx is not None else 0
+    if ttl > 0:
+        results, writes = client(ctx).store, ctx.request_context.lifespan_context.client.store
+        found, result = recall(results, writes, name, arguments)
+        if found:
+            return result
+    started_at = time.time()
+    with budget_scope(max_bytes):
+        result = fit(await fn(*args, **kwargs), max_bytes)
+    if ttl > 0:
+        remember(results, name, arguments, result, started_at, ttl)
+    return result
 
 
 class FastMCP(_FastMCP):
     def tool(
-        self, name: str | None = None, description: str | None = None, tag: Literal['read', 'write'] = 'read'
+        self,
+        name: str | None = None,
+        description: str | None = None,
+        tag: Literal['read', 'write'] = 'read',
+        *,
+        memoise: bool = False,
     ) -> Callable[[AnyFunction], AnyFunction]:
         """Decorator to register a tool.
 
@@ -26,6 +170,8 @@ class FastMCP(_FastMCP):
             description: Optional description of what the tool does
             tag: Optional tag to indicate if the tool is read-only or write-capable.
                 Defaults to None, which means it can be either.
+            memoise: Whether a read tool's result is memoised for `--tool-cache-ttl` seconds. Only for tools whose
+                result does not describe live state, such as logs or status of running builds, job colors or the queue
 
         Example:
             @server.tool()
@@ -50,49 +196,203 @@ class FastMCP(_FastMCP):
 
         def decorator(fn: AnyFunction) -> AnyFunction:
             alias_name = name or os.getenv('tool_alias').replace('[fn]', fn.__name__)
+            memo = float(os.getenv('tool_cache_ttl', '5')) if memoise else 0
             # Not in read-only mode
             if os.getenv('read_only', 'false') == 'false':
-                self.add_tool(fn, name=alias_name)
+                self.add_tool(instrument(alias_name, fn, tag, memo), name=alias_name, description=description)
             # In read-only mode
             elif tag == 'read':
-                self.add_tool(fn, name=alias_name)
+                self.add_tool(instrument(alias_name, fn, tag, memo), name=alias_name, description=description)
             return fn
 
         return decorator
 
 
+# Headers carrying a user's own Jenkins credentials on the SSE and streamable HTTP transports
+USERNAME_HEADER = 'x-jenkins-username'
+PASSWORD_HEADER = 'x-jenkins-password'  # noqa: S105 (header name)
+
+
 @dataclass
 class JenkinsContext:
-    client: JenkinsClient
+    factory: Callable[..., JenkinsClient]
+    pool_size: int = 32
+    idle_timeout: float = 600
+    _client: JenkinsClient | None = None
+    _pool: ClientPool | None = None
+    _poller: Poller | None = None
+    _warmed: bool = False
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def client(self) -> JenkinsClient:
+        """The Jenkins client, created on first use so the server is ready before any Jenkins setup"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self.factory()
+        return self._client
+
+    def client_for(self, username: str, password: str) -> JenkinsClient:
+        """The client of a user's own credentials, from a pool shared by the sessions of all users"""
+        default = self.client
+        with self._lock:
+            if self._pool is None:
+                self._pool = ClientPool(
+                    lambda username, password: self.factory(username, password, default),
+                    self.pool_size,
+                    self.idle_timeout,
+                )
+        return self._pool.get(username, password)
+
+    def warm_up(self) -> None:
+        """
+        Load the job inventory in the background once per process: from the on-disk store when it was persisted
+        by a previous run, revalidated with Jenkins when stale, so the first job search does not wait for a crawl
+        """
+        with self._lock:
+            if self._warmed:
+                return
+            self._warmed = True
+
+        def run() -> None:
+            try:
+                self.client.job.get_all_jobs()
+            except Exception:  # noqa: BLE001, S110 (the first job tool call crawls instead)
+                pass
+
+        threading.Thread(target=run, name='mcp-jenkins-warm-up', daemon=True).start()
+
+    def start_poller(self, interval: float) -> None:
+        """Start refreshing the queue, node and running build snapshots in the background, once per process"""
+        with self._lock:
+            if self._poller is None:
+                self._poller = Poller(lambda: self.client, interval)
+                self._poller.start()
+
+
+def _poll_interval() -> float:
+    return float(os.getenv('poll_interval', '0'))
+
+
+def dump_snapshot(items: list, age: float) -> list[dict]:
+    """Dump the items of a snapshot, each with the snapshot's age in seconds when the background poller is on"""
+    dumped = [item.model_dump(exclude_none=True) for item in items]
+    if _poll_interval() > 0:
+        for item in dumped:
+            item['snapshot_age'] = round(age, 3)
+    return dumped
+
+
+def artifact_dir() -> str | None:
+    """The on-disk artifact cache of the configured credentials, which holds the directories of every user"""
+    cache_dir = os.getenv('cache_dir')
+    return os.path.join(cache_dir, 'artifacts') if cache_dir else None
+
+
+def _create_client(
+    username: str | None = None, password: str | None = None, default: JenkinsClient | None = None
+) -> JenkinsClient:
+    """
+    The client of the configured credentials, or of a user's own ones when `default` is given. A user's client
+    shares the store of `default` under its own scope, and its throttle and circuit breaker.
+    """
+    cache_dir, artifacts = os.getenv('cache_dir'), artifact_dir()
+    if default is None:
+        store = create_store(cache_dir)
+        username, password = os.getenv('jenkins_username'), os.getenv('jenkins_password')
+    else:
+        scope = credential_scope(username, password)
+        store = ScopedStore(default.store, scope)
+        artifacts = os.path.join(artifacts, scope) if artifacts else None
+    return JenkinsClient(
+        url=os.getenv('jenkins_url'),
+        username=username,
+        password=password,
+        timeout=int(os.getenv('jenkins_timeout')),
+        store=store,
+        inventory_ttl=float(os.getenv('inventory_ttl', '30')),
+        config_ttl=float(os.getenv('config_ttl', '10')),
+        rate_limits=parse_limits(os.getenv('rate_limits', '')),
+        timeouts=parse_timeouts(os.getenv('endpoint_timeouts', '')),
+        retries=int(os.getenv('retries', '3')),
+        breaker_threshold=int(os.getenv('breaker_threshold', '5')),
+        breaker_reset=float(os.getenv('breaker_reset', '30')),
+        # With the poller on, snapshots are answered from memory unless it has fallen two polls behind
+        snapshot_max_age=2 * _poll_interval(),
+        artifact_dir=artifacts,
+        error_signatures=load_signatures(os.getenv('error_signatures')) if os.getenv('error_signatures') else None,
+        throttle=default._jenkins.throttle if default is not None else None,
+        resilience=default._jenkins.resilience if default is not None else None,
+    )
+
+
+# The SSE and streamable HTTP transports enter the lifespan once per session (once per request when
+# stateless), so the context is process-wide to keep the client's HTTP session, crumb and caches warm
+_context = JenkinsContext(
+    factory=_create_client,
+    pool_size=int(os.getenv('client_pool_size', '32')),
+    idle_timeout=float(os.getenv('client_idle_timeout', '600')),
+)
 
 
 @asynccontextmanager
 async def jenkins_lifespan(server: FastMCP) -> AsyncIterator[JenkinsContext]:
+    _context.warm_up()
+    if _poll_interval() > 0:
+        _context.start_poller(_poll_interval())
     try:
-        jenkins_url = os.getenv('jenkins_url')
-        jenkins_username = os.getenv('jenkins_username')
-        jenkins_password = os.getenv('jenkins_password')
-        jenkins_timeout = int(os.getenv('jenkins_timeout'))
-
-        client = JenkinsClient(
-            url=jenkins_url,
-            username=jenkins_username,
-            password=jenkins_password,
-            timeout=jenkins_timeout,
-        )
-
         # Provide context to the application
-        yield JenkinsContext(client=client)
+        yield _context
     finally:
         # Cleanup resources if needed
         pass
 
 
 def client(ctx: Context) -> JenkinsClient:
+    """
+    The client of the credentials sent in the request's headers if any, of the configured ones otherwise.
+    With `--require-user-credentials`, the configured ones only serve stdio, whose requests have no headers.
+    """
+    headers = getattr(ctx.request_context.request, 'headers', None)
+    if headers is not None and headers.get(USERNAME_HEADER):
+        return ctx.request_context.lifespan_context.client_for(
+            headers[USERNAME_HEADER], headers.get(PASSWORD_HEADER, '')
+        )
+    if headers is not None and os.getenv('require_user_credentials', 'false') == 'true':
+        msg = f'Send your Jenkins credentials in the {USERNAME_HEADER} and {PASSWORD_HEADER} headers'
+        raise ValueError(msg)
     return ctx.request_context.lifespan_context.client
 
 
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+
+def bind(host: str, port: int) -> None:
+    """
+    Listen on `host` and `port` with the SSE and streamable HTTP transports. FastMCP only accepts localhost
+    Host headers, as it was created for the default loopback host, which would turn away every client of a
+    public bind with `421 Misdirected Request`, so the check is kept for loopback binds only.
+    """
+    mcp.settings.host, mcp.settings.port = host, port
+    if host in LOOPBACK_HOSTS:
+        mcp.settings.transport_security = TransportSecuritySettings(
+            allowed_hosts=['127.0.0.1:*', 'localhost:*', '[::1]:*'],
+            allowed_origins=['http://127.0.0.1:*', 'http://localhost:*', 'http://[::1]:*'],
+        )
+    else:
+        mcp.settings.transport_security = TransportSecuritySettings(enable_dns_rebinding_protection=False)
+
+
+def streamable_http_app() -> Starlette:
+    """App factory used by the uvicorn workers of the streamable HTTP transport"""
+    bind(os.getenv('host', '127.0.0.1'), int(os.getenv('port', '9887')))
+    # Requests of one session may land on any worker, so sessions cannot live in a worker's memory
+    mcp.settings.stateless_http = os.getenv('stateless_http', 'false') == 'true'
+    return mcp.streamable_http_app()
+
+
 mcp = FastMCP('mcp-jenkins', lifespan=jenkins_lifespan)
 
 # Import the job and build modules here to avoid circular imports
-from mcp_jenkins.server import build, job, node, queue_item  # noqa: E402, F401
+from mcp_jenkins.server import artifact, build, events, job, junit, node, queue_item, stats  # noqa: E402, F401
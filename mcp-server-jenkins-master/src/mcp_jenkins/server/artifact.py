@@ -0,0 +1,53 @@
+from mcp.server.fastmcp import Context
+
+from mcp_jenkins.server import client, mcp, offload
+
+
+@mcp.tool(tag='read')
+async def list_build_artifacts(ctx: Context, fullname: str, build_number: int) -> list[dict]:
+    """
+    List the artifacts archived by a build
+
+    Args:
+        fullname: The fullname of the job
+        build_number: The number of the build
+
+    Returns:
+        list[dict]: The fileName and relativePath of each artifact
+    """
+    return [
+        artifact.model_dump()
+        for artifact in await offload(client(ctx).artifact.list_build_artifacts, fullname, build_number)
+    ]
+
+
+@mcp.tool(tag='read')
+async def read_build_artifact(
+    ctx: Context,
+    fullname: str,
+    build_number: int,
+    path: str,
+    offset: int = 0,
+    max_bytes: int = 65536,
+    pattern: str | None = None,
+) -> dict:
+    """
+    Read a byte range of a build artifact, or search its lines, without downloading the whole file
+
+    Args:
+        fullname: The fullname of the job
+        build_number: The number of the build
+        path: The relativePath of the artifact
+        offset: The byte offset to start reading or searching at
+        max_bytes: The maximum number of bytes to read, at most 1048576
+        pattern: A regex, if given, up to 100 matching lines with their line number (counted from offset)
+            and byte offset are returned instead of the content
+
+    Returns:
+        dict: The content or the matches, the total size if known, whether the end was reached,
+            and nextOffset to continue from when it was not
+    """
+    content = await offload(
+        client(ctx).artifact.read_build_artifact, fullname, build_number, path, offset, max_bytes, pattern
+    )
+    return content.model_dump(exclude_none=True)
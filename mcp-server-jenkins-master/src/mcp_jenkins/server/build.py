@@ -1,17 +1,22 @@
 from mcp.server.fastmcp import Context
 
-from mcp_jenkins.server import client, mcp
+from mcp_jenkins.server import client, dump_snapshot, mcp, offload
 
 
 @mcp.tool(tag='read')
-async def get_running_builds(ctx: Context) -> list[dict]:
+async def get_running_builds(ctx: Context, max_age: float | None = None) -> list[dict]:
     """
     Get all running builds from Jenkins
 
+    Args:
+        max_age: The maximum age in seconds of the answer, 0 to fetch from Jenkins.
+            Defaults to what the server's background poller keeps fresh
+
     Returns:
-        list[dict]: A list of all running builds
+        list[dict]: A list of all running builds, each with a `snapshot_age` in seconds when the background
+            poller is on
     """
-    return [build.model_dump(exclude_none=True) for build in client(ctx).build.get_running_builds()]
+    return dump_snapshot(*await offload(client(ctx).build.get_running_builds_snapshot, max_age))
 
 
 @mcp.tool(tag='read')
@@ -27,11 +32,102 @@ async def get_build_info(ctx: Context, fullname: str, build_number: int | None =
         dict: The build info
     """
     if build_number is None:
-        build_number = client(ctx).job.get_job_info(fullname).lastBuild.number
-    return client(ctx).build.get_build_info(fullname, build_number).model_dump(exclude_none=True)
+        build_number = (await offload(client(ctx).job.get_job_info, fullname)).lastBuild.number
+    return (await offload(client(ctx).build.get_build_info, fullname, build_number)).model_dump(exclude_none=True)
 
 
 @mcp.tool(tag='read')
+async def get_builds_info(ctx: Context, builds: list[dict]) -> list[dict]:
+    """
+    Get the info of many builds in one call, e.g. every running build or the last build of every branch
+
+    Args:
+        builds: The builds as `{"fullname": ..., "number": ...}`, where the number may also be a permalink:
+            `lastBuild` (the default), `lastCompletedBuild`, `lastSuccessfulBuild`, `lastFailedBuild`,
+            `lastStableBuild`, `lastUnstableBuild` or `lastUnsuccessfulBuild`. At most 500
+
+    Returns:
+        list[dict]: Per build in the order given, the `fullname` and `number` asked for, and either
+            the `build` info or the `error` it could not be read with
+    """
+    refs = []
+    for item in builds:
+        if not isinstance(item, dict) or not item.get('fullname'):
+            msg = f'Each build needs a fullname, got {item!r}'
+            raise ValueError(msg)
+        refs.append((item['fullname'], item.get('number') or 'lastBuild'))
+    return [lookup.model_dump(exclude_none=True) for lookup in await offload(client(ctx).build.get_builds_info, refs)]
+
+
+@mcp.tool(tag='read')
+async def get_build_history(
+    ctx: Context,
+    fullname: str,
+    result: str | None = None,
+    since: int | None = None,
+    until: int | None = None,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> dict:
+    """
+    Page through the build history of a job, newest first, including builds older than get_job_info returns
+
+    Args:
+        fullname: The fullname of the job
+        result: Only return builds with one of these comma separated results, e.g. `FAILURE,UNSTABLE`,
+            `BUILDING` for running builds
+        since: Only return builds started at or after this timestamp in milliseconds
+        until: Only return builds started at or before this timestamp in milliseconds
+        limit: The maximum number of builds to return
+        cursor: The cursor returned with the previous page
+
+    Returns:
+        dict: `builds`, each with number, url, result, timestamp, duration and building, and `cursor`,
+            to pass to get the next page, absent on the last page
+    """
+    builds, next_cursor = await offload(
+        client(ctx).build.get_build_history, fullname, result, since, until, limit, cursor
+    )
+    history = {'builds': [build.model_dump(exclude_none=True) for build in builds]}
+    if next_cursor is not None:
+        history['cursor'] = next_cursor
+    return history
+
+
+@mcp.tool(tag='read', memoise=True)
+async def build_stats(
+    ctx: Context,
+    fullnames: list[str] | None = None,
+    fullname_pattern: str | None = None,
+    limit: int = 30,
+    since: int | None = None,
+    sort_by: str = 'trend',
+    top: int = 20,
+) -> list[dict]:
+    """
+    Rank jobs by how their recent builds behave, e.g. to find the jobs that got slower or flakier
+
+    Args:
+        fullnames: The fullnames of the jobs, if None, the jobs whose fullname matches fullname_pattern
+        fullname_pattern: The pattern of the fullname, if both are None, all jobs. At most 200 jobs are
+            looked at, the result ends with `{"truncated", "total"}` when there were more
+        limit: The number of most recent builds of each job to look at
+        since: Only look at builds started at or after this timestamp in milliseconds
+        sort_by: `trend` (duration change over the builds relative to the mean), `flakiness` (share of
+            builds whose result differs from the previous one), `failureRate`, `p90Duration` or `meanDuration`
+        top: The number of jobs to return
+
+    Returns:
+        list[dict]: Per job, the number of builds, failure rate, flips, flakiness, mean and p50/p90/p99
+            durations in milliseconds, trend slope in milliseconds per build and trend, ranked highest first
+    """
+    jenkins = client(ctx)
+    if fullnames is None:
+        fullnames = await offload(jenkins.job.get_buildable_fullnames, fullname_pattern)
+    return await offload(jenkins.build.get_build_stats, fullnames, limit=limit, since=since, sort_by=sort_by, top=top)
+
+
+@mcp.tool(tag='read', memoise=True)
 async def get_build_sourcecode(ctx: Context, fullname: str, build_number: int | None = None) -> str:
     """
     Get the pipeline source code of a specific build in Jenkins
@@ -44,8 +140,8 @@ async def get_build_sourcecode(ctx: Context, fullname: str, build_number: int |
         str: The source code of the build
     """
     if build_number is None:
-        build_number = client(ctx).job.get_job_info(fullname).lastBuild.number
-    return client(ctx).build.get_build_sourcecode(fullname, build_number)
+        build_number = (await offload(client(ctx).job.get_job_info, fullname)).lastBuild.number
+    return await offload(client(ctx).build.get_build_sourcecode, fullname, build_number)
 
 
 @mcp.tool(tag='write')
@@ -60,7 +156,7 @@ async def build_job(ctx: Context, fullname: str, parameters: dict = None) -> int
     Returns:
         The queue item number of the job, only valid for about five minutes after the job completes
     """
-    return client(ctx).build.build_job(fullname, parameters)
+    return await offload(client(ctx).build.build_job, fullname, parameters)
 
 
 @mcp.tool(tag='read')
@@ -79,7 +175,75 @@ async def get_build_logs(ctx: Context, fullname: str, build_number: str) -> str:
         build_number = "lastBuild"
     elif isinstance(build_number, int):
         build_number = int(build_number)
-    return client(ctx).build.get_build_logs(fullname, build_number)
+    return await offload(client(ctx).build.get_build_logs, fullname, build_number)
+
+
+@mcp.tool(tag='read')
+async def extract_build_errors(
+    ctx: Context,
+    fullname: str,
+    build_number: int | None = None,
+    limit: int = 20,
+    context: int = 2,
+    patterns: list[str] | None = None,
+) -> dict:
+    """
+    Find the errors in the full log of a build (compiler errors, OOM, test failures, network timeouts, ...)
+    instead of reading the log itself
+
+    Args:
+        fullname: The fullname of the job
+        build_number: The number of the build, if None, get the last build
+        limit: The maximum number of distinct errors to return
+        context: The number of lines shown before and after each error, at most 10
+        patterns: Extra regexes to look for, ranked above the built-in signatures, at most 20 of 500 characters
+            each, without repeated groups such as `(a+)+` or backreferences
+
+    Returns:
+        dict: The number of lines of the log, and the distinct errors with their signature, category, first line
+            number, number of occurrences and a snippet prefixed by line numbers, most likely root cause first
+    """
+    if build_number is None:
+        build_number = (await offload(client(ctx).job.get_job_info, fullname)).lastBuild.number
+    errors = await offload(client(ctx).log.extract_build_errors, fullname, build_number, limit, context, patterns)
+    return errors.model_dump()
+
+
+@mcp.tool(tag='read')
+async def diff_build_logs(
+    ctx: Context,
+    fullname: str,
+    build_number: int | None = None,
+    base_build_number: int | None = None,
+    max_hunks: int = 20,
+    context: int = 3,
+) -> dict:
+    """
+    Show what changed between the logs of two builds, e.g. the last green build and a red one,
+    ignoring timestamps, durations and hashes
+
+    Args:
+        fullname: The fullname of the job
+        build_number: The number of the build to compare, if None, the last build
+        base_build_number: The number of the reference build, if None, the last successful build
+        max_hunks: The maximum number of changed hunks to return
+        context: The number of unchanged lines shown around each change, at most 10
+
+    Returns:
+        dict: The number of lines of both logs, the number of lines removed and added, and the changed hunks
+            in unified diff format
+    """
+    if build_number is None or base_build_number is None:
+        job = await offload(client(ctx).job.get_job_info, fullname)
+        if build_number is None:
+            build_number = job.lastBuild.number
+        if base_build_number is None:
+            if job.lastSuccessfulBuild is None:
+                msg = f'Job {fullname} has no successful build to compare with'
+                raise ValueError(msg)
+            base_build_number = job.lastSuccessfulBuild.number
+    diff = await offload(client(ctx).log.diff_build_logs, fullname, base_build_number, build_number, max_hunks, context)
+    return diff.model_dump()
 
 
 @mcp.tool(tag='write')
@@ -91,4 +255,4 @@ async def stop_build(ctx: Context, fullname: str, build_number: int) -> None:
         fullname: The fullname of the job
         build_number: The number of the build to stop
     """
-    return client(ctx).build.stop_build(fullname, build_number)
+    return await offload(client(ctx).build.stop_build, fullname, build_number)
@@ -0,0 +1,36 @@
+import hmac
+import os
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from mcp_jenkins.events import apply_event, parse_event
+from mcp_jenkins.server import _context, artifact_dir, mcp
+
+# Header, or `token` query parameter, carrying the `--events-token` shared with Jenkins
+EVENTS_TOKEN_HEADER = 'x-jenkins-events-token'  # noqa: S105 (header name)
+
+
+@mcp.custom_route('/jenkins/events', methods=['POST'])
+async def jenkins_events(request: Request) -> JSONResponse:
+    """
+    Receive Jenkins job and run notifications, from the Notification plugin or a generic webhook,
+    and invalidate the cached state they changed
+    """
+    token = os.getenv('events_token')
+    if not token:
+        # Anyone reaching the port could otherwise purge the caches at will
+        return JSONResponse(
+            {'error': 'Notifications are disabled, start the server with --events-token'}, status_code=403
+        )
+    sent = request.headers.get(EVENTS_TOKEN_HEADER) or request.query_params.get('token') or ''
+    if not hmac.compare_digest(sent.encode(), token.encode()):
+        return JSONResponse({'error': 'Invalid or missing events token'}, status_code=401)
+    try:
+        event = parse_event(await request.json())
+    except ValueError as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+    purged, expired = apply_event(_context.client.store, event, artifact_dir())
+    return JSONResponse(
+        {'event': event.kind, 'fullname': event.fullname, 'purged': purged, 'expired': expired}, status_code=202
+    )
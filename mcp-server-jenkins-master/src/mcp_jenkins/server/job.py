@@ -1,6 +1,6 @@
 from mcp.server.fastmcp import Context
 
-from mcp_jenkins.server import client, mcp
+from mcp_jenkins.server import client, mcp, offload
 
 
 @mcp.tool(tag='read')
@@ -11,10 +11,10 @@ async def get_all_jobs(ctx: Context) -> list[dict]:
     Returns:
         list[dict]: A list of all jobs
     """
-    return [job.model_dump(exclude_none=True) for job in client(ctx).job.get_all_jobs()]
+    return [job.model_dump(exclude_none=True) for job in await offload(client(ctx).job.get_all_jobs)]
 
 
-@mcp.tool(tag='read')
+@mcp.tool(tag='read', memoise=True)
 async def get_job_config(ctx: Context, fullname: str) -> str:
     """
     Get specific job config from Jenkins
@@ -25,7 +25,7 @@ async def get_job_config(ctx: Context, fullname: str) -> str:
     Returns:
         str: The config of the job
     """
-    return client(ctx).job.get_job_config(fullname)
+    return await offload(client(ctx).job.get_job_config, fullname)
 
 
 @mcp.tool(tag='read')
@@ -52,7 +52,8 @@ async def search_jobs(
     """
     return [
         job.model_dump(exclude_none=True)
-        for job in client(ctx).job.search_jobs(
+        for job in await offload(
+            client(ctx).job.search_jobs,
             class_pattern=class_pattern,
             name_pattern=name_pattern,
             fullname_pattern=fullname_pattern,
@@ -62,6 +63,59 @@ async def search_jobs(
     ]
 
 
+@mcp.tool(tag='read')
+async def find_jobs(ctx: Context, query: str, limit: int = 20) -> list[dict]:
+    """
+    Find jobs by free text, e.g. `payments deploy staging`, searching their names, display names, fullnames,
+    descriptions and last build causes and parameters through a full-text index
+
+    Args:
+        query: The words to look for, in any order. Words also match the longer words they start
+        limit: The maximum number of jobs to return
+
+    Returns:
+        list[dict]: The jobs matching the most words first, then by relevance, with their `score`
+            and the `matched` words
+    """
+    return [match.model_dump(exclude_none=True) for match in await offload(client(ctx).job.find_jobs, query, limit)]
+
+
+@mcp.tool(tag='read', memoise=True)
+async def search_job_configs(
+    ctx: Context,
+    pattern: str = None,
+    xpath: str = None,
+    class_pattern: str = None,
+    fullname_pattern: str = None,
+    max_age: float = 300,
+) -> list[dict]:
+    """
+    Search the config.xml of all jobs, e.g. for the jobs using an agent label, shared library,
+    credential id or SCM URL
+
+    Args:
+        pattern: A regex matched against the config lines, or against the texts xpath selects
+        xpath: An ElementTree XPath selecting elements, e.g. `.//assignedNode` or `.//scm//url`
+        class_pattern: Only search the jobs whose _class matches this pattern
+        fullname_pattern: Only search the jobs whose fullname matches this pattern
+        max_age: Seconds a cached config is used without asking Jenkins whether it changed
+
+    Returns:
+        list[dict]: The fullname and matching lines or texts of each matching job, or the error reading its config
+    """
+    return [
+        match.model_dump(exclude_none=True)
+        for match in await offload(
+            client(ctx).job.search_job_configs,
+            pattern=pattern,
+            xpath=xpath,
+            class_pattern=class_pattern,
+            fullname_pattern=fullname_pattern,
+            max_age=max_age,
+        )
+    ]
+
+
 @mcp.tool(tag='read')
 async def get_job_info(ctx: Context, fullname: str) -> dict:
     """
@@ -73,7 +127,7 @@ async def get_job_info(ctx: Context, fullname: str) -> dict:
     Returns:
         dict: The job info
     """
-    return client(ctx).job.get_job_info(fullname).model_dump(exclude_none=True)
+    return (await offload(client(ctx).job.get_job_info, fullname)).model_dump(exclude_none=True)
 
 
 @mcp.tool(tag='read')
@@ -95,7 +149,8 @@ async def get_multibranch_jobs(
     if class_pattern is None:
         class_pattern = '.*WorkflowMultiBranchProject$'
 
-    jobs = client(ctx).job.search_jobs(
+    jobs = await offload(
+        client(ctx).job.search_jobs,
         class_pattern=class_pattern,
         name_pattern=name_pattern,
         fullname_pattern=fullname_pattern,
@@ -105,44 +160,35 @@ async def get_multibranch_jobs(
 
 
 @mcp.tool(tag='read')
-async def get_multibranch_branches(ctx: Context, fullname: str) -> list[dict]:
+async def get_multibranch_branches(ctx: Context, fullname: str, offset: int = 0, limit: int = 100) -> list[dict]:
     """
-    Get all branches for a specific multibranch pipeline job
+    Get a page of the branches of a multibranch pipeline job, with their color and last build
 
     Args:
         fullname: The fullname of the multibranch pipeline job
+        offset: The number of branches to skip
+        limit: The maximum number of branches to return
 
     Returns:
         List[dict]: A list of branch jobs within the multibranch pipeline
     """
-    job_info = client(ctx).job.get_job_info(fullname)
-
-    if not hasattr(job_info, 'jobs') or job_info.jobs is None:
-        return []
-
-    return [job.model_dump(exclude_none=True) for job in job_info.jobs]
+    branches = await offload(client(ctx).job.get_multibranch_branches, fullname, offset=offset, limit=limit)
+    return [branch.model_dump(exclude_none=True) for branch in branches]
 
 
-@mcp.tool(tag='read')
-async def scan_multibranch_pipeline(ctx: Context, fullname: str) -> str:
+@mcp.tool(tag='write')
+async def scan_multibranch_pipeline(ctx: Context, fullname: str, *, wait: bool = False, timeout: float = 300) -> dict:
     """
     Trigger a scan of a multibranch pipeline to discover new branches
 
     Args:
         fullname: The fullname of the multibranch pipeline job
+        wait: Wait for the scan to finish and return the branches it added and removed
+        timeout: The maximum number of seconds to wait for the scan
 
     Returns:
-        str: Status message indicating scan was triggered
+        dict: The status of the scan, `triggered`, `finished` or `timeout`, and when waited for,
+            the added and removed branches, the number of branches and the end of the indexing log
     """
-    jenkins = client(ctx)._jenkins
-
-    # The API endpoint for scanning a multibranch pipeline
-    scan_url = f'{jenkins.server}/job/{fullname.replace("/", "/job/")}/build?delay=0sec'
-
-    # Use the jenkins_request method to perform the POST request
-    response = jenkins.jenkins_request(requests_session=jenkins.requests, url=scan_url, method='POST')
-
-    if response.status_code < 400:
-        return f'Successfully triggered scan for multibranch pipeline: {fullname}'
-    else:
-        return f'Failed to trigger scan. Status code: {response.status_code}'
+    scan = await offload(client(ctx).job.scan_multibranch_pipeline, fullname, wait=wait, timeout=min(timeout, 1800))
+    return scan.model_dump(exclude_none=True)
@@ -0,0 +1,26 @@
+from mcp.server.fastmcp import Context
+
+from mcp_jenkins.server import client, mcp, offload
+
+
+@mcp.tool(tag='read')
+async def get_test_failures(
+    ctx: Context, fullname: str, build_number: int | None = None, limit: int = 100, max_trace_chars: int = 1000
+) -> dict | None:
+    """
+    Get the failed test cases of a build grouped by suite, without downloading the whole test report
+
+    Args:
+        fullname: The fullname of the job
+        build_number: The number of the build, if None, get the last build
+        limit: The maximum number of failed cases to return, at most 1000
+        max_trace_chars: The maximum length of each stack trace, at most 4000
+
+    Returns:
+        dict | None: failCount, passCount, skipCount, the failed cases grouped by suite and the number
+            of failures left out by the limit, None if the build has no test report
+    """
+    if build_number is None:
+        build_number = (await offload(client(ctx).job.get_job_info, fullname)).lastBuild.number
+    report = await offload(client(ctx).test_report.get_test_failures, fullname, build_number, limit, max_trace_chars)
+    return report.model_dump(exclude_none=True) if report is not None else None
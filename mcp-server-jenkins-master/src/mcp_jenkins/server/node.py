@@ -1,20 +1,51 @@
 from mcp.server.fastmcp import Context
 
-from mcp_jenkins.server import client, mcp
+from mcp_jenkins.server import client, dump_snapshot, mcp, offload
 
 
 @mcp.tool(tag='read')
-async def get_all_nodes(ctx: Context) -> list[dict]:
+async def get_all_nodes(ctx: Context, max_age: float | None = None) -> list[dict]:
     """
     Get all nodes from Jenkins
 
+    Args:
+        max_age: The maximum age in seconds of the answer, 0 to fetch from Jenkins.
+            Defaults to what the server's background poller keeps fresh
+
     Returns:
-        list[dict]: A list of all nodes
+        list[dict]: A list of all nodes, each with a `snapshot_age` in seconds when the background poller is on
     """
-    return [node.model_dump(exclude_none=True) for node in client(ctx).node.get_all_nodes()]
+    return dump_snapshot(*await offload(client(ctx).node.get_all_nodes_snapshot, max_age))
 
 
 @mcp.tool(tag='read')
+async def find_nodes_for_label(ctx: Context, expression: str, max_age: float | None = None) -> dict:
+    """
+    Find the nodes that can run a label expression and their free executors
+
+    Args:
+        expression: A Jenkins label expression using `&&`, `||`, `!` and parentheses, e.g. `linux && !arm64`
+        max_age: The maximum age in seconds of the node list, 0 to fetch from Jenkins
+
+    Returns:
+        dict: The matching `nodes` with their executors, `freeExecutors`, the idle executors of the
+            online matching nodes, and `snapshot_age`
+    """
+    nodes, age = await offload(client(ctx).node.find_nodes_for_label, expression, max_age)
+    return {
+        'nodes': [
+            node.model_dump(
+                exclude_none=True,
+                include={'name', 'offline', 'temporarilyOffline', 'numExecutors', 'busyExecutors', 'idleExecutors'},
+            )
+            for node in nodes
+        ],
+        'freeExecutors': sum(node.idleExecutors or 0 for node in nodes if not node.offline),
+        'snapshot_age': round(age, 3),
+    }
+
+
+@mcp.tool(tag='read', memoise=True)
 async def get_node_config(ctx: Context, name: str) -> str:
     """
     Get node config from Jenkins
@@ -25,4 +56,4 @@ async def get_node_config(ctx: Context, name: str) -> str:
     Returns:
         str: The config of the node
     """
-    return client(ctx).node.get_node_config(name)
+    return await offload(client(ctx).node.get_node_config, name)
@@ -1,17 +1,40 @@
 from mcp.server.fastmcp import Context
 
-from mcp_jenkins.server import client, mcp
+from mcp_jenkins.server import client, dump_snapshot, mcp, offload
 
 
 @mcp.tool(tag='read')
-async def get_all_queue_items(ctx: Context) -> list[dict]:
+async def get_all_queue_items(ctx: Context, max_age: float | None = None) -> list[dict]:
     """
     Get all items in Jenkins queue
 
+    Args:
+        max_age: The maximum age in seconds of the answer, 0 to fetch from Jenkins.
+            Defaults to what the server's background poller keeps fresh
+
+    Returns:
+        list[dict]: A list of all items in the Jenkins queue, each with a `snapshot_age` in seconds
+            when the background poller is on
+    """
+    return dump_snapshot(*await offload(client(ctx).queue_item.get_all_queue_items_snapshot, max_age))
+
+
+@mcp.tool(tag='read')
+async def get_queue_changes(ctx: Context, since: str | None = None, max_age: float | None = None) -> dict:
+    """
+    Get the items added to, removed from or changed in the Jenkins queue since a previous call
+
+    Args:
+        since: The `cursor` returned by the previous call, None to get the whole queue as added
+        max_age: The maximum age in seconds of the queue snapshot, 0 to fetch from Jenkins.
+            Defaults to what the server's background poller keeps fresh
+
     Returns:
-        list[dict]: A list of all items in the Jenkins queue
+        dict: The `cursor` to pass next, the `added` and `changed` items, the `removed` ids and the
+            `snapshot_age`. `reset` is true when the cursor is no longer known and the whole queue is returned
     """
-    return [item.model_dump(exclude_none=True) for item in client(ctx).queue_item.get_all_queue_items()]
+    changes, age = await offload(client(ctx).queue_item.get_queue_changes, since, max_age)
+    return {**changes.model_dump(exclude_none=True), 'snapshot_age': round(age, 3)}
 
 
 @mcp.tool(tag='read')
@@ -25,7 +48,7 @@ async def get_queue_item(ctx: Context, id_: int) -> dict:
     Returns:
         dict: The queue item
     """
-    return client(ctx).queue_item.get_queue_item(id_).model_dump(exclude_none=True)
+    return (await offload(client(ctx).queue_item.get_queue_item, id_)).model_dump(exclude_none=True)
 
 
 @mcp.tool(tag='write')
@@ -36,4 +59,4 @@ async def cancel_queue_item(ctx: Context, id_: int) -> None:
     Args:
         id_: The id of the queue item
     """
-    client(ctx).queue_item.cancel_queue_item(id_)
+    await offload(client(ctx).queue_item.cancel_queue_item, id_)
@@ -0,0 +1,24 @@
+from mcp.server.fastmcp import Context
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from mcp_jenkins.metrics import REGISTRY
+from mcp_jenkins.server import mcp
+
+
+@mcp.custom_route('/metrics', methods=['GET'])
+async def metrics(request: Request) -> PlainTextResponse:
+    """Expose the server metrics in the Prometheus text format"""
+    return PlainTextResponse(REGISTRY.render(), media_type='text/plain; version=0.0.4')
+
+
+@mcp.tool(tag='read')
+async def get_server_stats(ctx: Context) -> dict:
+    """
+    Get the server's own metrics: per-tool latency, errors and response sizes,
+    and per-endpoint request counts, bytes and latency toward Jenkins
+
+    Returns:
+        dict: The metrics keyed by name, latencies in seconds and sizes in bytes
+    """
+    return REGISTRY.snapshot()
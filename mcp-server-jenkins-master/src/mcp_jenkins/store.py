@@ -0,0 +1,300 @@
+import fnmatch
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from mcp_jenkins.metrics import REGISTRY
+
+STORE_REQUESTS = REGISTRY.counter(
+    'mcp_jenkins_store_requests_total', 'Cache lookups in the shared store', ['namespace', 'result']
+)
+
+
+class Store:
+    """
+    In-process key-value cache for Jenkins state, values must be JSON serializable.
+
+    Entries past their TTL are not returned by `get` but are kept, so callers can still
+    fall back to them with `allow_stale=True`. The least recently used entries are evicted
+    once the serialized values exceed `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[tuple[str, str], tuple[str, float, float | None]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _read(self, namespace: str, key: str) -> tuple[str, float, float | None] | None:
+        with self._lock:
+            entry = self._data.get((namespace, key))
+            if entry is not None:
+                self._data.move_to_end((namespace, key))
+            return entry
+
+    def _write(self, namespace: str, key: str, value: str, stored_at: float, expires_at: float | None) -> None:
+        with self._lock:
+            previous = self._data.pop((namespace, key), None)
+            if previous is not None:
+                self._size -= len(previous[0])
+            self._data[(namespace, key)] = (value, stored_at, expires_at)
+            self._size += len(value)
+            while self._size > self.max_bytes and len(self._data) > 1:
+                _, evicted = self._data.popitem(last=False)
+                self._size -= len(evicted[0])
+
+    def _remove(self, namespace: str, key: str | None) -> None:
+        with self._lock:
+            items = [(namespace, key)] if key is not None else [item for item in self._data if item[0] == namespace]
+            self._pop(items)
+
+    def _remove_scoped(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._pop([item for item in self._data if item[0] == namespace and _in_any_scope(item[1], key)])
+
+    def _remove_matching(self, namespace: str, pattern: str) -> None:
+        with self._lock:
+            self._pop([item for item in self._data if item[0] == namespace and _matches_in_any_scope(item[1], pattern)])
+
+    def _expire_scoped(self, namespace: str, key: str, now: float) -> None:
+        with self._lock:
+            for item, (value, stored_at, expires_at) in self._data.items():
+                if item[0] == namespace and _in_any_scope(item[1], key) and (expires_at is None or expires_at > now):
+                    self._data[item] = (value, stored_at, now)
+
+    def _pop(self, items: list[tuple[str, str]]) -> None:
+        for item in items:
+            entry = self._data.pop(item, None)
+            if entry is not None:
+                self._size -= len(entry[0])
+
+    def get_entry(self, namespace: str, key: str, *, allow_stale: bool = False) -> tuple[Any, float] | None:
+        """
+        Get a cached value together with its age
+
+        Args:
+            namespace: The kind of value, e.g. `build_info`
+            key: The key within the namespace
+            allow_stale: Whether to return the value even if its TTL has passed
+
+        Returns:
+            tuple[Any, float] | None: The value and its age in seconds, None if missing or expired
+        """
+        entry = self._read(namespace, key)
+        now = time.time()
+        if entry is None or (not allow_stale and entry[2] is not None and entry[2] <= now):
+            STORE_REQUESTS.inc(namespace=namespace, result='miss')
+            return None
+        STORE_REQUESTS.inc(namespace=namespace, result='hit')
+        return json.loads(entry[0]), now - entry[1]
+
+    def get(self, namespace: str, key: str, *, allow_stale: bool = False) -> Any | None:
+        entry = self.get_entry(namespace, key, allow_stale=allow_stale)
+        return entry[0] if entry is not None else None
+
+    def timestamps(self, namespace: str, key: str) -> tuple[float, float | None] | None:
+        """
+        When a value was stored and when it expires, fresh or stale, without reading it, so a decoded copy
+        can be checked cheaply
+        """
+        entry = self._read(namespace, key)
+        return (entry[1], entry[2]) if entry is not None else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
+        """
+        Cache a value
+
+        Args:
+            namespace: The kind of value, e.g. `build_info`
+            key: The key within the namespace
+            value: A JSON serializable value, None is not cached
+            ttl: Seconds the value stays fresh, None for values that never change such as finished builds
+        """
+        if value is None:
+            return
+        now = time.time()
+        self._write(namespace, key, json.dumps(value), now, now + ttl if ttl is not None else None)
+
+    def delete(self, namespace: str, key: str | None = None) -> None:
+        """Delete one key, or the whole namespace when key is None"""
+        self._remove(namespace, key)
+
+    def purge(self, namespace: str, key: str) -> None:
+        """Delete a key unscoped and in every `ScopedStore` scope, for changes seen by every user"""
+        self._remove_scoped(namespace, key)
+
+    def purge_matching(self, namespace: str, pattern: str) -> None:
+        """
+        Delete the keys matching a glob pattern unscoped and in every `ScopedStore` scope, for the entries
+        derived from one build such as `app#12#*`. Escape the literal parts with `glob_escape`.
+        """
+        self._remove_matching(namespace, pattern)
+
+    def expire(self, namespace: str, key: str) -> None:
+        """Expire a key unscoped and in every `ScopedStore` scope, keeping its value to serve while it is refreshed"""
+        self._expire_scoped(namespace, key, time.time())
+
+
+def _in_any_scope(stored: str, key: str) -> bool:
+    return stored == key or stored.endswith(f'|{key}')
+
+
+def _matches_in_any_scope(stored: str, pattern: str) -> bool:
+    return fnmatch.fnmatchcase(stored, pattern) or fnmatch.fnmatchcase(stored, f'*|{pattern}')
+
+
+def glob_escape(text: str) -> str:
+    """Escape the wildcards of a literal part of a `purge_matching` pattern, understood by fnmatch and SQLite"""
+    return ''.join(f'[{char}]' if char in '*?[' else char for char in text)
+
+
+class SQLiteStore(Store):
+    """
+    Store backed by a SQLite file, shared by every worker process pointing at the same path.
+
+    WAL mode lets readers in other processes proceed while one process writes. Every
+    `_PRUNE_EVERY` writes the oldest entries are deleted while the file holds more than `max_bytes`.
+    """
+
+    _PRUNE_EVERY = 500
+
+    def __init__(self, path: str, max_bytes: int = 1024 * 1024 * 1024) -> None:
+        super().__init__(max_bytes)
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS store ('
+            'namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, '
+            'stored_at REAL NOT NULL, expires_at REAL, PRIMARY KEY (namespace, key))'
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _read(self, namespace: str, key: str) -> tuple[str, float, float | None] | None:
+        return (
+            self._connection()
+            .execute('SELECT value, stored_at, expires_at FROM store WHERE namespace = ? AND key = ?', (namespace, key))
+            .fetchone()
+        )
+
+    def timestamps(self, namespace: str, key: str) -> tuple[float, float | None] | None:
+        row = (
+            self._connection()
+            .execute('SELECT stored_at, expires_at FROM store WHERE namespace = ? AND key = ?', (namespace, key))
+            .fetchone()
+        )
+        return tuple(row) if row is not None else None
+
+    def _write(self, namespace: str, key: str, value: str, stored_at: float, expires_at: float | None) -> None:
+        self._connection().execute(
+            'INSERT OR REPLACE INTO store (namespace, key, value, stored_at, expires_at) VALUES (?, ?, ?, ?, ?)',
+            (namespace, key, value, stored_at, expires_at),
+        )
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self._PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def prune(self) -> None:
+        """Delete the oldest entries until the stored values fit in `max_bytes`"""
+        connection = self._connection()
+        size = connection.execute('SELECT COALESCE(SUM(LENGTH(value)), 0) FROM store').fetchone()[0]
+        if size <= self.max_bytes:
+            return
+        excess = size - self.max_bytes
+        rows = connection.execute('SELECT rowid, LENGTH(value) FROM store ORDER BY stored_at').fetchall()
+        doomed = []
+        for rowid, length in rows:
+            if excess <= 0:
+                break
+            doomed.append((rowid,))
+            excess -= length
+        connection.executemany('DELETE FROM store WHERE rowid = ?', doomed)
+
+    def _remove(self, namespace: str, key: str | None) -> None:
+        if key is not None:
+            self._connection().execute('DELETE FROM store WHERE namespace = ? AND key = ?', (namespace, key))
+        else:
+            self._connection().execute('DELETE FROM store WHERE namespace = ?', (namespace,))
+
+    def _remove_scoped(self, namespace: str, key: str) -> None:
+        suffix = f'|{key}'
+        self._connection().execute(
+            'DELETE FROM store WHERE namespace = ? AND (key = ? OR substr(key, ?) = ?)',
+            (namespace, key, -len(suffix), suffix),
+        )
+
+    def _remove_matching(self, namespace: str, pattern: str) -> None:
+        self._connection().execute(
+            'DELETE FROM store WHERE namespace = ? AND (key GLOB ? OR key GLOB ?)', (namespace, pattern, f'*|{pattern}')
+        )
+
+    def _expire_scoped(self, namespace: str, key: str, now: float) -> None:
+        suffix = f'|{key}'
+        self._connection().execute(
+            'UPDATE store SET expires_at = ? WHERE namespace = ? AND (key = ? OR substr(key, ?) = ?) '
+            'AND (expires_at IS NULL OR expires_at > ?)',
+            (now, namespace, key, -len(suffix), suffix, now),
+        )
+
+
+class ScopedStore(Store):
+    """
+    View of a store holding the entries of one Jenkins identity, so what Jenkins showed one user is never
+    served to another. The scope prefixes the keys rather than the namespaces, which keeps the metric labels
+    bounded, and deleting a whole namespace deletes it for every scope.
+    """
+
+    def __init__(self, store: Store, scope: str) -> None:
+        self._store = store
+        self.scope = scope
+
+    def get_entry(self, namespace: str, key: str, *, allow_stale: bool = False) -> tuple[Any, float] | None:
+        return self._store.get_entry(namespace, f'{self.scope}|{key}', allow_stale=allow_stale)
+
+    def timestamps(self, namespace: str, key: str) -> tuple[float, float | None] | None:
+        return self._store.timestamps(namespace, f'{self.scope}|{key}')
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
+        self._store.set(namespace, f'{self.scope}|{key}', value, ttl)
+
+    def delete(self, namespace: str, key: str | None = None) -> None:
+        self._store.delete(namespace, f'{self.scope}|{key}' if key is not None else None)
+
+    def purge(self, namespace: str, key: str) -> None:
+        self._store.purge(namespace, key)
+
+    def purge_matching(self, namespace: str, pattern: str) -> None:
+        self._store.purge_matching(namespace, pattern)
+
+    def expire(self, namespace: str, key: str) -> None:
+        self._store.expire(namespace, key)
+
+
+def default_cache_dir(jenkins_url: str, username: str) -> str:
+    """The cache directory of one controller and user under the user's cache directory, kept across restarts"""
+    base = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    digest = hashlib.blake2b(f'{jenkins_url.rstrip("/")}\0{username}'.encode(), digest_size=8).hexdigest()
+    return os.path.join(base, 'mcp-jenkins', digest)
+
+
+def create_store(cache_dir: str | None = None) -> Store:
+    """Create the on-disk store shared by workers when `cache_dir` is set, an in-process one otherwise"""
+    if cache_dir:
+        return SQLiteStore(os.path.join(cache_dir, 'mcp-jenkins.sqlite3'))
+    return Store()
@@ -0,0 +1,98 @@
+import asyncio
+import inspect
+import json
+
+from mcp_jenkins.budget import budget_scope, fit, response_budget
+
+JOBS = [
+    {
+        '_class': 'com.cloudbees.hudson.plugins.folder.Folder',
+        'name': f'folder-{i}',
+        'jobs': [{'name': f'job-{j}', 'color': 'blue'} for j in range(20)],
+    }
+    for i in range(20)
+]
+
+
+def _size(value):
+    return len(json.dumps(value))
+
+
+def test_fit_within_budget():
+    assert fit(JOBS, None) is JOBS
+    assert fit(JOBS, 1 << 20) is JOBS
+    assert fit('short', 1024) == 'short'
+
+
+def test_fit_drops_builds():
+    job = {'name': 'app', 'builds': [{'number': i, 'url': f'http://jenkins/job/app/{i}/'} for i in range(100)]}
+
+    assert fit(job, 512) == {'name': 'app'}
+
+
+def test_fit_collapses_folders():
+    result = fit(JOBS, 2048)
+
+    assert result[0] == {'_class': 'com.cloudbees.hudson.plugins.folder.Folder', 'name': 'folder-0', 'jobCount': 20}
+    assert len(result) == 20
+
+
+def test_fit_caps_lists():
+    jobs = [{'name': f'job-{i}', 'color': 'blue'} for i in range(1000)]
+
+    result = fit(jobs, 1024)
+
+    assert _size(result) <= 1024
+    assert result[-1] == {'truncated': 1000 - len(result) + 1, 'total': 1000}
+    assert result[0] == jobs[0]
+
+
+def test_fit_caps_strings():
+    result = fit({'description': 'x' * 5000}, 300)
+
+    assert _size(result) <= 300
+    assert result['description'].endswith('...')
+
+
+def test_fit_text():
+    result = fit('line\n' * 1000, 300)
+
+    assert len(result.encode()) <= 300
+    assert result.endswith('... truncated, 5000 bytes in total')
+
+
+def test_budget_scope():
+    assert response_budget() is None
+    with budget_scope(1000):
+        assert response_budget() == 1000
+    assert response_budget() is None
+
+
+def test_instrument_read_tool_budget(monkeypatch):
+    monkeypatch.setenv('tool_alias', '[fn]')
+    from mcp_jenkins.server import instrument
+
+    seen = []
+
+    async def get_all_jobs(fullname: str) -> list[dict]:
+        seen.append(response_budget())
+        return [{'name': f'job-{i}'} for i in range(100)]
+
+    tool = instrument('get_all_jobs', get_all_jobs)
+
+    assert list(inspect.signature(tool).parameters) == ['fullname', 'max_response_bytes']
+    result = asyncio.run(tool(fullname='a', max_response_bytes=400))
+    assert _size(result) <= 400
+    assert result[-1]['total'] == 100
+    assert len(asyncio.run(tool(fullname='a'))) == 100
+    assert seen == [400, None]
+
+
+def test_instrument_write_tool_has_no_budget(monkeypatch):
+    monkeypatch.setenv('tool_alias', '[fn]')
+    from mcp_jenkins.server import instrument
+
+    async def stop_build(fullname: str) -> None:
+        return None
+
+    assert list(inspect.signature(instrument('stop_build', stop_build, 'write')).parameters) == ['fullname']
@@ -0,0 +1,182 @@
+import hashlib
+from types import SimpleNamespace
+
+import pytest
+from starlette.testclient import TestClient
+
+from mcp_jenkins.events import Event, apply_event, parse_event
+from mcp_jenkins.memo import recall, remember
+from mcp_jenkins.store import ScopedStore, Store
+
+
+def test_parse_notification_plugin_event():
+    payload = {
+        'name': 'app',
+        'url': 'job/folder/job/my%20app/',
+        'build': {'number': 12, 'queue_id': 34, 'phase': 'COMPLETED', 'status': 'SUCCESS'},
+    }
+
+    assert parse_event(payload) == Event('run.completed', 'folder/my app', 12, 34)
+    assert parse_event({'name': 'app', 'build': {'phase': 'STARTED'}}) == Event('run.started', 'app')
+
+
+def test_parse_generic_event():
+    assert parse_event({'event': 'job.updated', 'fullname': '/folder/app/'}) == Event('job.updated', 'folder/app')
+    assert parse_event({'event': 'run.queued', 'fullname': 'app', 'queue_id': '7'}).queue_id == 7
+
+
+@pytest.mark.parametrize(
+    'payload',
+    [
+        [],
+        {'event': 'job.moved', 'fullname': 'app'},
+        {'event': 'job.created'},
+        {'name': 'app', 'build': {'phase': 'UNKNOWN'}},
+        {'event': 'run.completed', 'fullname': 'app', 'number': 'last'},
+    ],
+)
+def test_parse_invalid_event(payload):
+    with pytest.raises(ValueError):
+        parse_event(payload)
+
+
+def test_apply_event_purges_every_scope():
+    store = Store()
+    alice = ScopedStore(store, 'alice')
+    for target in (store, alice):
+        target.set('jobs', 'all', [{'fullname': 'app', 'color': 'blue'}])
+        target.set('snapshot', 'running_builds', [])
+        target.set('snapshot', 'nodes', [])
+        target.set('build_info', 'app#12', {'number': 12, 'building': False})
+        target.set('build_info', 'app#11', {'number': 11, 'building': False})
+        target.set('test_failures', 'app#12', {'failed': 1})
+    remember(alice, 'get_job_info', {'fullname': 'app'}, {'name': 'app'}, 0, 60)
+
+    purged, expired = apply_event(store, Event('run.finalized', 'app', 12))
+
+    assert purged == [
+        'snapshot:running_builds',
+        'build_info:app#12',
+        'build_logs:app#12',
+        'artifacts:app#12',
+        'test_failures:app#12',
+        'build_errors:app#12#*',
+        'log_diff:app#12#*',
+        'log_diff:app#*#12:*',
+        'artifact_uncached:app#12/*',
+    ]
+    assert expired == []
+    for target in (store, alice):
+        assert target.get('jobs', 'all') is not None
+        assert target.get('snapshot', 'running_builds') is None
+        assert target.get('snapshot', 'nodes') == []
+        assert target.get('build_info', 'app#12') is None
+        assert target.get('build_info', 'app#11') is not None
+        assert target.get('test_failures', 'app#12') is None
+    assert recall(alice, store, 'get_job_info', {'fullname': 'app'}) == (False, None)
+
+
+def test_apply_event_purges_results_derived_from_the_run(tmp_path):
+    store = Store()
+    alice = ScopedStore(store, 'alice')
+    for target in (store, alice):
+        target.set('build_errors', 'folder/app#12#digest#2', {'lines': 1, 'errors': []})
+        target.set('build_errors', 'folder/app#120#digest#2', {'lines': 1, 'errors': []})
+        target.set('log_diff', 'folder/app#11#12:3:1000', {'diff': []})
+        target.set('log_diff', 'folder/app#12#13:3:1000', {'diff': []})
+        target.set('log_diff', 'folder/app#11#13:3:1000', {'diff': []})
+        target.set('artifact_uncached', 'folder/app#12/big.tar', value=True)
+        target.set('artifact_uncached', 'folder/app#1/big.tar', value=True)
+    artifacts = tmp_path / 'artifacts'
+    for root in (artifacts, artifacts / 'alice'):
+        for number in (12, 13):
+            build = root / hashlib.sha256(f'folder/app#{number}'.encode()).hexdigest()
+            build.mkdir(parents=True)
+            (build / 'file').write_bytes(b'content')
+
+    purged, _ = apply_event(store, Event('run.deleted', 'folder/app', 12), str(artifacts))
+
+    assert 'artifact_files:folder/app#12' in purged
+    for target in (store, alice):
+        assert target.get('build_errors', 'folder/app#12#digest#2') is None
+        assert target.get('build_errors', 'folder/app#120#digest#2') is not None
+        assert target.get('log_diff', 'folder/app#11#12:3:1000') is None
+        assert target.get('log_diff', 'folder/app#12#13:3:1000') is None
+        assert target.get('log_diff', 'folder/app#11#13:3:1000') is not None
+        assert target.get('artifact_uncached', 'folder/app#12/big.tar') is None
+        assert target.get('artifact_uncached', 'folder/app#1/big.tar') is True
+    assert sorted(path.parent.parent.name for path in artifacts.rglob('file')) == ['alice', 'artifacts']
+
+
+@pytest.fixture
+def events(monkeypatch):
+    monkeypatch.setenv('tool_alias', '[fn]')
+    monkeypatch.setenv('events_token', 'secret')
+    monkeypatch.delenv('cache_dir', raising=False)
+    from mcp_jenkins.server import _context, mcp
+
+    store = Store()
+    monkeypatch.setattr(_context, '_client', SimpleNamespace(store=store))
+    client = TestClient(mcp.sse_app(), headers={'X-Jenkins-Events-Token': 'secret'})
+    return SimpleNamespace(store=store, client=client)
+
+
+def test_events_endpoint(events):
+    events.store.set('jobs', 'all', [])
+    events.store.set('config', 'job:folder/app', {'digest': 'abc'})
+
+    response = events.client.post('/jenkins/events', json={'event': 'job.updated', 'fullname': 'folder/app'})
+
+    assert response.status_code == 202
+    assert response.json() == {
+        'event': 'job.updated',
+        'fullname': 'folder/app',
+        'purged': ['config:job:folder/app'],
+        'expired': ['jobs:all', 'jobs:index'],
+    }
+    assert events.store.get('jobs', 'all') is None
+    assert events.store.get('jobs', 'all', allow_stale=True) == []
+    assert events.store.get('config', 'job:folder/app') is None
+
+
+@pytest.mark.parametrize(
+    ('event', 'purged', 'expired'),
+    [
+        (Event('run.started', 'app', 12), ['snapshot:queue', 'snapshot:running_builds'], ['jobs:all']),
+        (Event('job.renamed', 'app'), ['jobs:all', 'jobs:index', 'config:job:app', 'build_history:app'], []),
+    ],
+)
+def test_apply_event_drops_inventory_only_when_jobs_change(event, purged, expired):
+    store = Store()
+    store.set('jobs', 'all', [{'fullname': 'app', 'color': 'blue'}])
+
+    assert apply_event(store, event) == (purged, expired)
+    assert (store.get('jobs', 'all', allow_stale=True) is None) == ('jobs:all' in purged)
+
+
+def test_events_endpoint_rejects_invalid_events(events):
+    assert events.client.post('/jenkins/events', content=b'not json').status_code == 400
+    assert events.client.post('/jenkins/events', json={'event': 'job.moved', 'fullname': 'a'}).status_code == 400
+
+
+def test_events_endpoint_token(events, monkeypatch):
+    event = {'event': 'run.queued', 'fullname': 'app'}
+
+    def post(url='/jenkins/events', token=None):
+        headers = {'X-Jenkins-Events-Token': token} if token else {}
+        return TestClient(events.client.app).post(url, json=event, headers=headers).status_code
+
+    assert post() == 401
+    assert post(token='wrong') == 401
+    assert post(token='secret') == 202
+    assert post('/jenkins/events?token=secret') == 202
+
+
+def test_events_endpoint_refuses_notifications_without_token(events, monkeypatch):
+    monkeypatch.delenv('events_token')
+    events.store.set('jobs', 'all', [])
+
+    response = events.client.post('/jenkins/events', json={'event': 'job.deleted', 'fullname': 'app'})
+
+    assert response.status_code == 403
+    assert events.store.get('jobs', 'all') == []
@@ -0,0 +1,134 @@
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from mcp_jenkins.jenkins._artifact import JenkinsArtifact
+from mcp_jenkins.jenkins._build import JenkinsBuild
+from mcp_jenkins.models.artifact import Artifact, ArtifactMatch
+
+CONTENT = b''.join(f'line {i} {"ERROR" if i % 10 == 0 else "ok"}\n'.encode() for i in range(1, 101))
+
+
+def _response(content, status_code=200, headers=None):
+    response = MagicMock(status_code=status_code, headers=headers or {'Content-Length': str(len(content))})
+    response.iter_content.side_effect = lambda size: (content[i : i + 5] for i in range(0, len(content), 5))
+    return response
+
+
+def _ranged(path, headers=None):
+    """Answer like Jenkins, honouring the Range header"""
+    start = int(headers['Range'].removeprefix('bytes=').rstrip('-')) if headers else 0
+    if start >= len(CONTENT):
+        error = requests.HTTPError('416 Range Not Satisfiable')
+        error.response = MagicMock(status_code=416)
+        raise error
+    if not headers:
+        return _response(CONTENT)
+    return _response(CONTENT[start:], 206, {'Content-Range': f'bytes {start}-{len(CONTENT) - 1}/{len(CONTENT)}'})
+
+
+@pytest.fixture()
+def jenkins_artifact(mock_jenkins):
+    mock_jenkins.get_build_info.return_value = {'number': 12, 'building': False}
+    mock_jenkins.open_stream.side_effect = _ranged
+    yield JenkinsArtifact(mock_jenkins, JenkinsBuild(mock_jenkins))
+
+
+def test_list_build_artifacts(jenkins_artifact, mock_jenkins):
+    mock_jenkins.get_tree.return_value = {
+        '_class': 'hudson.model.FreeStyleBuild',
+        'artifacts': [{'fileName': 'app.log', 'relativePath': 'logs/app.log'}],
+    }
+
+    assert jenkins_artifact.list_build_artifacts('folder/app', 12) == [
+        Artifact(fileName='app.log', relativePath='logs/app.log')
+    ]
+    mock_jenkins.get_tree.assert_called_once_with('job/folder/job/app/12', 'artifacts[fileName,relativePath]')
+
+    # Finished builds are cached
+    jenkins_artifact.list_build_artifacts('folder/app', 12)
+    mock_jenkins.get_tree.assert_called_once()
+
+
+def test_read_build_artifact_range(jenkins_artifact, mock_jenkins):
+    content = jenkins_artifact.read_build_artifact('folder/app', 12, 'logs/app.log', offset=9, max_bytes=20)
+
+    assert content.content == CONTENT[9:29].decode()
+    assert content.size == len(CONTENT)
+    assert content.eof is False
+    assert content.nextOffset == 29
+    mock_jenkins.open_stream.assert_called_once_with(
+        'job/folder/job/app/12/artifact/logs/app.log', {'Range': 'bytes=9-'}
+    )
+
+
+@pytest.mark.parametrize('path', ['../../../script', 'logs/../../config.xml', '/..', 'logs\\..\\..\\x'])
+def test_read_build_artifact_rejects_parent_segments(jenkins_artifact, mock_jenkins, path):
+    with pytest.raises(ValueError, match='not allowed'):
+        jenkins_artifact.read_build_artifact('folder/app', 12, path)
+
+    mock_jenkins.open_stream.assert_not_called()
+    mock_jenkins.get_build_info.assert_not_called()
+
+
+def test_read_build_artifact_range_ignored(jenkins_artifact, mock_jenkins):
+    mock_jenkins.open_stream.side_effect = lambda path, headers=None: _response(CONTENT)
+
+    content = jenkins_artifact.read_build_artifact('folder/app', 12, 'app.log', offset=len(CONTENT) - 7)
+
+    assert content.content == CONTENT[-7:].decode()
+    assert content.eof is True
+    assert content.nextOffset is None
+
+
+def test_read_build_artifact_past_end(jenkins_artifact):
+    content = jenkins_artifact.read_build_artifact('folder/app', 12, 'app.log', offset=len(CONTENT) + 1)
+
+    assert content.content == ''
+    assert content.eof is True
+
+
+def test_read_build_artifact_search(jenkins_artifact):
+    content = jenkins_artifact.read_build_artifact('folder/app', 12, 'app.log', pattern=r'ERROR$')
+
+    assert len(content.matches) == 10
+    assert content.matches[0] == ArtifactMatch(line=10, offset=CONTENT.index(b'line 10 '), text='line 10 ERROR')
+    assert content.content is None
+    assert content.eof is True
+
+
+def test_read_build_artifact_search_limit(jenkins_artifact, monkeypatch):
+    monkeypatch.setattr('mcp_jenkins.jenkins._artifact.MAX_MATCHES', 2)
+
+    content = jenkins_artifact.read_build_artifact('folder/app', 12, 'app.log', pattern='ERROR')
+
+    assert [match.line for match in content.matches] == [10, 20]
+    assert content.nextOffset == CONTENT.index(b'line 21 ')
+
+
+def test_read_build_artifact_disk_cache(mock_jenkins, tmp_path):
+    mock_jenkins.get_build_info.return_value = {'number': 12, 'building': False}
+    mock_jenkins.open_stream.side_effect = _ranged
+    jenkins_artifact = JenkinsArtifact(mock_jenkins, JenkinsBuild(mock_jenkins), cache_dir=str(tmp_path))
+
+    first = jenkins_artifact.read_build_artifact('folder/app', 12, 'app.log', offset=5, max_bytes=10)
+    second = jenkins_artifact.read_build_artifact('folder/app', 12, 'app.log', pattern='line 100 ')
+
+    assert first.content == CONTENT[5:15].decode()
+    assert first.size == len(CONTENT)
+    assert [match.line for match in second.matches] == [100]
+    # Downloaded once, whole, then served from disk
+    mock_jenkins.open_stream.assert_called_once_with('job/folder/job/app/12/artifact/app.log')
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_read_build_artifact_running_build_not_cached(mock_jenkins, tmp_path):
+    mock_jenkins.get_build_info.return_value = {'number': 12, 'building': True}
+    mock_jenkins.open_stream.side_effect = _ranged
+    jenkins_artifact = JenkinsArtifact(mock_jenkins, JenkinsBuild(mock_jenkins), cache_dir=str(tmp_path))
+
+    jenkins_artifact.read_build_artifact('folder/app', 12, 'app.log', max_bytes=10)
+
+    assert list(tmp_path.iterdir()) == []
+    mock_jenkins.open_stream.assert_called_once_with('job/folder/job/app/12/artifact/app.log', {'Range': 'bytes=0-'})
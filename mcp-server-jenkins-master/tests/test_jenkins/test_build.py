@@ -1,24 +1,39 @@
+import re
+
 import pytest
+from jenkins import JenkinsException
 
-from mcp_jenkins.jenkins._build import JenkinsBuild
+from mcp_jenkins.jenkins._build import HISTORY_CACHED, RUNNING_BUILDS_TREE, JenkinsBuild
 from mcp_jenkins.models.build import Build
 
-RUNNING_BUILDS = [
-    {
-        'name': 'RUN_JOB_LIST',
-        'number': 2,
-        'url': 'http://example.com/job/RUN_JOB_LIST/job/job-one/2/',
-        'node': '(master)',
-        'executor': 4,
-    },
-    {
-        'name': 'weekly',
-        'number': 39,
-        'url': 'http://example.com/job/weekly/job/folder-one/job/job-two/39/',
-        'node': '001',
-        'executor': 0,
-    },
-]
+RUNNING_BUILDS = {
+    'computer': [
+        {
+            'displayName': 'Built-In Node',
+            'executors': [{'number': 0, 'currentExecutable': None}],
+            'oneOffExecutors': [
+                {
+                    'number': 4,
+                    'currentExecutable': {'number': 2, 'url': 'http://example.com/job/RUN_JOB_LIST/job/job-one/2/'},
+                }
+            ],
+        },
+        {
+            'displayName': '001',
+            'executors': [
+                {
+                    'number': 0,
+                    'currentExecutable': {
+                        'number': 39,
+                        'url': 'http://example.com/job/weekly/job/folder-one/job/job-two/39/',
+                    },
+                },
+                {'number': 1, 'currentExecutable': {'url': 'http://example.com/job/weekly/39/placeholder'}},
+            ],
+            'oneOffExecutors': [],
+        },
+    ]
+}
 
 BUILD_INFO = {
     '_class': 'org.jenkinsci.plugins.workflow.job.WorkflowRun',
@@ -53,7 +68,7 @@ BUILD_INFO = {
 
 @pytest.fixture()
 def jenkins_build(mock_jenkins):
-    mock_jenkins.get_running_builds.return_value = RUNNING_BUILDS
+    mock_jenkins.get_tree.return_value = RUNNING_BUILDS
     mock_jenkins.get_build_info.return_value = BUILD_INFO
     mock_jenkins.build_job.return_value = 1
     mock_jenkins.stop_build.return_value = None
@@ -89,9 +104,11 @@ def test_to_model(jenkins_build):
     )
 
 
-def test_get_running_builds(jenkins_build):
+def test_get_running_builds(jenkins_build, mock_jenkins):
     builds = jenkins_build.get_running_builds()
 
+    mock_jenkins.get_tree.assert_called_once_with('computer', RUNNING_BUILDS_TREE)
+
     assert len(builds) == 2
     assert builds[0] == Build(
         name='RUN_JOB_LIST',
@@ -165,13 +182,13 @@ def test_build_job(jenkins_build):
 def test_get_build_logs(jenkins_build):
     # Setup mock response
     expected_logs = 'Build started\nStep 1: Checkout\nBuild successful'
-    jenkins_build._jenkins.get_build_console_output.return_value = expected_logs
+    jenkins_build._jenkins.stream.side_effect = lambda path: iter([expected_logs])
 
     # Call the function
     logs = jenkins_build.get_build_logs(fullname='folder-one/job-two', number=110)
 
     # Verify the correct Jenkins API method was called with right parameters
-    jenkins_build._jenkins.get_build_console_output.assert_called_once_with('folder-one/job-two', 110)
+    jenkins_build._jenkins.stream.assert_called_once_with('job/folder-one/job/job-two/110/consoleText')
 
     # Verify the returned logs match the expected output
     assert logs == expected_logs
@@ -179,30 +196,30 @@ def test_get_build_logs(jenkins_build):
 
 def test_get_build_logs_empty(jenkins_build):
     # Test handling of empty logs
-    jenkins_build._jenkins.get_build_console_output.return_value = ''
+    jenkins_build._jenkins.stream.side_effect = lambda path: iter([''])
 
     logs = jenkins_build.get_build_logs(fullname='folder-one/job-two', number=110)
 
     assert logs == ''
-    jenkins_build._jenkins.get_build_console_output.assert_called_once_with('folder-one/job-two', 110)
+    jenkins_build._jenkins.stream.assert_called_once_with('job/folder-one/job/job-two/110/consoleText')
 
 
 def test_get_build_logs_unicode(jenkins_build):
     # Test handling of logs with unicode characters
     expected_logs = 'Build started\n🚀 Deploying\n✅ Success\n❌ Failed step\n'
-    jenkins_build._jenkins.get_build_console_output.return_value = expected_logs
+    jenkins_build._jenkins.stream.side_effect = lambda path: iter([expected_logs])
 
     logs = jenkins_build.get_build_logs(fullname='folder-one/job-two', number=110)
 
     assert logs == expected_logs
-    jenkins_build._jenkins.get_build_console_output.assert_called_once_with('folder-one/job-two', 110)
+    jenkins_build._jenkins.stream.assert_called_once_with('job/folder-one/job/job-two/110/consoleText')
 
 
 def test_get_build_logs_not_found(jenkins_build):
     # Test handling of non-existent build
     from jenkins import JenkinsException
 
-    jenkins_build._jenkins.get_build_console_output.side_effect = JenkinsException('Build not found')
+    jenkins_build._jenkins.stream.side_effect = JenkinsException('Build not found')
 
     with pytest.raises(JenkinsException, match='Build not found'):
         jenkins_build.get_build_logs(fullname='folder-one/job-two', number=999999)
@@ -210,3 +227,241 @@ def test_get_build_logs_not_found(jenkins_build):
 
 def test_stop_build(jenkins_build):
     assert jenkins_build.stop_build(fullname='folder-one/job-two', number=110) is None
+
+
+def test_get_build_info_caches_finished_build(jenkins_build):
+    jenkins_build.get_build_info(fullname='folder-one/job-two', number=110)
+    jenkins_build.get_build_info(fullname='folder-one/job-two', number=110)
+
+    jenkins_build._jenkins.get_build_info.assert_called_once_with('folder-one/job-two', 110)
+
+
+def test_get_build_info_does_not_cache_running_build(jenkins_build):
+    jenkins_build._jenkins.get_build_info.return_value = {**BUILD_INFO, 'building': True}
+
+    jenkins_build.get_build_info(fullname='folder-one/job-two', number=110)
+    jenkins_build.get_build_info(fullname='folder-one/job-two', number=110)
+
+    assert jenkins_build._jenkins.get_build_info.call_count == 2
+
+
+def test_get_builds_info(jenkins_build):
+    def get_build_info(fullname, number):
+        if fullname == 'missing':
+            msg = f'job[{fullname}] number[{number}] does not exist'
+            raise JenkinsException(msg)
+        return BUILD_INFO
+
+    jenkins_build._jenkins.get_build_info.side_effect = get_build_info
+
+    lookups = jenkins_build.get_builds_info(
+        [
+            ('folder-one/job-two', 110),
+            ('missing', 1),
+            ('folder-one/job-two', 'lastSuccessfulBuild'),
+            ('folder-one/job-two', '110'),
+            ('folder-one/job-two', 'latest'),
+        ]
+    )
+
+    assert [(lookup.fullname, lookup.number) for lookup in lookups] == [
+        ('folder-one/job-two', 110),
+        ('missing', 1),
+        ('folder-one/job-two', 'lastSuccessfulBuild'),
+        ('folder-one/job-two', 110),
+        ('folder-one/job-two', 'latest'),
+    ]
+    assert lookups[0].build.number == 110
+    assert lookups[0] == lookups[3]
+    assert lookups[1].error == 'job[missing] number[1] does not exist'
+    assert lookups[2].build.number == 110
+    assert 'Invalid build number' in lookups[4].error
+    # The duplicate is fetched once, and the permalink's build is then answered from the cache
+    assert jenkins_build._jenkins.get_build_info.call_count == 3
+    jenkins_build.get_build_info('folder-one/job-two', 110)
+    assert jenkins_build._jenkins.get_build_info.call_count == 3
+
+
+def test_get_builds_info_limit(jenkins_build):
+    with pytest.raises(ValueError):
+        jenkins_build.get_builds_info([('job', i) for i in range(501)])
+
+
+def test_get_build_logs_caches_finished_build(jenkins_build):
+    jenkins_build._jenkins.stream.side_effect = lambda path: iter(['Build successful'])
+
+    assert jenkins_build.get_build_logs(fullname='folder-one/job-two', number=110) == 'Build successful'
+    assert jenkins_build.get_build_logs(fullname='folder-one/job-two', number=110) == 'Build successful'
+
+    jenkins_build._jenkins.stream.assert_called_once_with('job/folder-one/job/job-two/110/consoleText')
+
+
+def test_get_build_logs_does_not_cache_permalink(jenkins_build):
+    jenkins_build._jenkins.stream.side_effect = lambda path: iter(['Build successful'])
+
+    jenkins_build.get_build_logs(fullname='folder-one/job-two', number='lastBuild')
+    jenkins_build.get_build_logs(fullname='folder-one/job-two', number='lastBuild')
+
+    assert jenkins_build._jenkins.stream.call_count == 2
+
+
+def _history(newest, building=()):
+    builds = [
+        {
+            'number': number,
+            'url': f'http://example.com/job/folder/job/app/{number}/',
+            'result': None if number in building else ('FAILURE' if number % 10 == 0 else 'SUCCESS'),
+            'timestamp': number * 1000,
+            'duration': 10,
+            'building': number in building,
+        }
+        for number in range(newest, 0, -1)
+    ]
+
+    def get_tree(path, tree):
+        assert path == 'job/folder/job/app'
+        start, end = (int(part) for part in re.search(r'\{(\d+),(\d+)\}', tree).groups())
+        return {'allBuilds': builds[start:end]}
+
+    return get_tree
+
+
+def test_get_build_history_pages(mock_jenkins):
+    mock_jenkins.get_tree.side_effect = _history(250, building={250})
+    jenkins_build = JenkinsBuild(mock_jenkins)
+
+    first, cursor = jenkins_build.get_build_history('folder/app', limit=60)
+    assert [build.number for build in first] == list(range(250, 190, -1))
+    assert first[0].building is True
+
+    second, cursor = jenkins_build.get_build_history('folder/app', limit=60, cursor=cursor)
+    assert [build.number for build in second] == list(range(190, 130, -1))
+    assert mock_jenkins.get_tree.call_count == 2
+
+    # Scrolling back over fetched builds is served from the cache
+    again, _ = jenkins_build.get_build_history('folder/app', limit=60, cursor='191:60')
+    assert again == second
+    assert mock_jenkins.get_tree.call_count == 2
+
+    rest, cursor = jenkins_build.get_build_history('folder/app', limit=200, cursor=cursor)
+    assert [build.number for build in rest] == list(range(130, 0, -1))
+    assert cursor is None
+
+
+def test_get_build_history_caches_newest_builds_only(mock_jenkins):
+    mock_jenkins.get_tree.side_effect = _history(1500)
+    jenkins_build = JenkinsBuild(mock_jenkins)
+
+    builds, cursor = [], None
+    while True:
+        page, cursor = jenkins_build.get_build_history('folder/app', limit=400, cursor=cursor)
+        builds += page
+        if cursor is None:
+            break
+
+    assert [build.number for build in builds] == list(range(1500, 0, -1))
+    history = jenkins_build._store.get('build_history', 'folder/app')
+    assert [row['number'] for row in history['rows']] == list(range(1500, 1500 - HISTORY_CACHED, -1))
+    assert history['end'] is False
+
+    # Paging past the cached builds still fetches them
+    calls = mock_jenkins.get_tree.call_count
+    page, _ = jenkins_build.get_build_history(
+        'folder/app', limit=10, cursor=f'{1500 - HISTORY_CACHED + 1}:{HISTORY_CACHED}'
+    )
+    assert [build.number for build in page] == list(range(1500 - HISTORY_CACHED, 1490 - HISTORY_CACHED, -1))
+    assert mock_jenkins.get_tree.call_count == calls + 1
+
+
+def test_get_build_history_filters(mock_jenkins):
+    mock_jenkins.get_tree.side_effect = _history(250, building={250})
+    jenkins_build = JenkinsBuild(mock_jenkins)
+
+    builds, cursor = jenkins_build.get_build_history('folder/app', result='failure,building', limit=3)
+    assert [build.number for build in builds] == [250, 240, 230]
+
+    builds, cursor = jenkins_build.get_build_history('folder/app', result='FAILURE', since=105_000, cursor=cursor)
+    assert [build.number for build in builds] == [220, 210, 200, 190, 180, 170, 160, 150, 140, 130, 120, 110]
+    assert cursor is None
+
+    builds, _ = jenkins_build.get_build_history('folder/app', since=10_000, until=12_000)
+    assert [build.number for build in builds] == [12, 11, 10]
+
+
+def test_get_build_history_invalid_cursor(jenkins_build):
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        jenkins_build.get_build_history('folder/app', cursor='next')
+
+
+def test_get_build_stats(mock_jenkins):
+    history = _history(250, building={250})
+    mock_jenkins.get_tree.side_effect = lambda path, tree: (
+        history('job/folder/job/app', tree) if path == 'job/folder/job/app' else {'allBuilds': []}
+    )
+    jenkins_build = JenkinsBuild(mock_jenkins)
+
+    stats = jenkins_build.get_build_stats(['folder/app', 'empty'], limit=20, sort_by='failureRate')
+
+    assert [job['fullname'] for job in stats] == ['folder/app', 'empty']
+    assert stats[0]['builds'] == 19
+    assert stats[0]['failureRate'] == round(1 / 19, 4)
+    assert stats[0]['lastTimestamp'] == 249_000
+
+
+def test_get_build_stats_only_fetches_newer_builds(mock_jenkins):
+    newest = [250]
+    ranges = []
+
+    def get_tree(path, tree):
+        ranges.append(re.search(r'\{.*\}', tree).group())
+        return _history(newest[0])(path, tree)
+
+    mock_jenkins.get_tree.side_effect = get_tree
+    jenkins_build = JenkinsBuild(mock_jenkins)
+    jenkins_build.get_build_stats(['folder/app'], limit=50)
+
+    newest[0] = 253
+    ranges.clear()
+    stats = jenkins_build.get_build_stats(['folder/app'], limit=50)
+
+    assert ranges == ['{0,10}']
+    assert (stats[0]['builds'], stats[0]['lastTimestamp']) == (50, 253_000)
+
+    newest[0] = 280
+    ranges.clear()
+    jenkins_build.get_build_stats(['folder/app'], limit=50)
+
+    assert ranges == ['{0,10}', '{0,40}']
+
+
+def test_get_build_stats_caps_jobs(mock_jenkins, monkeypatch):
+    monkeypatch.setattr('mcp_jenkins.jenkins._build.MAX_STATS_JOBS', 2)
+    mock_jenkins.get_tree.return_value = {'allBuilds': []}
+    jenkins_build = JenkinsBuild(mock_jenkins)
+
+    stats = jenkins_build.get_build_stats(['a', 'b', 'c', 'd'], top=1)
+
+    assert len(stats) == 2
+    assert stats[1] == {'truncated': 2, 'total': 4}
+    assert mock_jenkins.get_tree.call_count == 2
+
+
+def test_get_build_stats_rejects_unknown_sort_key_before_fetching(mock_jenkins):
+    jenkins_build = JenkinsBuild(mock_jenkins)
+
+    with pytest.raises(ValueError, match='Cannot rank by'):
+        jenkins_build.get_build_stats(['a', 'b'], sort_by='failurerate')
+
+    mock_jenkins.get_tree.assert_not_called()
+
+
+def test_get_build_logs_does_not_cache_large_log(jenkins_build, monkeypatch):
+    monkeypatch.setattr('mcp_jenkins.jenkins._build.MAX_CACHED_LOG_CHARS', 100)
+    lines = [f'line {i}' for i in range(200)]
+    jenkins_build._jenkins.stream.side_effect = lambda path: iter(line + '\n' for line in lines)
+
+    logs = jenkins_build.get_build_logs(fullname='folder-one/job-two', number=110)
+    jenkins_build.get_build_logs(fullname='folder-one/job-two', number=110)
+
+    assert logs == '\n'.join(lines[-100:])
+    assert jenkins_build._jenkins.stream.call_count == 2
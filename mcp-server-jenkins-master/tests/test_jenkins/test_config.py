@@ -0,0 +1,103 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mcp_jenkins.jenkins._config import CONFIG_HIT_RATIO, CONFIG_READS, ConfigCache, search_config
+from mcp_jenkins.store import Store
+
+
+@pytest.fixture()
+def configs(mock_jenkins):
+    mock_jenkins._get_job_folder.return_value = ('job/folder/', 'job')
+    mock_jenkins._build_url.side_effect = lambda format_spec, variables: format_spec % variables
+    yield ConfigCache(mock_jenkins, Store(), ttl=10)
+
+
+def _later():
+    return patch('mcp_jenkins.store.time.time', return_value=10**10)
+
+
+def test_get_serves_fresh_config_without_request(configs, mock_jenkins):
+    mock_jenkins.jenkins_request.return_value = MagicMock(status_code=200, text='<project/>', headers={})
+
+    assert configs.get('job', 'folder/job') == '<project/>'
+    assert configs.get('job', 'folder/job') == '<project/>'
+
+    mock_jenkins.jenkins_request.assert_called_once()
+    assert mock_jenkins.jenkins_request.call_args.args[0].url == 'job/folder/job/job/config.xml'
+
+
+def test_get_revalidates_with_validators(configs, mock_jenkins):
+    not_modified = CONFIG_READS.get(kind='node', result='not_modified')
+    mock_jenkins.jenkins_request.side_effect = [
+        MagicMock(status_code=200, text='<slave/>', headers={'ETag': '"v1"', 'Last-Modified': 'Mon, 19 Oct 2026'}),
+        MagicMock(status_code=304, text='', headers={}),
+    ]
+    configs.get('node', 'node-000')
+
+    with _later():
+        assert configs.get('node', 'node-000') == '<slave/>'
+
+    request = mock_jenkins.jenkins_request.call_args.args[0]
+    assert request.url == 'computer/node-000/config.xml'
+    assert request.headers == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 19 Oct 2026'}
+    assert CONFIG_READS.get(kind='node', result='not_modified') == not_modified + 1
+    assert 0 < CONFIG_HIT_RATIO.get(kind='node') <= 1
+
+
+def test_get_compares_digest_without_validators(configs, mock_jenkins):
+    unchanged = CONFIG_READS.get(kind='job', result='unchanged')
+    mock_jenkins.jenkins_request.side_effect = [
+        MagicMock(status_code=200, text='<project/>', headers={}),
+        MagicMock(status_code=200, text='<project/>', headers={}),
+        MagicMock(status_code=200, text='<project>v2</project>', headers={}),
+    ]
+    configs.get('job', 'folder/job')
+
+    with _later():
+        assert configs.get('job', 'folder/job') == '<project/>'
+        assert mock_jenkins.jenkins_request.call_args.args[0].headers == {}
+    with patch('mcp_jenkins.store.time.time', return_value=2 * 10**10):
+        assert configs.get('job', 'folder/job') == '<project>v2</project>'
+
+    assert CONFIG_READS.get(kind='job', result='unchanged') == unchanged + 1
+
+
+CONFIG = """<?xml version='1.1' encoding='UTF-8'?>
+<flow-definition plugin="workflow-job@1400">
+  <definition class="org.jenkinsci.plugins.workflow.cps.CpsScmFlowDefinition">
+    <scm class="hudson.plugins.git.GitSCM">
+      <userRemoteConfigs>
+        <hudson.plugins.git.UserRemoteConfig>
+          <url>https://git.example.com/team/app.git</url>
+          <credentialsId>git-deploy</credentialsId>
+        </hudson.plugins.git.UserRemoteConfig>
+      </userRemoteConfigs>
+    </scm>
+  </definition>
+</flow-definition>
+"""
+
+
+@pytest.mark.parametrize(
+    'pattern, xpath, matches',
+    [
+        ('git-deploy', None, ['<credentialsId>git-deploy</credentialsId>']),
+        (None, './/scm//url', ['https://git.example.com/team/app.git']),
+        (None, '//credentialsId', ['git-deploy']),
+        ('team/other', './/scm//url', []),
+    ],
+)
+def test_search_config(pattern, xpath, matches):
+    assert search_config(CONFIG, pattern, xpath) == matches
+
+
+def test_search_is_remembered_by_digest(configs, mock_jenkins):
+    mock_jenkins.jenkins_request.return_value = MagicMock(status_code=200, text=CONFIG, headers={})
+
+    with patch('mcp_jenkins.jenkins._config.search_config', wraps=search_config) as search:
+        configs.search('job', 'a', 'git-deploy', None)
+        configs.search('job', 'b', 'git-deploy', None)
+
+    search.assert_called_once()
+    assert len(configs._store._data) == 3
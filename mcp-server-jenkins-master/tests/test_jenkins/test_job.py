@@ -1,8 +1,15 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
 import pytest
 
+from mcp_jenkins.budget import budget_scope
 from mcp_jenkins.jenkins._job import JenkinsJob
+from mcp_jenkins.jenkins._throttle import endpoint_class, priority_lane
 from mcp_jenkins.models.build import Build
 from mcp_jenkins.models.job import Folder, Job, MultibranchPipeline
+from mcp_jenkins.store import SQLiteStore, Store
 
 JOBS = [
     {
@@ -155,7 +162,8 @@ MULTIBRANCH_INFO = {
 def jenkins_job(mock_jenkins):
     mock_jenkins.get_jobs.return_value = JOBS
     mock_jenkins.get_job_info.return_value = JOB_INFO
-    mock_jenkins.get_job_config.return_value = ''
+    mock_jenkins._get_job_folder.return_value = ('job/main_folder/', 'main_job')
+    mock_jenkins.jenkins_request.return_value = MagicMock(status_code=200, text='', headers={})
 
     yield JenkinsJob(mock_jenkins)
 
@@ -519,6 +527,16 @@ def test_job_config(jenkins_job):
     assert config == ''
 
 
+def test_get_job_info_depth_follows_budget(jenkins_job, mock_jenkins):
+    jenkins_job.get_job_info('folder/job')
+    with budget_scope(100_000):
+        jenkins_job.get_job_info('folder/job')
+    with budget_scope(4096):
+        jenkins_job.get_job_info('folder/job')
+
+    assert [call.kwargs['depth'] for call in mock_jenkins.get_job_info.call_args_list] == [1, 1, 0]
+
+
 def test_get_job_info_return_job(jenkins_job):
     job_info = jenkins_job.get_job_info('folder/job')
 
@@ -621,3 +639,276 @@ def test_search_jobs_with_multibranch_pipeline(jenkins_job):
             ),
         ],
     )
+
+
+def test_get_all_jobs_uses_cached_inventory(jenkins_job):
+    jenkins_job.get_all_jobs()
+    jenkins_job.search_jobs(name_pattern='main_job')
+
+    jenkins_job._jenkins.get_jobs.assert_called_once_with(folder_depth=20)
+
+
+def test_get_all_jobs_warm_starts_from_persisted_inventory(mock_jenkins, tmp_path):
+    mock_jenkins.get_jobs.return_value = JOBS
+    JenkinsJob(mock_jenkins, SQLiteStore(str(tmp_path / 'store.sqlite3'))).get_all_jobs()
+
+    # A restarted server reads the inventory from disk and decodes it once
+    restarted = JenkinsJob(mock_jenkins, SQLiteStore(str(tmp_path / 'store.sqlite3')))
+    first = restarted.get_all_jobs()
+    second = restarted.get_all_jobs()
+
+    mock_jenkins.get_jobs.assert_called_once_with(folder_depth=20)
+    assert [job.fullname for job in first] == [job['fullname'] for job in JOBS]
+    assert first[0] is second[0]
+
+
+def test_get_all_jobs_serves_stale_inventory_while_revalidating(mock_jenkins):
+    store = Store()
+    store.set('jobs', 'all', JOBS[:1], ttl=30)
+    crawled = threading.Event()
+
+    def get_jobs(folder_depth):
+        crawled.wait()
+        return JOBS
+
+    mock_jenkins.get_jobs.side_effect = get_jobs
+    jenkins_job = JenkinsJob(mock_jenkins, store, inventory_ttl=0)
+
+    assert len(jenkins_job.get_all_jobs()) == 1
+    assert len(jenkins_job.get_all_jobs()) == 1
+    crawled.set()
+    for _ in range(100):
+        if store.get('jobs', 'all', allow_stale=True) == JOBS:
+            break
+        time.sleep(0.01)
+
+    mock_jenkins.get_jobs.assert_called_once_with(folder_depth=20)
+    assert len(jenkins_job.get_all_jobs()) == len(JOBS)
+
+
+def test_get_all_jobs_serves_expired_inventory_while_revalidating(mock_jenkins):
+    store = Store()
+    mock_jenkins.get_jobs.return_value = JOBS[:1]
+    jenkins_job = JenkinsJob(mock_jenkins, store)
+    assert len(jenkins_job.get_all_jobs()) == 1
+
+    # A run event expires the inventory, which is still served while it is crawled again
+    mock_jenkins.get_jobs.return_value = JOBS
+    store.expire('jobs', 'all')
+    assert len(jenkins_job.get_all_jobs()) == 1
+    for _ in range(100):
+        if store.get('jobs', 'all') == JOBS:
+            break
+        time.sleep(0.01)
+
+    assert mock_jenkins.get_jobs.call_count == 2
+    assert len(jenkins_job.get_all_jobs()) == len(JOBS)
+
+
+def test_get_all_jobs_crawls_once_per_ttl_across_processes(mock_jenkins, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: clock[0])
+    store = Store()
+    crawled = threading.Event()
+    mock_jenkins.get_jobs.return_value = JOBS
+    JenkinsJob(mock_jenkins, store).get_all_jobs()
+
+    # Once stale, the first session revalidates and the next ones serve the stale inventory meanwhile
+    def get_jobs(folder_depth):
+        crawled.wait()
+        return JOBS
+
+    mock_jenkins.get_jobs.side_effect = get_jobs
+    clock[0] += 40
+    for _ in range(3):
+        assert len(JenkinsJob(mock_jenkins, store).get_all_jobs()) == len(JOBS)
+    crawled.set()
+
+    assert mock_jenkins.get_jobs.call_count == 2
+
+
+def test_search_job_configs(jenkins_job, mock_jenkins):
+    configs = {
+        'main_folder/main_job': '<project><assignedNode>linux</assignedNode></project>',
+        'main_folder/sub_folder/sub_job': '<project><assignedNode>windows</assignedNode></project>',
+    }
+    mock_jenkins._get_job_folder.side_effect = lambda fullname: ('', fullname)
+    mock_jenkins._build_url.side_effect = lambda format_spec, variables: variables['short_name']
+    mock_jenkins.jenkins_request.side_effect = lambda request: MagicMock(
+        status_code=200, text=configs[request.url], headers={}
+    )
+
+    matches = jenkins_job.search_job_configs(xpath='.//assignedNode', fullname_pattern='main_folder/')
+    assert [match.model_dump(exclude_none=True) for match in matches] == [
+        {'fullname': 'main_folder/sub_folder', 'error': "'main_folder/sub_folder'"},
+        {'fullname': 'main_folder/main_job', 'matches': ['linux']},
+        {'fullname': 'main_folder/sub_folder/sub_job', 'matches': ['windows']},
+    ]
+
+    matches = jenkins_job.search_job_configs(pattern='linux', fullname_pattern='main_folder/.*job')
+    assert [match.fullname for match in matches] == ['main_folder/main_job']
+    assert mock_jenkins.jenkins_request.call_count == 3
+
+
+def test_search_job_configs_requires_a_query(jenkins_job):
+    with pytest.raises(ValueError):
+        jenkins_job.search_job_configs()
+
+
+@pytest.mark.parametrize('query', [{'pattern': '(linux'}, {'xpath': './/assignedNode['}, {'xpath': './/a]'}])
+def test_search_job_configs_rejects_invalid_query_up_front(jenkins_job, mock_jenkins, query):
+    with pytest.raises(ValueError, match='Invalid'):
+        jenkins_job.search_job_configs(**query)
+
+    mock_jenkins.jenkins_request.assert_not_called()
+
+
+def test_find_jobs(jenkins_job, mock_jenkins):
+    mock_jenkins.get_tree.return_value = {
+        'jobs': [
+            {
+                '_class': 'com.cloudbees.hudson.plugins.folder.Folder',
+                'name': 'payments',
+                'fullName': 'payments',
+                'url': 'http://localhost:8080/job/payments/',
+                'jobs': [
+                    {
+                        '_class': 'hudson.model.FreeStyleProject',
+                        'name': 'release',
+                        'fullName': 'payments/release',
+                        'url': 'http://localhost:8080/job/payments/job/release/',
+                        'color': 'blue',
+                        'description': 'Ships the payments service',
+                        'lastBuild': {
+                            'actions': [
+                                {'causes': [{'shortDescription': 'Started by user admin'}]},
+                                {'parameters': [{'name': 'ENVIRONMENT', 'value': 'staging'}]},
+                                {},
+                            ]
+                        },
+                    },
+                ],
+            },
+            {
+                '_class': 'hudson.model.FreeStyleProject',
+                'name': 'staging-cleanup',
+                'fullName': 'staging-cleanup',
+                'url': 'http://localhost:8080/job/staging-cleanup/',
+                'color': 'red',
+            },
+        ]
+    }
+
+    matches = jenkins_job.find_jobs('payments deploy staging')
+
+    assert matches[0].fullname == 'payments/release'
+    assert {match.fullname for match in matches[1:]} == {'payments', 'staging-cleanup'}
+    assert matches[0].matched == ['payment', 'stag']
+    assert matches[0].description == 'Ships the payments service'
+    jenkins_job.find_jobs('ships')
+    mock_jenkins.get_tree.assert_called_once()
+    assert mock_jenkins.get_tree.call_args.args[1].startswith('jobs[_class,name,fullName')
+    with pytest.raises(ValueError):
+        jenkins_job.find_jobs('  --  ')
+
+
+def test_get_multibranch_branches(jenkins_job, mock_jenkins):
+    mock_jenkins.get_tree.return_value = {
+        'jobs': [
+            {
+                '_class': 'org.jenkinsci.plugins.workflow.job.WorkflowJob',
+                'name': 'main',
+                'fullName': 'multibranch_pipeline/main',
+                'url': 'http://localhost:8080/job/multibranch_pipeline/job/main/',
+                'color': 'blue',
+                'lastBuild': {'number': 3, 'url': 'http://localhost:8080/job/multibranch_pipeline/job/main/3/'},
+            },
+        ]
+    }
+
+    branches = jenkins_job.get_multibranch_branches('multibranch_pipeline', offset=100, limit=50)
+
+    assert [branch.fullname for branch in branches] == ['multibranch_pipeline/main']
+    assert branches[0].lastBuild.number == 3
+    path, tree = mock_jenkins.get_tree.call_args.args
+    assert path == 'job/multibranch_pipeline'
+    assert tree.startswith('jobs[_class,name,')
+    assert tree.endswith(']{100,150}')
+
+
+def _indexing(text, size, more):
+    return MagicMock(text=text, content=text.encode(), headers={'X-Text-Size': str(size), 'X-More-Data': more})
+
+
+def test_scan_multibranch_pipeline(jenkins_job, mock_jenkins):
+    mock_jenkins._build_url.side_effect = lambda path: path
+    mock_jenkins.get_tree.return_value = {'_class': 'jenkins.branch.OrganizationFolder', 'jobs': []}
+
+    scan = jenkins_job.scan_multibranch_pipeline('org')
+
+    assert scan.model_dump(exclude_none=True) == {'fullname': 'org', 'status': 'triggered'}
+    request = mock_jenkins.jenkins_request.call_args.args[0]
+    assert (request.method, request.url) == ('POST', 'job/org/build?delay=0sec')
+
+    mock_jenkins.get_tree.return_value = {'_class': 'hudson.model.FreeStyleProject'}
+    with pytest.raises(ValueError):
+        jenkins_job.scan_multibranch_pipeline('app')
+
+
+def test_scan_multibranch_pipeline_waits_for_the_scan(jenkins_job, mock_jenkins):
+    mock_jenkins._build_url.side_effect = lambda path: path
+    multibranch = 'org.jenkinsci.plugins.workflow.multibranch.WorkflowMultiBranchProject'
+    mock_jenkins.get_tree.side_effect = [
+        {'_class': multibranch, 'jobs': [{'name': 'main'}, {'name': 'old'}]},
+        {'_class': multibranch, 'jobs': [{'name': 'main'}, {'name': 'feature'}]},
+    ]
+    mock_jenkins.jenkins_request.side_effect = [
+        _indexing('Previous scan\nFinished: SUCCESS\n', 32, 'false'),
+        None,
+        # Not started yet, the previous log is still served
+        _indexing('Previous scan\nFinished: SUCCESS\n', 32, 'false'),
+        _indexing('Starting branch indexing...\nChecking branch fea', 46, 'true'),
+        _indexing('ture\n', 51, 'true'),
+        _indexing('Finished: SUCCESS\n', 69, 'false'),
+    ]
+
+    scan = jenkins_job.scan_multibranch_pipeline('app', wait=True, poll_interval=0)
+
+    assert scan.status == 'finished'
+    assert (scan.added, scan.removed, scan.branches) == (['feature'], ['old'], 2)
+    assert scan.log == ['Starting branch indexing...', 'Checking branch feature', 'Finished: SUCCESS']
+    urls = [call.args[0].url for call in mock_jenkins.jenkins_request.call_args_list]
+    assert urls[1] == 'job/app/build?delay=0sec'
+    assert urls[3:] == [f'job/app/indexing/logText/progressiveText?start={start}' for start in (0, 46, 51)]
+
+
+def test_scan_multibranch_pipeline_polls_outside_the_write_lane(jenkins_job, mock_jenkins):
+    mock_jenkins._build_url.side_effect = lambda path: path
+    classes = []
+
+    def get_tree(url, tree):
+        classes.append(endpoint_class('GET', f'{url}?tree={tree}'))
+        return {'_class': 'jenkins.branch.OrganizationFolder', 'jobs': []}
+
+    def jenkins_request(request):
+        classes.append(endpoint_class(request.method, request.url))
+        return _indexing('Finished: SUCCESS\n', 18, 'false')
+
+    mock_jenkins.get_tree.side_effect = get_tree
+    mock_jenkins.jenkins_request.side_effect = jenkins_request
+
+    # Write tools run inside the priority lane
+    with priority_lane():
+        jenkins_job.scan_multibranch_pipeline('org', wait=True, timeout=0, poll_interval=0)
+
+    assert classes == ['tree', 'log', 'write', 'log', 'tree']
+
+
+def test_scan_multibranch_pipeline_times_out(jenkins_job, mock_jenkins):
+    mock_jenkins.get_tree.return_value = {'_class': 'jenkins.branch.OrganizationFolder', 'jobs': [{'name': 'main'}]}
+    mock_jenkins.jenkins_request.return_value = _indexing('Scanning...\n', 12, 'true')
+
+    scan = jenkins_job.scan_multibranch_pipeline('org', wait=True, timeout=0, poll_interval=0)
+
+    assert scan.status == 'timeout'
+    assert (scan.added, scan.removed, scan.branches) == ([], [], 1)
@@ -0,0 +1,49 @@
+import pytest
+
+from mcp_jenkins.jenkins._labels import LabelIndex, parse_label_expression
+
+
+@pytest.fixture()
+def index():
+    index = LabelIndex()
+    index.update(
+        {
+            'linux-1': ['linux', 'docker', 'amd64'],
+            'linux-2': ['linux', 'podman', 'arm64'],
+            'win-1': ['windows', 'amd64'],
+        }
+    )
+    yield index
+
+
+@pytest.mark.parametrize(
+    'expression, nodes',
+    [
+        ('linux', {'linux-1', 'linux-2'}),
+        ('linux && amd64', {'linux-1'}),
+        ('docker || windows', {'linux-1', 'win-1'}),
+        ('!linux', {'win-1'}),
+        ('linux && (docker || podman) && !arm64', {'linux-1'}),
+        ('amd64 && !(linux && docker)', {'win-1'}),
+        ('"amd64"', {'linux-1', 'win-1'}),
+        ('missing', set()),
+        ('  ', {'linux-1', 'linux-2', 'win-1'}),
+    ],
+)
+def test_match(index, expression, nodes):
+    assert index.match(expression) == nodes
+
+
+def test_update_is_incremental(index):
+    index.update({'linux-1': ['linux', 'docker'], 'win-1': ['windows', 'amd64', 'docker']})
+
+    assert index.match('docker') == {'linux-1', 'win-1'}
+    assert index.match('amd64') == {'win-1'}
+    assert index.match('podman || arm64') == set()
+    assert index._nodes_of.keys() == {'linux', 'docker', 'windows', 'amd64'}
+
+
+@pytest.mark.parametrize('expression', ['linux &&', '(linux', 'linux)', '&& linux', 'linux docker', 'a & b'])
+def test_parse_invalid_expression(expression):
+    with pytest.raises(ValueError):
+        parse_label_expression(expression)
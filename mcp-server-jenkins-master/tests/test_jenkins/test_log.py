@@ -0,0 +1,223 @@
+import json
+
+import pytest
+
+from mcp_jenkins.jenkins._build import JenkinsBuild
+from mcp_jenkins.jenkins._log import JenkinsLog, split_lines
+from mcp_jenkins.jenkins._log_diff import diff_lines, normalise
+from mcp_jenkins.jenkins._signatures import DEFAULT_SIGNATURES, Signature, extract_errors, load_signatures
+
+LOG = """Started by user admin
+[INFO] Compiling 12 source files
+[ERROR] /src/main/java/App.java:[12,8] cannot find symbol
+[ERROR] /src/main/java/App.java:[40,8] cannot find symbol
+[INFO] BUILD FAILURE
+\x1b[31mjava.lang.OutOfMemoryError: Java heap space\x1b[0m
+\tat App.main(App.java:3)
+Finished: FAILURE
+"""
+
+
+def test_split_lines():
+    assert list(split_lines(['a\nb', 'c\n', '\nd'])) == ['a', 'bc', '', 'd']
+
+
+def test_extract_errors():
+    result = extract_errors(LOG.splitlines(), DEFAULT_SIGNATURES, context=1)
+
+    assert result['lines'] == 8
+    # Finished: FAILURE is not an error
+    assert [(error['signature'], error['line'], error['count']) for error in result['errors']] == [
+        ('out_of_memory', 6, 1),
+        ('javac_error', 3, 2),
+        ('build_failure', 5, 1),
+    ]
+    assert result['errors'][0]['snippet'] == (
+        '5: [INFO] BUILD FAILURE\n6: java.lang.OutOfMemoryError: Java heap space\n7: \tat App.main(App.java:3)'
+    )
+    assert result['errors'][1]['snippet'].startswith('2: [INFO] Compiling')
+
+
+def test_extract_errors_no_context():
+    result = extract_errors(['ok', 'fatal: repository not found'], DEFAULT_SIGNATURES, context=0)
+
+    assert result['errors'] == [
+        {
+            'signature': 'error',
+            'category': 'generic',
+            'line': 2,
+            'count': 1,
+            'snippet': '2: fatal: repository not found',
+        }
+    ]
+
+
+def test_load_signatures(tmp_path):
+    path = tmp_path / 'signatures.json'
+    path.write_text(
+        json.dumps(
+            [
+                {'name': 'error', 'category': 'generic', 'pattern': 'ERR', 'weight': 2},
+                {'name': 'flaky', 'pattern': 'retrying'},
+            ]
+        )
+    )
+
+    signatures = load_signatures(str(path))
+
+    assert len(signatures) == len(DEFAULT_SIGNATURES) + 1
+    assert Signature('error', 'generic', 'ERR', 2) in signatures
+    assert Signature('flaky', 'custom', 'retrying') in signatures
+
+    path.write_text(json.dumps([{'name': 'broken', 'pattern': '('}]))
+    with pytest.raises(ValueError, match='broken'):
+        load_signatures(str(path))
+
+
+@pytest.fixture()
+def jenkins_log(mock_jenkins):
+    mock_jenkins.get_build_info.return_value = {'number': 12, 'building': False}
+    mock_jenkins.stream.side_effect = lambda path: (LOG[i : i + 10] for i in range(0, len(LOG), 10))
+    yield JenkinsLog(mock_jenkins, JenkinsBuild(mock_jenkins))
+
+
+def test_extract_build_errors(jenkins_log, mock_jenkins):
+    errors = jenkins_log.extract_build_errors('folder/app', 12, limit=1)
+
+    assert errors.lines == 8
+    assert [error.signature for error in errors.errors] == ['out_of_memory']
+    assert errors.truncated == 2
+    mock_jenkins.stream.assert_called_once_with('job/folder/job/app/12/consoleText')
+
+    # Finished builds are cached
+    assert len(jenkins_log.extract_build_errors('folder/app', 12).errors) == 3
+    mock_jenkins.stream.assert_called_once()
+
+
+def test_extract_build_errors_patterns(jenkins_log):
+    errors = jenkins_log.extract_build_errors('folder/app', 12, limit=1, patterns=['^Started by'])
+
+    assert errors.errors[0].signature == 'pattern_0'
+    assert errors.errors[0].line == 1
+
+
+@pytest.mark.parametrize(
+    ('patterns', 'match'),
+    [
+        (['ok', '(unclosed'], 'Invalid pattern .*unclosed'),
+        (['(a+)+$'], 'exponential'),
+        ([r'(\w+)\s+\1'], 'exponential'),
+        (['x' * 501], 'longer than'),
+        ([f'p{i}' for i in range(21)], 'At most'),
+    ],
+)
+def test_extract_build_errors_rejects_patterns_before_reading(jenkins_log, mock_jenkins, patterns, match):
+    with pytest.raises(ValueError, match=match):
+        jenkins_log.extract_build_errors('folder/app', 12, patterns=patterns)
+
+    mock_jenkins.get_build_info.assert_not_called()
+    mock_jenkins.stream.assert_not_called()
+
+
+def test_extract_build_errors_cached_log(jenkins_log, mock_jenkins):
+    jenkins_log._store.set('build_logs', 'folder/app#12', 'Step 1\nfatal: boom\n')
+
+    errors = jenkins_log.extract_build_errors('folder/app', 12)
+
+    assert [error.line for error in errors.errors] == [2]
+    mock_jenkins.stream.assert_not_called()
+
+
+GREEN = """Started by timer
+2024-01-01T10:00:00Z Checking out Revision 3fa9c0d1e2b4
+Compiling
+Tests run: 10, Failures: 0
+step a
+step b
+step c
+step d
+step e
+step f
+step g
+Took 12 sec
+Finished: SUCCESS
+"""
+
+RED = """Started by timer
+2024-01-02T11:00:01Z Checking out Revision 9e8d7c6b5a41
+Compiling
+warning: deprecated
+Tests run: 10, Failures: 2
+step a
+step b
+step c
+step d
+step e
+step f
+step g
+Took 1.5 min
+Finished: FAILURE
+"""
+
+
+def test_normalise():
+    assert (
+        normalise('\x1b[32m12:00:01.123 took 35ms, commit abc1234def, build 42\x1b[0m')
+        == '# took #, commit #, build 42'
+    )
+
+
+def test_diff_lines():
+    result = diff_lines(GREEN.splitlines(), RED.splitlines(), context=2)
+
+    assert result['baseLines'] == 13
+    assert result['targetLines'] == 14
+    assert (result['removed'], result['added'], result['hunks']) == (2, 3, 2)
+    assert result['diff'] == [
+        (
+            '@@ -2,5 +2,6 @@\n'
+            ' 2024-01-02T11:00:01Z Checking out Revision 9e8d7c6b5a41\n'
+            ' Compiling\n'
+            '-Tests run: 10, Failures: 0\n'
+            '+warning: deprecated\n'
+            '+Tests run: 10, Failures: 2\n'
+            ' step a\n'
+            ' step b'
+        ),
+        '@@ -11,3 +12,3 @@\n step g\n Took 1.5 min\n-Finished: SUCCESS\n+Finished: FAILURE',
+    ]
+
+
+def test_diff_lines_identical():
+    result = diff_lines(GREEN.splitlines(), GREEN.splitlines())
+
+    assert (result['removed'], result['added'], result['hunks'], result['diff']) == (0, 0, 0, [])
+
+
+def test_diff_lines_window():
+    base = [f'line {i}' for i in range(100)]
+    target = [f'other {i}' for i in range(30)] + base[30:]
+
+    # Realigned once the 30 changed lines are within the window
+    result = diff_lines(base, target, window=64, context=0)
+    assert (result['removed'], result['added'], result['hunks']) == (30, 30, 1)
+
+    # Changes longer than the window are reported whole
+    base = [f'line {i}' for i in range(150)]
+    result = diff_lines(base, [f'other {i}' for i in range(150)], window=8, context=0)
+    assert (result['removed'], result['added'], result['hunks']) == (150, 150, 1)
+    assert result['diff'][0].endswith('\n... 100 more lines')
+
+
+def test_diff_build_logs(jenkins_log, mock_jenkins):
+    logs = {'job/folder/job/app/11/consoleText': GREEN, 'job/folder/job/app/12/consoleText': RED}
+    mock_jenkins.stream.side_effect = lambda path: iter([logs[path]])
+
+    diff = jenkins_log.diff_build_logs('folder/app', 11, 12, max_hunks=1)
+
+    assert (diff.removed, diff.added, diff.truncated) == (2, 3, 1)
+    assert diff.hunks[0].startswith('@@ -1,7 +1,8 @@\n Started by timer')
+
+    # Finished builds are cached
+    assert len(jenkins_log.diff_build_logs('folder/app', 11, 12).hunks) == 2
+    assert mock_jenkins.stream.call_count == 2
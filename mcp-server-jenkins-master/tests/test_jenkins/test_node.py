@@ -1,16 +1,49 @@
+from unittest.mock import MagicMock
+
 import pytest
 
-from mcp_jenkins.jenkins._node import JenkinsNode
-from mcp_jenkins.models.node import Node
+from mcp_jenkins.jenkins._node import NODES_TREE, NODES_TTL, JenkinsNode
+from mcp_jenkins.models.node import Node, _NodeMonitor
 
 
 @pytest.fixture()
 def jenkins_node(mock_jenkins):
-    mock_jenkins.get_nodes.return_value = [
-        {'name': 'node-000', 'offline': False},
-        {'name': 'node-001', 'offline': True},
-    ]
-    mock_jenkins.get_node_config.return_value = '<node>...</node>'
+    mock_jenkins.get_tree.return_value = {
+        'computer': [
+            {
+                'displayName': 'node-000',
+                'offline': False,
+                'temporarilyOffline': False,
+                'offlineCauseReason': '',
+                'numExecutors': 2,
+                'assignedLabels': [{'name': 'linux'}, {'name': 'node-000'}],
+                'executors': [{'idle': True}, {'idle': False}],
+                'monitorData': {
+                    'hudson.node_monitors.DiskSpaceMonitor': {'path': '/var/jenkins', 'size': 1024},
+                    'hudson.node_monitors.SwapSpaceMonitor': {
+                        'availablePhysicalMemory': 2048,
+                        'availableSwapSpace': 0,
+                        'totalPhysicalMemory': 4096,
+                        'totalSwapSpace': 0,
+                    },
+                    'hudson.node_monitors.ResponseTimeMonitor': {'average': 42},
+                    'hudson.node_monitors.TemporarySpaceMonitor': None,
+                    'hudson.node_monitors.ArchitectureMonitor': 'Linux (amd64)',
+                },
+            },
+            {
+                'displayName': 'node-001',
+                'offline': True,
+                'temporarilyOffline': True,
+                'offlineCauseReason': 'Disk full',
+                'numExecutors': 1,
+                'assignedLabels': [{'name': 'node-001'}],
+                'executors': [{'idle': True}],
+                'monitorData': {},
+            },
+        ]
+    }
+    mock_jenkins.jenkins_request.return_value = MagicMock(status_code=200, text='<node>...</node>', headers={})
 
     yield JenkinsNode(mock_jenkins)
 
@@ -22,13 +55,54 @@ def test_to_model(jenkins_node):
 
 
 def test_get_all_nodes(jenkins_node):
-    nodes = jenkins_node.get_all_nodes()
+    nodes = jenkins_node.get_all_nodes(max_age=0)
     assert nodes == [
-        Node(name='node-000', offline=False),
-        Node(name='node-001', offline=True),
+        Node(
+            name='node-000',
+            offline=False,
+            temporarilyOffline=False,
+            labels=['linux', 'node-000'],
+            numExecutors=2,
+            busyExecutors=1,
+            idleExecutors=1,
+            monitor=_NodeMonitor(
+                diskSpace=1024,
+                availableSwapSpace=0,
+                availablePhysicalMemory=2048,
+                responseTime=42,
+                architecture='Linux (amd64)',
+            ),
+        ),
+        Node(
+            name='node-001',
+            offline=True,
+            temporarilyOffline=True,
+            offlineCause='Disk full',
+            labels=['node-001'],
+            numExecutors=1,
+            busyExecutors=0,
+            idleExecutors=1,
+            monitor=_NodeMonitor(),
+        ),
     ]
 
 
+def test_get_all_nodes_is_cached_briefly(jenkins_node, mock_jenkins):
+    jenkins_node.get_all_nodes()
+    _, age = jenkins_node.get_all_nodes_snapshot()
+
+    assert 0 < age < NODES_TTL
+    mock_jenkins.get_tree.assert_called_once_with('computer', NODES_TREE)
+
+
 def test_get_node_config(jenkins_node):
     config = jenkins_node.get_node_config('node-000')
     assert config == '<node>...</node>'
+
+
+def test_find_nodes_for_label(jenkins_node):
+    nodes, _ = jenkins_node.find_nodes_for_label('linux || node-001')
+    assert [node.name for node in nodes] == ['node-000', 'node-001']
+
+    nodes, _ = jenkins_node.find_nodes_for_label('linux && !node-000')
+    assert nodes == []
@@ -0,0 +1,79 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from mcp_jenkins.jenkins._pool import ClientPool, credential_scope
+
+
+@pytest.fixture()
+def pool():
+    yield ClientPool(lambda username, password: MagicMock(name=username), max_size=2, idle_timeout=60)
+
+
+def test_get_reuses_client(pool):
+    client = pool.get('alice', 'token')
+
+    assert pool.get('alice', 'token') is client
+    assert pool.get('alice', 'other token') is not client
+    assert len(pool) == 2
+
+
+def test_least_recently_used_is_evicted(pool):
+    alice = pool.get('alice', 'token')
+    bob = pool.get('bob', 'token')
+    pool.get('alice', 'token')
+
+    pool.get('carol', 'token')
+
+    assert len(pool) == 2
+    bob.close.assert_called_once()
+    alice.close.assert_not_called()
+    assert pool.get('alice', 'token') is alice
+
+
+def test_idle_clients_are_evicted(pool, monkeypatch):
+    alice = pool.get('alice', 'token')
+    now = time.monotonic()
+
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 61)
+    bob = pool.get('bob', 'token')
+
+    alice.close.assert_called_once()
+    assert len(pool) == 1
+    assert pool.get('bob', 'token') is bob
+
+
+def test_credential_scope():
+    assert credential_scope('alice', 'token') == credential_scope('alice', 'token')
+    assert credential_scope('alice', 'token') != credential_scope('alice', 'guess')
+    assert 'alice' not in credential_scope('alice', 'token')
+
+
+@pytest.mark.parametrize(
+    ('headers', 'require', 'expected'),
+    [
+        (None, 'true', 'default'),
+        ({}, 'false', 'default'),
+        ({}, 'true', None),
+        ({'x-jenkins-username': 'alice', 'x-jenkins-password': 'token'}, 'true', 'alice'),
+    ],
+)
+def test_client_requires_user_credentials_over_http(monkeypatch, headers, require, expected):
+    monkeypatch.setenv('tool_alias', '[fn]')
+    monkeypatch.setenv('require_user_credentials', require)
+    from mcp.server.fastmcp import Context
+    from mcp.shared.context import RequestContext
+
+    from mcp_jenkins.server import client
+
+    lifespan_context = MagicMock(client='default')
+    lifespan_context.client_for.side_effect = lambda username, password: username
+    request = MagicMock(headers=headers) if headers is not None else None
+    ctx = Context(request_context=RequestContext(1, None, None, lifespan_context, request=request))
+
+    if expected is None:
+        with pytest.raises(ValueError, match='x-jenkins-username'):
+            client(ctx)
+    else:
+        assert client(ctx) == expected
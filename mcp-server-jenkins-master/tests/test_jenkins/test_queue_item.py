@@ -1,28 +1,32 @@
 import pytest
 
-from mcp_jenkins.jenkins._queue_item import JenkinsQueueItem
+from mcp_jenkins.jenkins._queue_item import QUEUE_TREE, JenkinsQueueItem
 from mcp_jenkins.models.queue_item import QueueItem, _QueueItemTask
 
 
 @pytest.fixture()
 def jenkins_queue_item(mock_jenkins):
-    mock_jenkins.get_queue_info.return_value = [
-        {
-            '_class': 'hudson.model.Queue$BuildableItem',
-            'actions': [],
-            'blocked': False,
-            'buildable': True,
-            'id': 53213,
-            'inQueueSince': 1747990548424,
-            'params': '',
-            'stuck': False,
-            'task': {'_class': 'org.jenkinsci.plugins.workflow.support.steps.ExecutorStepExecution$PlaceholderTask'},
-            'url': 'queue/item/53213/',
-            'why': 'Waiting for next available executor on ‘node 000’',
-            'buildableStartMilliseconds': 1747990548424,
-            'pending': False,
-        }
-    ]
+    mock_jenkins.get_tree.return_value = {
+        'items': [
+            {
+                '_class': 'hudson.model.Queue$BuildableItem',
+                'actions': [],
+                'blocked': False,
+                'buildable': True,
+                'id': 53213,
+                'inQueueSince': 1747990548424,
+                'params': '',
+                'stuck': False,
+                'task': {
+                    '_class': 'org.jenkinsci.plugins.workflow.support.steps.ExecutorStepExecution$PlaceholderTask'
+                },
+                'url': 'queue/item/53213/',
+                'why': 'Waiting for next available executor on ‘node 000’',
+                'buildableStartMilliseconds': 1747990548424,
+                'pending': False,
+            }
+        ]
+    }
     mock_jenkins.get_queue_item.return_value = {
         '_class': 'hudson.model.Queue$BuildableItem',
         'actions': [],
@@ -85,9 +89,9 @@ def test_to_model(jenkins_queue_item):
     )
 
 
-def test_get_all_queue_items(jenkins_queue_item):
+def test_get_all_queue_items(jenkins_queue_item, mock_jenkins):
     queue_items = jenkins_queue_item.get_all_queue_items()
-    print(queue_items)
+    mock_jenkins.get_tree.assert_called_once_with('queue', QUEUE_TREE)
     assert queue_items == [
         QueueItem(
             id=53213,
@@ -116,3 +120,53 @@ def test_get_queue_item(jenkins_queue_item):
 
 def test_cancel_queue_item(jenkins_queue_item):
     assert jenkins_queue_item.cancel_queue_item(id_=53213) is None
+
+
+def _queue(*items):
+    return {
+        'items': [
+            {'id': id_, 'inQueueSince': 1, 'url': f'queue/item/{id_}/', 'why': why, 'task': {'name': 'job'}}
+            for id_, why in items
+        ]
+    }
+
+
+def test_get_queue_changes(mock_jenkins):
+    queue_item = JenkinsQueueItem(mock_jenkins)
+    mock_jenkins.get_tree.side_effect = [
+        _queue((1, 'Waiting'), (2, 'Waiting')),
+        _queue((2, 'Blocked'), (3, 'Waiting')),
+        _queue((2, 'Blocked'), (3, 'Waiting')),
+    ]
+
+    first, _ = queue_item.get_queue_changes()
+    assert not first.reset
+    assert [item.id for item in first.added] == [1, 2]
+
+    second, _ = queue_item.get_queue_changes(first.cursor)
+    assert [item.id for item in second.added] == [3]
+    assert [item.id for item in second.changed] == [2]
+    assert second.removed == [1]
+
+    third, _ = queue_item.get_queue_changes(second.cursor)
+    assert third.cursor == second.cursor
+    assert (third.added, third.changed, third.removed) == ([], [], [])
+
+
+def test_get_queue_changes_unknown_cursor(mock_jenkins):
+    queue_item = JenkinsQueueItem(mock_jenkins, history_size=1)
+    mock_jenkins.get_tree.side_effect = [_queue((1, 'Waiting')), _queue((2, 'Waiting'))] + [_queue((3, 'Waiting'))] * 4
+
+    # The removal of 2 drops the removal of 1 from the log, so the first cursor can no longer be diffed
+    evicted, _ = queue_item.get_queue_changes()
+    second, _ = queue_item.get_queue_changes()
+    queue_item.get_queue_changes()
+
+    for cursor in (evicted.cursor, 'other-worker:1'):
+        changes, _ = queue_item.get_queue_changes(cursor)
+        assert changes.reset
+        assert [item.id for item in changes.added] == [3]
+
+    changes, _ = queue_item.get_queue_changes(second.cursor)
+    assert not changes.reset
+    assert ([item.id for item in changes.added], changes.removed) == ([3], [2])
@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from jenkins import JenkinsException
+
+from mcp_jenkins.jenkins._resilience import (
+    CircuitBreaker,
+    JenkinsUnavailableError,
+    Resilience,
+    RetryPolicy,
+    cached,
+)
+from mcp_jenkins.store import Store
+
+
+def _unavailable():
+    return requests.HTTPError(response=MagicMock(status_code=503))
+
+
+@pytest.fixture()
+def resilience():
+    yield Resilience(RetryPolicy(attempts=3, base_delay=0), CircuitBreaker(failure_threshold=3, reset_timeout=60))
+
+
+def test_call_retries_idempotent_requests(resilience):
+    send = MagicMock(side_effect=[_unavailable(), _unavailable(), 'ok'])
+
+    assert resilience.call(send, method='GET', endpoint_class='tree') == 'ok'
+    assert send.call_count == 3
+    assert resilience.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_call_gives_up_after_attempts(resilience):
+    send = MagicMock(side_effect=requests.ConnectionError('refused'))
+
+    with pytest.raises(JenkinsUnavailableError):
+        resilience.call(send, method='GET', endpoint_class='tree')
+    assert send.call_count == 3
+
+
+def test_call_does_not_retry_writes(resilience):
+    send = MagicMock(side_effect=_unavailable())
+
+    with pytest.raises(requests.HTTPError):
+        resilience.call(send, method='POST', endpoint_class='write')
+    assert send.call_count == 1
+
+
+def test_call_does_not_retry_client_errors(resilience):
+    send = MagicMock(side_effect=JenkinsException('Error in request'))
+
+    with pytest.raises(JenkinsException):
+        resilience.call(send, method='GET', endpoint_class='other')
+    assert send.call_count == 1
+    assert resilience.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_opens_and_fails_fast(resilience):
+    with pytest.raises(JenkinsUnavailableError):
+        resilience.call(MagicMock(side_effect=requests.Timeout()), method='GET', endpoint_class='tree')
+    assert resilience.breaker.state == CircuitBreaker.OPEN
+
+    send = MagicMock(return_value='ok')
+    with pytest.raises(JenkinsUnavailableError, match='circuit open'):
+        resilience.call(send, method='GET', endpoint_class='tree')
+    send.assert_not_called()
+
+
+def test_circuit_half_open_probe_closes_it(resilience):
+    with pytest.raises(JenkinsUnavailableError):
+        resilience.call(MagicMock(side_effect=requests.Timeout()), method='GET', endpoint_class='tree')
+
+    with patch('mcp_jenkins.jenkins._resilience.time.monotonic', return_value=10**9):
+        assert resilience.breaker.state == CircuitBreaker.HALF_OPEN
+        assert resilience.call(MagicMock(return_value='ok'), method='GET', endpoint_class='tree') == 'ok'
+    assert resilience.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cached_serves_stale_value_while_unavailable():
+    store = Store()
+    store.set('jobs', 'all', [{'name': 'a'}], ttl=-1)
+
+    fetch = MagicMock(side_effect=JenkinsUnavailableError('down'))
+    assert cached(store, 'jobs', 'all', fetch, ttl=30) == [{'name': 'a'}]
+
+    store.delete('jobs')
+    with pytest.raises(JenkinsUnavailableError):
+        cached(store, 'jobs', 'all', fetch, ttl=30)
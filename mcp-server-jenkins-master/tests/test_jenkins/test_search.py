@@ -0,0 +1,51 @@
+from mcp_jenkins.jenkins._search import SearchIndex, tokenize
+
+DOCUMENTS = {
+    'payments/deploy-staging': {'name': 'deploy-staging', 'fullname': 'payments/deploy-staging'},
+    'payments/deploy-production': {'name': 'deploy-production', 'fullname': 'payments/deploy-production'},
+    'payments/unit-tests': {'name': 'unit-tests', 'description': 'Runs before every deployment to staging'},
+    'search/deployStage': {'name': 'deployStage', 'fullname': 'search/deployStage'},
+    'docs': {'name': 'docs', 'description': 'Publishes the documentation'},
+}
+
+
+def test_tokenize():
+    assert tokenize('payments-deployStaging2 Builds') == ['payment', 'deploy', 'stag', '2', 'build']
+    assert tokenize('') == []
+
+
+def test_tokenize_unicode():
+    assert tokenize('déploiement-Über buildÉtape') == ['déploiement', 'über', 'build', 'étape']
+    assert tokenize('HTTPServer ビルド_2') == ['http', 'server', 'ビルド', '2']
+
+
+def test_search_documents_without_words():
+    index = SearchIndex({'a': {'name': '--'}, 'b': {}})
+
+    assert len(index) == 2
+    assert index.search('deploy') == []
+
+
+def test_search_unicode():
+    index = SearchIndex({'déploiement': {'name': 'déploiement-étape'}, 'docs': {'name': 'docs'}})
+
+    assert [hit.fullname for hit in index.search('Déploiement')] == ['déploiement']
+
+
+def test_search_ranks_jobs_matching_every_word_first():
+    index = SearchIndex(DOCUMENTS)
+
+    hits = index.search('payments deploy staging')
+
+    assert hits[0].fullname == 'payments/deploy-staging'
+    assert hits[0].matched == ('payment', 'deploy', 'stag')
+    assert {hit.fullname for hit in hits} == set(DOCUMENTS) - {'docs'}
+
+
+def test_search_prefixes_and_limit():
+    index = SearchIndex(DOCUMENTS)
+
+    assert [hit.fullname for hit in index.search('documentation')] == ['docs']
+    assert [hit.fullname for hit in index.search('doc')] == ['docs']
+    assert len(index.search('deploy', limit=2)) == 2
+    assert index.search('nothing') == []
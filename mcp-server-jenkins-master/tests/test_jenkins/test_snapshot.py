@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mcp_jenkins.jenkins._poller import POLLER_REFRESHES, Poller
+from mcp_jenkins.jenkins._resilience import JenkinsUnavailableError
+from mcp_jenkins.jenkins._snapshot import Snapshot
+from mcp_jenkins.models.node import Node
+from mcp_jenkins.store import Store
+
+
+@pytest.fixture()
+def fetch():
+    yield MagicMock(side_effect=[['a'], ['a', 'b']])
+
+
+def test_get_fetches_when_older_than_max_age(fetch):
+    snapshot = Snapshot(Store(), 'queue', fetch)
+
+    assert snapshot.get() == (['a'], 0.0)
+    assert snapshot.get() == (['a', 'b'], 0.0)
+    assert fetch.call_count == 2
+
+
+def test_get_answers_from_memory_within_max_age(fetch):
+    snapshot = Snapshot(Store(), 'queue', fetch, max_age=60)
+    snapshot.refresh()
+
+    items, age = snapshot.get()
+    assert items == ['a']
+    assert 0 <= age < 60
+    assert snapshot.get(max_age=0) == (['a', 'b'], 0.0)
+    assert fetch.call_count == 2
+
+
+def test_get_serves_stale_snapshot_while_unavailable():
+    snapshot = Snapshot(Store(), 'queue', MagicMock(side_effect=[['a'], JenkinsUnavailableError('down')]))
+    snapshot.refresh()
+
+    with patch('mcp_jenkins.store.time.time', return_value=10**10):
+        items, age = snapshot.get()
+    assert items == ['a']
+    assert age > 0
+
+
+def test_poller_refreshes_every_snapshot():
+    snapshots = [Snapshot(Store(), 'queue', MagicMock(return_value=[])), Snapshot(Store(), 'nodes', MagicMock())]
+    snapshots[1]._fetch.side_effect = JenkinsUnavailableError('down')
+    ok = POLLER_REFRESHES.get(snapshot='queue', result='ok')
+    error = POLLER_REFRESHES.get(snapshot='nodes', result='error')
+
+    Poller(lambda: MagicMock(snapshots=snapshots), interval=60).poll_once()
+
+    assert POLLER_REFRESHES.get(snapshot='queue', result='ok') == ok + 1
+    assert POLLER_REFRESHES.get(snapshot='nodes', result='error') == error + 1
+    assert snapshots[0].get(max_age=60) == ([], pytest.approx(0, abs=1))
+
+
+def test_dump_snapshot_reports_age_only_with_poller(monkeypatch):
+    monkeypatch.setenv('tool_alias', '[fn]')
+    from mcp_jenkins.server import dump_snapshot
+
+    nodes = [Node(name='node-000', offline=False)]
+
+    monkeypatch.setenv('poll_interval', '0')
+    assert dump_snapshot(nodes, 1.23456) == [{'name': 'node-000', 'offline': False}]
+    monkeypatch.setenv('poll_interval', '5')
+    assert dump_snapshot(nodes, 1.23456) == [{'name': 'node-000', 'offline': False, 'snapshot_age': 1.235}]
@@ -0,0 +1,55 @@
+import pytest
+
+from mcp_jenkins.jenkins._stats import BuildColumns, rank
+
+
+def _rows(durations, results):
+    # Newest first, as Jenkins lists builds
+    rows = [
+        {'number': i + 1, 'duration': duration, 'timestamp': (i + 1) * 1000, 'result': result, 'building': False}
+        for i, (duration, result) in enumerate(zip(durations, results, strict=True))
+    ]
+    return rows[::-1]
+
+
+@pytest.fixture()
+def columns():
+    columns = BuildColumns()
+    columns.add('slower', _rows([100, 110, 120, 130, 140], ['SUCCESS'] * 5))
+    columns.add('flaky', _rows([100] * 5, ['SUCCESS', 'FAILURE', 'SUCCESS', 'FAILURE', 'ABORTED']))
+    columns.add('empty', [{'number': 1, 'building': True, 'result': None}])
+    yield columns
+
+
+def test_stats(columns):
+    slower, flaky, empty = columns.stats()
+
+    assert slower == {
+        'fullname': 'slower',
+        'builds': 5,
+        'failureRate': 0.0,
+        'flips': 0,
+        'flakiness': 0.0,
+        'meanDuration': 120,
+        'p50Duration': 120,
+        'p90Duration': 140,
+        'p99Duration': 140,
+        'trendSlope': 10.0,
+        'trend': 0.3333,
+        'firstTimestamp': 1000,
+        'lastTimestamp': 5000,
+    }
+    assert flaky['failureRate'] == 0.5
+    assert flaky['flips'] == 3
+    assert flaky['flakiness'] == 1.0
+    assert flaky['trend'] == 0.0
+    assert empty == {'fullname': 'empty', 'builds': 0}
+
+
+def test_rank(columns):
+    stats = columns.stats()
+
+    assert [job['fullname'] for job in rank(stats)] == ['slower', 'flaky', 'empty']
+    assert [job['fullname'] for job in rank(stats, 'flakiness')] == ['flaky', 'slower', 'empty']
+    with pytest.raises(ValueError):
+        rank(stats, 'name')
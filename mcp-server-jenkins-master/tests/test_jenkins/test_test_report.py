@@ -0,0 +1,148 @@
+import json
+
+import pytest
+from jenkins import NotFoundException
+
+from mcp_jenkins.jenkins._build import JenkinsBuild
+from mcp_jenkins.jenkins._test_report import JenkinsTestReport, _JsonReader, parse_failures
+from mcp_jenkins.models.junit import FailedCase, FailureReport, SuiteFailures
+
+REPORT = {
+    '_class': 'hudson.tasks.junit.TestResult',
+    'failCount': 3,
+    'passCount': 2,
+    'skipCount': 0,
+    'suites': [
+        {
+            '_class': 'hudson.tasks.junit.SuiteResult',
+            'cases': [
+                {'className': 'app.ApiTest', 'name': 'test_ok', 'status': 'PASSED', 'duration': 0.1},
+                {
+                    'className': 'app.ApiTest',
+                    'name': 'test_timeout',
+                    'status': 'REGRESSION',
+                    'duration': 30.0,
+                    'errorDetails': 'Timed out',
+                    'errorStackTrace': 'Traceback: ' + 'x' * 50,
+                },
+            ],
+            'name': 'app.ApiTest',
+        },
+        {'name': 'app.EmptyTest', 'cases': []},
+        {
+            'name': 'app.DbTest',
+            'cases': [
+                {'className': 'app.DbTest', 'name': 'test_ok', 'status': 'FIXED', 'duration': 1e-3},
+                {'className': 'app.DbTest', 'name': 'test_migrate', 'status': 'FAILED', 'errorDetails': 'bad "quote"'},
+                {'className': 'app.DbTest', 'name': 'test_rollback', 'status': 'FAILED', 'errorStackTrace': None},
+            ],
+        },
+    ],
+}
+
+
+def _chunks(data, size=7):
+    text = json.dumps(data, indent=1)
+    return (text[i : i + size] for i in range(0, len(text), size))
+
+
+@pytest.mark.parametrize('size', [1, 7, 1 << 20])
+def test_parse_failures(size):
+    report = parse_failures(_chunks(REPORT, size), max_trace_chars=20)
+
+    assert report['failCount'] == 3
+    assert report['truncated'] == 0
+    assert [suite['name'] for suite in report['suites']] == ['app.ApiTest', 'app.DbTest']
+    assert report['suites'][0]['failures'] == [
+        {
+            'className': 'app.ApiTest',
+            'name': 'test_timeout',
+            'status': 'REGRESSION',
+            'duration': 30.0,
+            'errorDetails': 'Timed out',
+            'errorStackTrace': 'Traceback: xxxxxxxxx',
+        }
+    ]
+    assert [case['name'] for case in report['suites'][1]['failures']] == ['test_migrate', 'test_rollback']
+
+
+def test_parse_failures_limit():
+    report = parse_failures(_chunks(REPORT), limit=2)
+
+    assert sum(len(suite['failures']) for suite in report['suites']) == 2
+    assert report['truncated'] == 1
+
+
+@pytest.mark.parametrize('size', [1, 3, 7])
+def test_parse_failures_traces_across_chunks(size):
+    trace = 'line \\ "quoted" \u00e9\n' * 100
+    cases = [{'name': f'test_{i}', 'status': 'FAILED', 'errorStackTrace': trace} for i in range(3)]
+    report = parse_failures(_chunks({'suites': [{'name': 'app.Test', 'cases': cases}], 'failCount': 3}, size), limit=1)
+
+    assert report['suites'][0]['failures'] == [{'name': 'test_0', 'status': 'FAILED', 'errorStackTrace': trace}]
+    assert report['truncated'] == 2
+    assert report['failCount'] == 3
+
+
+def test_json_reader_decodes_long_values_once_complete(monkeypatch):
+    text = json.dumps({'long': 'x' * 100_000, 'list': ['y' * 100_000, 1.5]})
+    reader = _JsonReader(text[i : i + 10] for i in range(0, len(text), 10))
+    decoded = []
+    decode = reader._decoder.raw_decode
+    monkeypatch.setattr(reader._decoder, 'raw_decode', lambda *args: decoded.append(1) or decode(*args))
+
+    assert {key: reader.value() for key in reader.keys()} == json.loads(text)
+    # At most one attempt on the first chunk and one on the whole value, rather than one per chunk
+    assert len(decoded) <= 8
+
+
+def test_parse_failures_invalid_json():
+    with pytest.raises(ValueError):
+        parse_failures(iter(['{"suites": [', '{"cases": [}']))
+
+
+@pytest.fixture()
+def jenkins_test_report(mock_jenkins):
+    mock_jenkins.get_build_info.return_value = {'number': 12, 'building': False}
+    mock_jenkins.stream.side_effect = lambda path: _chunks(REPORT)
+    yield JenkinsTestReport(mock_jenkins, JenkinsBuild(mock_jenkins))
+
+
+def test_get_test_failures(jenkins_test_report, mock_jenkins):
+    report = jenkins_test_report.get_test_failures('folder/app', 12, limit=1, max_trace_chars=9)
+
+    assert report == FailureReport(
+        failCount=3,
+        passCount=2,
+        skipCount=0,
+        suites=[
+            SuiteFailures(
+                name='app.ApiTest',
+                failures=[
+                    FailedCase(
+                        className='app.ApiTest',
+                        name='test_timeout',
+                        status='REGRESSION',
+                        duration=30.0,
+                        errorDetails='Timed out',
+                        errorStackTrace='Traceback',
+                    )
+                ],
+            )
+        ],
+        truncated=2,
+    )
+    assert mock_jenkins.stream.call_args.args[0].startswith('job/folder/job/app/12/testReport/api/json?tree=')
+
+    # Finished builds are cached
+    assert jenkins_test_report.get_test_failures('folder/app', 12).truncated == 0
+    mock_jenkins.stream.assert_called_once()
+
+
+def test_get_test_failures_without_report(jenkins_test_report, mock_jenkins):
+    def not_found(path):
+        raise NotFoundException('Requested item could not be found')
+        yield
+
+    mock_jenkins.stream.side_effect = not_found
+    assert jenkins_test_report.get_test_failures('folder/app', 12) is None
@@ -0,0 +1,140 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from jenkins import Jenkins
+
+from mcp_jenkins.jenkins._throttle import (
+    DEFAULT_LIMITS,
+    THROTTLE_IN_FLIGHT,
+    THROTTLE_WAIT,
+    Limit,
+    Throttle,
+    TokenBucket,
+    endpoint_class,
+    parse_limits,
+    priority_lane,
+)
+from mcp_jenkins.jenkins._transport import JenkinsTransport
+
+
+@pytest.mark.parametrize(
+    'method, url, expected',
+    [
+        ('POST', 'http://localhost:8080/job/a/build', 'write'),
+        ('GET', 'http://localhost:8080/job/a/12/consoleText', 'log'),
+        ('GET', 'http://localhost:8080/job/a/12/logText/progressiveText?start=0', 'log'),
+        ('GET', 'http://localhost:8080/api/json?tree=jobs[name]', 'tree'),
+        ('GET', 'http://localhost:8080/job/a/api/json?depth=1', 'tree'),
+        ('GET', 'http://localhost:8080/job/a/api/json?depth=0', 'other'),
+        ('GET', 'http://localhost:8080/job/a/config.xml', 'other'),
+    ],
+)
+def test_endpoint_class(method, url, expected):
+    assert endpoint_class(method, url) == expected
+
+
+def test_endpoint_class_priority_lane():
+    with priority_lane():
+        assert endpoint_class('GET', 'http://localhost:8080/api/json?tree=jobs[name]') == 'write'
+    assert endpoint_class('GET', 'http://localhost:8080/api/json?tree=jobs[name]') == 'tree'
+
+
+def test_parse_limits():
+    limits = parse_limits('tree=5:10:4; log=2')
+
+    assert limits['tree'] == Limit(rate=5, burst=10, max_in_flight=4)
+    assert limits['log'] == Limit(rate=2)
+    assert limits['write'] == DEFAULT_LIMITS['write']
+
+
+def test_parse_limits_unknown_class():
+    with pytest.raises(ValueError, match='Unknown endpoint class'):
+        parse_limits('reads=5')
+
+
+def test_token_bucket_waits_when_empty():
+    bucket = TokenBucket(rate=50, burst=2)
+    start = time.monotonic()
+
+    for _ in range(4):
+        bucket.acquire()
+
+    # Two tokens were available up front, the next two take 1/50s each
+    assert time.monotonic() - start >= 0.035
+
+
+def test_max_in_flight():
+    throttle = Throttle({'other': Limit(max_in_flight=2)})
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def request():
+        with throttle.slot('other'):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.pop()
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+
+
+def test_write_lane_is_not_blocked_by_reads():
+    throttle = Throttle({'tree': Limit(max_in_flight=1)})
+
+    with throttle.slot('tree'):
+        count = THROTTLE_WAIT.get(endpoint_class='write')[0]
+        with throttle.slot('write'):
+            pass
+
+    assert THROTTLE_WAIT.get(endpoint_class='write')[0] == count + 1
+
+
+def test_nested_request_reuses_slot():
+    transport = JenkinsTransport(
+        url='http://localhost:8080',
+        username='test_user',
+        password='test_password',
+        throttle=Throttle({'write': Limit(max_in_flight=1)}),
+    )
+    response = MagicMock(status_code=200, content=b'')
+
+    def request_with_crumb(self, req, *args, **kwargs):
+        if req.method == 'POST':
+            # python-jenkins fetches the crumb from inside the write request
+            self.jenkins_request(requests.Request('GET', 'http://localhost:8080/crumbIssuer/api/json'))
+        return response
+
+    with patch.object(Jenkins, 'jenkins_request', request_with_crumb):
+        with priority_lane():
+            assert transport.jenkins_request(requests.Request('POST', 'http://localhost:8080/job/a/build')) is response
+
+
+def test_stream_holds_slot_until_closed():
+    transport = JenkinsTransport(
+        url='http://localhost:8080',
+        username='test_user',
+        password='test_password',
+        throttle=Throttle({'log': Limit(max_in_flight=1)}),
+    )
+    response = MagicMock(status_code=200, headers={})
+    close = response.close
+
+    with patch.object(Jenkins, 'jenkins_request', return_value=response):
+        stream = transport.open_stream('job/a/1/consoleText')
+        assert THROTTLE_IN_FLIGHT.get(endpoint_class='log') == 1
+        stream.close()
+
+    close.assert_called_once()
+    assert THROTTLE_IN_FLIGHT.get(endpoint_class='log') == 0
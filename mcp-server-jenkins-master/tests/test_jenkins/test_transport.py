@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from jenkins import Jenkins, NotFoundException
+
+from mcp_jenkins.jenkins._transport import JenkinsTransport, endpoint_of
+from mcp_jenkins.metrics import UPSTREAM_BYTES, UPSTREAM_REQUESTS
+
+
+@pytest.mark.parametrize(
+    'url, endpoint',
+    [
+        ('http://localhost:8080/job/a/job/b/12/consoleText', 'job/{name}/{number}/consoleText'),
+        ('http://localhost:8080/job/a/api/json?tree=builds[number]', 'job/{name}/api/json'),
+        ('http://localhost:8080/computer/api/json', 'computer/api/json'),
+        ('http://localhost:8080/computer/node-000/config.xml', 'computer/{name}/config.xml'),
+        ('http://localhost:8080/queue/item/55/api/json', 'queue/item/{number}/api/json'),
+        ('http://localhost:8080/', '/'),
+    ],
+)
+def test_endpoint_of(url, endpoint):
+    assert endpoint_of(url, 'http://localhost:8080/') == endpoint
+
+
+def test_endpoint_of_context_path():
+    assert endpoint_of('http://localhost/jenkins/job/a/api/json', 'http://localhost/jenkins/') == 'job/{name}/api/json'
+
+
+@pytest.fixture()
+def transport():
+    yield JenkinsTransport(url='http://localhost:8080', username='test_user', password='test_password')
+
+
+def test_jenkins_request_records_metrics(transport):
+    response = MagicMock(status_code=200, content=b'{"jobs": []}')
+    before = UPSTREAM_REQUESTS.get(endpoint='api/json', method='GET', status='200')
+    bytes_before = UPSTREAM_BYTES.get(endpoint='api/json')
+
+    with patch.object(Jenkins, 'jenkins_request', return_value=response):
+        assert transport.jenkins_request(requests.Request('GET', 'http://localhost:8080/api/json')) is response
+
+    assert UPSTREAM_REQUESTS.get(endpoint='api/json', method='GET', status='200') == before + 1
+    assert UPSTREAM_BYTES.get(endpoint='api/json') == bytes_before + 12
+
+
+def test_jenkins_request_records_error_status(transport):
+    http_error = requests.HTTPError(response=MagicMock(status_code=404))
+    before = UPSTREAM_REQUESTS.get(endpoint='job/{name}/api/json', method='GET', status='404')
+
+    def raise_not_found(*args, **kwargs):
+        try:
+            raise http_error
+        except requests.HTTPError:
+            raise NotFoundException('Requested item could not be found') from None
+
+    with patch.object(Jenkins, 'jenkins_request', side_effect=raise_not_found), pytest.raises(NotFoundException):
+        transport.jenkins_request(requests.Request('GET', 'http://localhost:8080/job/missing/api/json'))
+
+    assert UPSTREAM_REQUESTS.get(endpoint='job/{name}/api/json', method='GET', status='404') == before + 1
+
+
+def test_get_tree(transport):
+    with patch.object(JenkinsTransport, 'jenkins_open', return_value='{"items": []}') as jenkins_open:
+        assert transport.get_tree('queue', 'items[id,why]') == {'items': []}
+
+    assert jenkins_open.call_args.args[0].url == 'http://localhost:8080/queue/api/json?tree=items[id,why]'
+
+
+def test_stream(transport):
+    response = MagicMock(status_code=200, encoding=None, headers={})
+    response.iter_content.return_value = [b'{"a": "\xc3', b'\xa9"}']
+    close = response.close
+
+    with patch.object(Jenkins, 'jenkins_request', return_value=response) as jenkins_request:
+        assert ''.join(transport.stream('job/a/1/consoleText')) == '{"a": "é"}'
+
+    assert jenkins_request.call_args.args[3] is True
+    close.assert_called_once()
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+import requests
+from mcp.server.fastmcp import Context
+from mcp.shared.context import RequestContext
+
+from mcp_jenkins.jenkins._resilience import Resilience, RetryPolicy
+from mcp_jenkins.jenkins._throttle import TokenBucket
+from mcp_jenkins.store import Store
+
+
+@pytest.fixture
+def ctx(monkeypatch):
+    monkeypatch.setenv('tool_alias', '[fn]')
+    lifespan_context = SimpleNamespace(client=SimpleNamespace(store=Store()))
+    return Context(request_context=RequestContext(1, None, None, lifespan_context))
+
+
+def _finish_order(monkeypatch, ctx, wait):
+    """The tools in the order they finish, a read calling `wait` and a write started while it waits"""
+    monkeypatch.setenv('tool_alias', '[fn]')
+    from mcp_jenkins.server import instrument, offload
+
+    async def get_job_info(ctx: Context, fullname: str) -> str:
+        await offload(wait)
+        return 'read'
+
+    async def build_job(ctx: Context, fullname: str) -> str:
+        return 'write'
+
+    read = instrument('get_job_info', get_job_info, 'read')
+    write = instrument('build_job', build_job, 'write')
+
+    async def main():
+        order = []
+        reading = asyncio.create_task(read(ctx=ctx, fullname='a'))
+        reading.add_done_callback(lambda task: order.append(task.result()))
+        await asyncio.sleep(0.05)
+        order.append(await write(ctx=ctx, fullname='b'))
+        await reading
+        return order
+
+    return asyncio.run(main())
+
+
+def test_tools_run_on_the_event_loop_and_offload_client_calls(ctx, monkeypatch):
+    monkeypatch.setenv('tool_alias', '[fn]')
+    from mcp_jenkins.server import instrument, offload
+
+    async def build_job(ctx: Context, fullname: str) -> tuple:
+        thread = await offload(lambda: threading.current_thread().name)
+        return asyncio.get_running_loop(), thread
+
+    async def main():
+        loop, thread = await instrument('build_job', build_job, 'write')(ctx=ctx, fullname='a')
+        return loop is asyncio.get_running_loop(), thread
+
+    on_loop, thread = asyncio.run(main())
+
+    # The MCP context is bound to the server's loop, the client call ran in a write worker
+    assert on_loop
+    assert thread.startswith('mcp-jenkins-write')
+
+
+def test_throttled_tool_does_not_block_other_tools(ctx, monkeypatch):
+    bucket = TokenBucket(rate=5, burst=1)
+
+    def wait():
+        # The second token takes 0.2s, waited for by sleeping as the client does
+        bucket.acquire()
+        bucket.acquire()
+
+    assert _finish_order(monkeypatch, ctx, wait) == ['write', 'read']
+
+
+def test_retrying_tool_does_not_block_other_tools(ctx, monkeypatch):
+    class FixedDelay(RetryPolicy):
+        def delay(self, attempt):
+            return 0.2
+
+    resilience = Resilience(FixedDelay(attempts=2))
+    responses = iter([requests.ConnectionError('refused'), 'ok'])
+
+    def send():
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def wait():
+        resilience.call(send, method='GET', endpoint_class='tree')
+
+    assert _finish_order(monkeypatch, ctx, wait) == ['write', 'read']
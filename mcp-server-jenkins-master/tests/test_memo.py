@@ -0,0 +1,125 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from mcp.server.fastmcp import Context
+from mcp.shared.context import RequestContext
+
+from mcp_jenkins.memo import invalidate, read_subjects, recall, remember, write_subjects
+from mcp_jenkins.store import Store
+
+
+@pytest.fixture
+def ctx():
+    lifespan_context = SimpleNamespace(client=SimpleNamespace(store=Store()))
+    return Context(request_context=RequestContext(1, None, None, lifespan_context))
+
+
+@pytest.fixture
+def tools(monkeypatch):
+    monkeypatch.setenv('tool_alias', '[fn]')
+    from mcp_jenkins.server import instrument
+
+    calls = []
+
+    async def get_job_info(ctx: Context, fullname: str, max_age: float | None = None) -> dict:
+        calls.append(fullname)
+        return {'name': fullname, 'call': len(calls)}
+
+    async def build_job(ctx: Context, fullname: str) -> int:
+        return 1
+
+    async def cancel_queue_item(ctx: Context, id_: int) -> None:
+        return None
+
+    return SimpleNamespace(
+        calls=calls,
+        read=instrument('get_job_info', get_job_info, 'read', ttl=60),
+        uncached=instrument('get_job_info', get_job_info, 'read'),
+        build=instrument('build_job', build_job, 'write'),
+        cancel=instrument('cancel_queue_item', cancel_queue_item, 'write'),
+    )
+
+
+def test_subjects():
+    assert read_subjects({}) == ['global']
+    assert read_subjects({'fullname': 'a/b'}) == ['job:a/b', 'tree:a', 'tree:a/b']
+    assert read_subjects({'id_': 7}) == ['queue:7']
+    assert write_subjects({'fullname': 'a/b'}) == ['global', 'tree:a/b', 'job:a', 'job:a/b']
+    assert write_subjects({'id_': 7}) == ['global', 'queue:7']
+
+
+def test_read_tool_is_memoised(ctx, tools):
+    first = asyncio.run(tools.read(ctx=ctx, fullname='a'))
+    assert asyncio.run(tools.read(ctx=ctx, fullname='a')) == first
+    asyncio.run(tools.read(ctx=ctx, fullname='b'))
+    asyncio.run(tools.read(ctx=ctx, fullname='a', max_response_bytes=1024))
+
+    assert tools.calls == ['a', 'b', 'a']
+
+
+def test_read_tool_without_ttl_or_context(ctx, tools):
+    asyncio.run(tools.uncached(ctx=ctx, fullname='a'))
+    asyncio.run(tools.uncached(ctx=ctx, fullname='a'))
+    asyncio.run(tools.read(ctx=ctx, fullname='a', max_age=0))
+    asyncio.run(tools.read(ctx=ctx, fullname='a', max_age=0))
+
+    assert tools.calls == ['a'] * 4
+
+
+def test_write_invalidates_same_job_folders_and_branches(ctx, tools):
+    for fullname in ('folder', 'folder/app', 'folder/app/main', 'folder/other'):
+        asyncio.run(tools.read(ctx=ctx, fullname=fullname))
+    tools.calls.clear()
+
+    asyncio.run(tools.build(ctx=ctx, fullname='folder/app'))
+    for fullname in ('folder', 'folder/app', 'folder/app/main', 'folder/other'):
+        asyncio.run(tools.read(ctx=ctx, fullname=fullname))
+
+    assert tools.calls == ['folder', 'folder/app', 'folder/app/main']
+
+
+def test_write_invalidates_queue_item(ctx):
+    results = writes = Store()
+    remember(results, 'get_queue_item', {'id_': 7}, {'id': 7}, time.time(), 60)
+    remember(results, 'get_queue_item', {'id_': 8}, {'id': 8}, time.time(), 60)
+
+    invalidate(writes, {'id_': 7})
+
+    assert recall(results, writes, 'get_queue_item', {'id_': 7}) == (False, None)
+    assert recall(results, writes, 'get_queue_item', {'id_': 8}) == (True, {'id': 8})
+
+
+def test_result_computed_before_a_write_is_not_served():
+    results = writes = Store()
+    started_at = time.time()
+    invalidate(writes, {'fullname': 'app'})
+    remember(results, 'get_job_info', {'fullname': 'app'}, {'name': 'app'}, started_at, 60)
+
+    assert recall(results, writes, 'get_job_info', {'fullname': 'app'}) == (False, None)
+
+
+def test_only_tools_that_opt_in_are_memoised(monkeypatch):
+    from mcp_jenkins import server
+
+    monkeypatch.setenv('tool_alias', '[fn]')
+    monkeypatch.setenv('tool_cache_ttl', '5')
+    ttls = {}
+
+    def record(name, fn, tag, ttl):
+        ttls[name] = ttl
+        return fn
+
+    monkeypatch.setattr(server, 'instrument', record)
+    app = server.FastMCP('test')
+
+    @app.tool(tag='read')
+    async def get_build_status(ctx: Context, fullname: str) -> dict:
+        return {}
+
+    @app.tool(tag='read', memoise=True)
+    async def get_job_config(ctx: Context, fullname: str) -> str:
+        return ''
+
+    assert ttls == {'get_build_status': 0, 'get_job_config': 5.0}
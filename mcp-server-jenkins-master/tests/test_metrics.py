@@ -0,0 +1,62 @@
+import pytest
+
+from mcp_jenkins.metrics import MetricsRegistry
+
+
+@pytest.fixture()
+def registry():
+    yield MetricsRegistry()
+
+
+def test_counter(registry):
+    counter = registry.counter('calls_total', 'Calls', ['tool'])
+    counter.inc(tool='a')
+    counter.inc(2, tool='a')
+    counter.inc(tool='b')
+
+    assert counter.get(tool='a') == 3
+    assert counter.snapshot() == [{'tool': 'a', 'value': 3}, {'tool': 'b', 'value': 1}]
+
+
+def test_counter_wrong_labels(registry):
+    counter = registry.counter('calls_total', 'Calls', ['tool'])
+
+    with pytest.raises(ValueError, match='expects labels'):
+        counter.inc(endpoint='a')
+
+
+def test_register_twice(registry):
+    assert registry.counter('calls_total', 'Calls', ['tool']) is registry.counter('calls_total', 'Calls', ['tool'])
+
+    with pytest.raises(ValueError, match='different definition'):
+        registry.histogram('calls_total', 'Calls', ['tool'])
+
+
+def test_histogram(registry):
+    histogram = registry.histogram('latency_seconds', 'Latency', ['tool'], buckets=(0.1, 1.0))
+    histogram.observe(0.05, tool='a')
+    histogram.observe(0.5, tool='a')
+    histogram.observe(5, tool='a')
+
+    assert histogram.get(tool='a') == (3, 5.55)
+    snapshot = histogram.snapshot()[0]
+    assert snapshot['count'] == 3
+    assert snapshot['p50'] == 1.0
+    assert snapshot['p99'] == 1.0
+
+
+def test_render(registry):
+    registry.counter('calls_total', 'Calls', ['tool']).inc(tool='get"job')
+    registry.histogram('latency_seconds', 'Latency', buckets=(0.1,)).observe(0.05)
+
+    assert registry.render() == (
+        '# HELP calls_total Calls\n'
+        '# TYPE calls_total counter\n'
+        'calls_total{tool="get\\"job"} 1\n'
+        '# HELP latency_seconds Latency\n'
+        '# TYPE latency_seconds histogram\n'
+        'latency_seconds_bucket{le="0.1"} 1\n'
+        'latency_seconds_bucket{le="+Inf"} 1\n'
+        'latency_seconds_sum 0.05\n'
+        'latency_seconds_count 1\n'
+    )
@@ -0,0 +1,42 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from starlette.testclient import TestClient
+
+HEAVY_MODULES = ['jenkins', 'bs4', 'requests', 'mcp_jenkins.models.build', 'mcp_jenkins.models.job']
+
+
+def test_server_import_defers_heavy_modules():
+    code = (
+        'import json, sys; import mcp_jenkins.server; '
+        f'print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))'
+    )
+
+    output = subprocess.check_output([sys.executable, '-c', code], env={**os.environ, 'tool_alias': '[fn]'})
+
+    assert json.loads(output) == []
+
+
+@pytest.mark.parametrize(('host', 'status'), [('0.0.0.0', 202), ('127.0.0.1', 421)])  # noqa: S104 (public bind)
+def test_streamable_http_accepts_host_headers_of_public_binds(monkeypatch, host, status):
+    monkeypatch.setenv('tool_alias', '[fn]')
+    monkeypatch.setenv('host', host)
+    monkeypatch.setenv('stateless_http', 'true')
+    from mcp_jenkins.server import _context, mcp, streamable_http_app
+
+    monkeypatch.setattr(_context, 'warm_up', lambda: None)
+    monkeypatch.setattr(mcp, '_session_manager', None)
+    monkeypatch.setattr(mcp, 'settings', mcp.settings.model_copy())
+    notification = {'jsonrpc': '2.0', 'method': 'notifications/initialized'}
+
+    with TestClient(streamable_http_app()) as client:
+        response = client.post(
+            '/mcp',
+            json=notification,
+            headers={'Host': 'jenkins-mcp.example.com', 'Accept': 'application/json, text/event-stream'},
+        )
+
+    assert response.status_code == status
@@ -0,0 +1,153 @@
+import time
+
+import pytest
+
+from mcp_jenkins.store import ScopedStore, SQLiteStore, Store, create_store, glob_escape
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        yield Store()
+    else:
+        yield SQLiteStore(str(tmp_path / 'store.sqlite3'))
+
+
+def test_get_set(store):
+    assert store.get('build_info', 'job#1') is None
+
+    store.set('build_info', 'job#1', {'number': 1, 'building': False})
+
+    assert store.get('build_info', 'job#1') == {'number': 1, 'building': False}
+
+
+def test_none_is_not_cached(store):
+    store.set('build_info', 'job#1', None)
+
+    assert store.get_entry('build_info', 'job#1') is None
+
+
+def test_ttl_and_stale(store, monkeypatch):
+    store.set('jobs', 'all', [{'name': 'job'}], ttl=10)
+    now = time.time()
+
+    monkeypatch.setattr(time, 'time', lambda: now + 11)
+
+    assert store.get('jobs', 'all') is None
+    value, age = store.get_entry('jobs', 'all', allow_stale=True)
+    assert value == [{'name': 'job'}]
+    assert age >= 11
+
+
+def test_delete(store):
+    store.set('build_logs', 'a#1', 'log a')
+    store.set('build_logs', 'b#1', 'log b')
+    store.set('build_info', 'a#1', {'number': 1})
+
+    store.delete('build_logs', 'a#1')
+    assert store.get('build_logs', 'a#1') is None
+    assert store.get('build_logs', 'b#1') == 'log b'
+
+    store.delete('build_logs')
+    assert store.get('build_logs', 'b#1') is None
+    assert store.get('build_info', 'a#1') == {'number': 1}
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = Store(max_bytes=20)
+    store.set('build_logs', 'a', 'aaaaaa')
+    store.set('build_logs', 'b', 'bbbbbb')
+    store.get('build_logs', 'a')
+    store.set('build_logs', 'c', 'cccccc')
+
+    assert store.get('build_logs', 'a') == 'aaaaaa'
+    assert store.get('build_logs', 'b') is None
+    assert store.get('build_logs', 'c') == 'cccccc'
+
+
+def test_sqlite_store_is_shared(tmp_path):
+    path = str(tmp_path / 'store.sqlite3')
+    SQLiteStore(path).set('build_info', 'job#1', {'number': 1})
+
+    assert SQLiteStore(path).get('build_info', 'job#1') == {'number': 1}
+
+
+def test_sqlite_store_prune(tmp_path):
+    store = SQLiteStore(str(tmp_path / 'store.sqlite3'), max_bytes=20)
+    store.set('build_logs', 'a', 'aaaaaaaaaa')
+    store.set('build_logs', 'b', 'bbbbbbbbbb')
+    store.set('build_logs', 'c', 'cccccccccc')
+
+    store.prune()
+
+    assert store.get('build_logs', 'a') is None
+    assert store.get('build_logs', 'c') == 'cccccccccc'
+
+
+def test_create_store(tmp_path):
+    assert type(create_store()) is Store
+    assert isinstance(create_store(str(tmp_path)), SQLiteStore)
+
+
+def test_scoped_store(store):
+    alice, bob = ScopedStore(store, 'alice'), ScopedStore(store, 'bob')
+
+    alice.set('jobs', 'all', [{'name': 'secret'}])
+
+    assert alice.get('jobs', 'all') == [{'name': 'secret'}]
+    assert bob.get('jobs', 'all') is None
+    assert store.get('jobs', 'all') is None
+
+    alice.delete('jobs', 'all')
+    assert alice.get('jobs', 'all') is None
+
+
+def test_purge_deletes_key_in_every_scope(store):
+    alice = ScopedStore(store, 'alice')
+    store.set('snapshot', 'queue', [])
+    alice.set('snapshot', 'queue', [])
+    alice.set('snapshot', 'nodes', [])
+    alice.set('snapshot', 'Queue', [])
+
+    alice.purge('snapshot', 'queue')
+
+    assert store.get('snapshot', 'queue') is None
+    assert alice.get('snapshot', 'queue') is None
+    assert alice.get('snapshot', 'nodes') == []
+    assert alice.get('snapshot', 'Queue') == []
+
+
+def test_expire_keeps_key_stale_in_every_scope(store):
+    alice = ScopedStore(store, 'alice')
+    store.set('jobs', 'all', [])
+    alice.set('jobs', 'all', [{'name': 'job'}], ttl=60)
+    alice.set('jobs', 'index', {})
+
+    alice.expire('jobs', 'all')
+
+    assert store.get('jobs', 'all') is None
+    assert alice.get('jobs', 'all') is None
+    assert alice.get('jobs', 'all', allow_stale=True) == [{'name': 'job'}]
+    stored_at, expires_at = alice.timestamps('jobs', 'all')
+    assert stored_at <= expires_at <= time.time()
+    assert alice.get('jobs', 'index') == {}
+
+
+def test_purge_matching_deletes_matching_keys_in_every_scope(store):
+    alice = ScopedStore(store, 'alice')
+    for target in (store, alice):
+        target.set('log_diff', 'app#11#12:3:1000', {})
+        target.set('log_diff', 'app#12#13:3:1000', {})
+        target.set('log_diff', 'app#1#2:3:1000', {})
+        target.set('log_diff', 'other/app#12#13:3:1000', {})
+        target.set('log_diff', 'a[p]#12#13:3:1000', {})
+
+    alice.purge_matching('log_diff', 'app#12#*')
+    store.purge_matching('log_diff', f'{glob_escape("a[p]")}#12#*')
+
+    for target in (store, alice):
+        assert target.get('log_diff', 'app#12#13:3:1000') is None
+        assert target.get('log_diff', 'a[p]#12#13:3:1000') is None
+        assert target.get('log_diff', 'app#11#12:3:1000') == {}
+        assert target.get('log_diff', 'app#1#2:3:1000') == {}
+        assert target.get('log_diff', 'other/app#12#13:3:1000') == {}